@@ -0,0 +1,73 @@
+"""
+Compares the per-call cost of expand_contractions with a cached ContractionExpander against its
+former implementation, which rebuilt and compiled the pattern and lookup table on every call.
+
+    python -m benchmarks.contractions
+"""
+import typing as t
+import re
+
+from melelem.pre_processing.contraction import CONTRACTIONS, expand_contractions, get_contraction_expander
+from melelem.utilities import Timer
+
+
+MESSAGES = [
+    "I'm sure you'll like it.",
+    "They're not here, aren't they?",
+    'This message has no contractions at all.',
+    "Y'all should've seen what we'd done."
+] * 2500
+
+
+def expand_contractions_legacy(
+    text: str,
+    contractions: t.Dict[str, str] = None,
+    ignore_case: bool = True
+):
+    if contractions is None:
+        contractions = CONTRACTIONS()
+    pattern = (
+        r'(?:(?<=^)|(?<= ))'
+        + f"({'|'.join(map(re.escape, contractions.keys()))})"
+        + r'(?:(?=$)|(?= )|(?=\.))'
+    )
+    flags = re.MULTILINE
+    if ignore_case:
+        flags |= re.IGNORECASE
+        contractions = {
+            contraction.lower(): expansion
+            for contraction, expansion in contractions.items()
+        }
+
+    def expand_contraction(match: re.Match):
+        contraction: str = match.group()
+        contraction = contraction.lower() if ignore_case else contraction
+        expansion = contractions[contraction]
+        if contraction[0].isupper() and expansion[1].islower():
+            expansion = expansion[0].upper() + expansion[1:]
+        return expansion
+
+    return re.compile(pattern, flags).sub(expand_contraction, text)
+
+
+def main():
+    expand_contractions(MESSAGES[0])
+    custom_contractions = dict(CONTRACTIONS())
+
+    for name, function in [
+        ('former', lambda text: expand_contractions_legacy(text)),
+        ('expand_contractions', lambda text: expand_contractions(text)),
+        ('expand_contractions (custom)', lambda text: expand_contractions(text, custom_contractions)),
+        ('ContractionExpander.expand', get_contraction_expander().expand)
+    ]:
+        with Timer(name) as timer:
+            [function(message) for message in MESSAGES]
+        print(f'{name:<30}: {timer.elapsed / len(MESSAGES) * 1e6:8.2f}us per call')
+
+    with Timer('batch') as timer:
+        get_contraction_expander().expand_batch(MESSAGES)
+    print(f'{"ContractionExpander.expand_batch":<30}: {timer.elapsed / len(MESSAGES) * 1e6:8.2f}us per text')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Compares TextSpan.merge_spans against its former front-popping implementation on random spans.
+
+    python -m benchmarks.merge_spans
+"""
+import random
+
+from melelem.pre_processing import TextSpan
+from melelem.utilities import Timer
+
+
+# The former implementation is quadratic or worse, so it is only run up to this many spans.
+MAX_LEGACY_SPANS = 4000
+
+
+def merge_spans_legacy(spans):
+    spans = spans.copy()
+    merged_spans = []
+    while spans:
+        span = spans.pop(0)
+        span_index = 0
+        while span_index < len(spans):
+            next_span = spans[span_index]
+            if (
+                next_span[0] <= span[0] <= next_span[1]
+                or next_span[0] <= span[1] <= next_span[1]
+            ):
+                span = (min(span[0], next_span[0]), max(span[1], next_span[1]))
+                spans.pop(span_index)
+                span_index = 0
+            else:
+                span_index += 1
+        merged_spans.append(span)
+    merged_spans.sort()
+    return merged_spans
+
+
+def main():
+    rng = random.Random(0)
+    for count in [1000, 4000, 16000, 64000]:
+        spans = []
+        for _ in range(count):
+            start = rng.randint(0, count * 10)
+            spans.append((start, start + rng.randint(0, 12)))
+
+        with Timer('sweep') as timer:
+            TextSpan.merge_spans(spans)
+        sorted_spans = sorted(spans)
+        with Timer('sweep_sorted') as sorted_timer:
+            TextSpan.merge_spans(sorted_spans, is_sorted=True)
+        line = (
+            f'{count:>6} spans: sort-sweep {timer.elapsed * 1000:7.2f}ms, '
+            f'sweep (is_sorted) {sorted_timer.elapsed * 1000:7.2f}ms'
+        )
+
+        if count <= MAX_LEGACY_SPANS:
+            with Timer('legacy') as legacy_timer:
+                merge_spans_legacy(spans)
+            line += f', former {legacy_timer.elapsed * 1000:9.2f}ms'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
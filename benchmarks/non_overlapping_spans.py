@@ -0,0 +1,62 @@
+"""
+Shows how TextSpan.get_non_overlapping_spans scales on documents full of periods and non-break
+spans (abbreviations, URLs, emails and numbers), compared to the former all-pairs filter.
+
+    python -m benchmarks.non_overlapping_spans
+"""
+import re
+
+from melelem.pre_processing import Sentence, TextSpan
+from melelem.utilities import Timer
+
+
+PARAGRAPH = (
+    'Dr. Smith met Mr. Jones at 10.30 a.m. on Jan. 5th, e.g. at the U.S. embassy. '
+    'See https://example.com/a.b.c or mail j.doe@example.com for details. '
+    'The results were 3.14 and 2.71, i.e. close to the expected values! Was it enough? '
+)
+
+# The former filter is quadratic, so it is only run up to this size.
+MAX_LEGACY_BYTES = 1 << 18
+
+
+def get_non_overlapping_spans_legacy(spans, possibly_overlapping_spans):
+    return [
+        possibly_overlapping_span
+        for possibly_overlapping_span in possibly_overlapping_spans
+        if all(
+            possibly_overlapping_span[0] >= span[1]
+            or possibly_overlapping_span[1] <= span[0]
+            for span in spans
+        )
+    ]
+
+
+def get_spans(text: str):
+    non_break_spans = Sentence._get_non_break_spans(text)
+    punct_break_spans = [match.span() for match in re.finditer(r'[.!?]', text)]
+    return non_break_spans, punct_break_spans
+
+
+def main():
+    for size in [1 << 16, 1 << 18, 1 << 20, 1 << 21]:
+        text = PARAGRAPH * (size // len(PARAGRAPH) + 1)
+        non_break_spans, punct_break_spans = get_spans(text)
+
+        with Timer('sweep') as timer:
+            spans = TextSpan.get_non_overlapping_spans(non_break_spans, punct_break_spans)
+        line = (
+            f'{len(text) / 2**20:5.2f}MiB, {len(non_break_spans):>6} non-break spans, '
+            f'{len(punct_break_spans):>6} punctuations: sorted {timer.elapsed * 1000:8.2f}ms'
+        )
+
+        if size <= MAX_LEGACY_BYTES:
+            with Timer('legacy') as legacy_timer:
+                legacy_spans = get_non_overlapping_spans_legacy(non_break_spans, punct_break_spans)
+            assert spans == legacy_spans
+            line += f', all-pairs {legacy_timer.elapsed * 1000:10.2f}ms'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Compares normalize_chars against its former implementation, which made a pass over the text per
+substitution, on multi-MB ASCII and non-ASCII documents.
+
+    python -m benchmarks.normalization
+"""
+import re
+
+from melelem.pre_processing import normalize_chars
+from melelem.utilities import Timer
+
+
+ASCII_PARAGRAPH = (
+    'The results were "close" to the expected values, i.e. within ``tolerance\'\'.\tSee the\n'
+    'appendix (cid:12) for details.\x0d Normal prose continues here with several words.\n'
+)
+UNICODE_PARAGRAPH = (
+    'The results were “close” to the expected values – within ‘tolerance’.\xa0See  the\n\n\n\n'
+    'appendix (cid:12) for details.\x0d  Normal prose continues here with several words.\n'
+)
+
+
+def normalize_chars_legacy(text: str, encoding: str = 'utf-8', errors: str = 'ignore'):
+    text = re.sub(r'\x0d|\x1b|\x07|\uf0b7|\uf020|\u202f|\x02|(\(cid:\d+\))', '', text)
+    text = re.sub(r'\x0c|\x0b|\xa0|\x09', ' ', text)
+    text = re.sub(r"\u201c|\u201d", "\"", text)
+    text = re.sub(r'“|”', '"', text)
+    text = re.sub(r'‘|’', '\'', text)
+    text = re.sub(r'\'\'', '"', text)
+    text = re.sub(r'``', '"', text)
+    text = re.sub(r'–', '-', text)
+    return text.encode(encoding, errors).decode(encoding, errors)
+
+
+def main():
+    for name, paragraph in [('ascii', ASCII_PARAGRAPH), ('unicode', UNICODE_PARAGRAPH)]:
+        for size in [1 << 20, 1 << 22, 1 << 24]:
+            text = paragraph * (size // len(paragraph) + 1)
+            with Timer('new') as timer:
+                normalized_text = normalize_chars(text)
+            with Timer('legacy') as legacy_timer:
+                legacy_normalized_text = normalize_chars_legacy(text)
+            assert normalized_text == legacy_normalized_text
+            print(
+                f'{name:<7} {len(text) / 2**20:6.2f}MiB: single pass {timer.elapsed * 1000:8.2f}ms, '
+                f'former {legacy_timer.elapsed * 1000:8.2f}ms'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Compares Profanity.from_text's single scan against its former implementation, which scanned the
+text once per profanity pattern, on chat messages and on documents.
+
+    python -m benchmarks.profanity
+"""
+import random
+import re
+
+from melelem.pre_processing.profanity import Profanity, PROFANITY_PATTERNS, PROFANITY_MATCHER
+from melelem.utilities import Timer
+
+
+WORDS = (
+    'the quick brown fox jumps over the lazy dog , what a nice day . hello world ! '
+    'is it 2024 already ? I am fine thanks'
+).split() + ['bitch', 'b!tch', 'asshole', 'dry  hump']
+
+# The former implementation scans the text hundreds of times, so it is only run up to this size.
+MAX_LEGACY_BYTES = 1 << 18
+
+
+def from_text_legacy(text: str):
+    return Profanity.from_matches([
+        match
+        for profanity_pattern in PROFANITY_PATTERNS()
+        for match in re.finditer(profanity_pattern, text)
+    ])
+
+
+def get_text(rng: random.Random, size: int):
+    words = []
+    length = 0
+    while length < size:
+        words.append(rng.choice(WORDS))
+        length += len(words[-1]) + 1
+    return ' '.join(words)
+
+
+def main():
+    rng = random.Random(0)
+    with Timer('compile') as timer:
+        PROFANITY_MATCHER()
+    print(f'compile: {timer.elapsed * 1000:.2f}ms')
+
+    messages = [get_text(rng, rng.randint(20, 200)) for _ in range(1000)]
+    with Timer('scan') as timer:
+        for message in messages:
+            Profanity.from_text(message)
+    with Timer('legacy') as legacy_timer:
+        for message in messages:
+            from_text_legacy(message)
+    print(
+        f'{len(messages)} chat messages: single scan {timer.elapsed * 1000:8.2f}ms, '
+        f'former {legacy_timer.elapsed * 1000:9.2f}ms'
+    )
+
+    for size in [1 << 14, 1 << 18, 1 << 20]:
+        text = get_text(rng, size)
+        with Timer('scan') as timer:
+            profanities = Profanity.from_text(text)
+        line = (
+            f'{len(text) / 2**20:5.2f}MiB, {len(profanities):>6} profanities: '
+            f'single scan {timer.elapsed * 1000:8.2f}ms'
+        )
+
+        if size <= MAX_LEGACY_BYTES:
+            with Timer('legacy') as legacy_timer:
+                legacy_profanities = from_text_legacy(text)
+            assert profanities == sorted(legacy_profanities, key=lambda profanity: profanity.span)
+            line += f', former {legacy_timer.elapsed * 1000:9.2f}ms'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
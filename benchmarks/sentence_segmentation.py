@@ -0,0 +1,72 @@
+"""
+Compares Sentence.from_text's single boundary scan against its former implementation, which
+allocated text spans for every non-break match and copied the text after every boundary.
+
+    python -m benchmarks.sentence_segmentation
+"""
+import re
+
+from melelem.pre_processing import Sentence, Abbreviation, Url, Email, TextSpan
+from melelem.utilities import Timer
+
+
+PARAGRAPH = (
+    'Dr. Smith met Mr. Jones at 10.30 a.m. on Jan. 5th, e.g. at the U.S. embassy. '
+    'See https://example.com/a.b.c or mail j.doe@example.com for details.\n'
+    'The results were 3.14 and 2.71, i.e. close to the expected values! Was it enough? '
+    'Normal prose continues here with several words and no special tokens at all in it.\n\n'
+)
+
+# The former implementation copies the text after every boundary, so it is only run up to this size.
+MAX_LEGACY_BYTES = 1 << 21
+
+
+def from_text_legacy(text: str, line_break_split=False):
+    known_abbreviations, unknown_abbreviations = Abbreviation.from_text(text, for_segmentation=True)
+    non_break_spans = [
+        text_span.span
+        for text_spans in [
+            known_abbreviations,
+            unknown_abbreviations,
+            Url.from_text(text),
+            Email.from_text(text),
+            TextSpan.from_matches(re.finditer(r'\b(?:\d+\.\d+)', text)),
+            TextSpan.from_matches(re.finditer(r'(?:\n[\d|A-Za-z]{1,3})(\.)', text))
+        ]
+        for text_span in text_spans
+    ]
+    punct_spans = [match.span() for match in re.finditer(r'[.!?]', text)]
+    punct_spans = TextSpan.merge_spans(TextSpan.get_non_overlapping_spans(non_break_spans, punct_spans))
+    split_spans = []
+    if line_break_split:
+        line_spans = [match.span() for match in re.finditer(r'[\r\n\t\f]+', text)]
+        split_spans = TextSpan.get_non_overlapping_spans(non_break_spans, line_spans)
+    for _, span_end in punct_spans:
+        match = re.match(r'\s+', text[span_end:])
+        split_spans.append((span_end, span_end + (match.end() if match else 0)))
+    if not split_spans:
+        return [Sentence(text=text, span=(0, len(text)))]
+    return Sentence.split(text, split_spans)
+
+
+def main():
+    for size in [1 << 16, 1 << 18, 1 << 20, 1 << 21, 1 << 23]:
+        text = PARAGRAPH * (size // len(PARAGRAPH) + 1)
+        for line_break_split in [False, True]:
+            with Timer('scan') as timer:
+                sentences = Sentence.from_text(text, line_break_split=line_break_split)
+            line = (
+                f'{len(text) / 2**20:5.2f}MiB, line_break_split={line_break_split!s:<5}, '
+                f'{len(sentences):>6} sentences: single scan {timer.elapsed * 1000:8.2f}ms'
+            )
+
+            if size <= MAX_LEGACY_BYTES:
+                with Timer('legacy') as legacy_timer:
+                    legacy_sentences = from_text_legacy(text, line_break_split=line_break_split)
+                assert sentences == legacy_sentences
+                line += f', former {legacy_timer.elapsed * 1000:9.2f}ms'
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Compares the JSON serializers of the service requests on representative payloads: ingesting a
+multi-MB document and the results of retrieving documents.
+
+    python -m benchmarks.serialization
+"""
+import random
+import string
+
+from melelem.service.request._serialization import SERIALIZERS
+from melelem.utilities import Timer
+
+
+def get_words(count: int):
+    return ' '.join(
+        ''.join(random.choices(string.ascii_lowercase, k=random.randint(2, 10)))
+        for _ in range(count)
+    )
+
+
+def get_payloads():
+    random.seed(0)
+    ingest = {
+        'text': get_words(400_000),
+        'client_id': 'client',
+        'document_id': 'document',
+        'name': 'document.txt',
+        'meta': {'source': 'benchmark', 'tags': ['a', 'b', 'c']}
+    }
+    retrieve = {
+        'passages': [
+            {
+                'content': get_words(100),
+                'document_id': f'document-{index}',
+                'name': f'document-{index}.txt',
+                'score': random.random(),
+                'offsets': [random.randint(0, 10000) for _ in range(2)],
+                'meta': {'page': index, 'embedding': [random.random() for _ in range(384)]}
+            }
+            for index in range(200)
+        ]
+    }
+    return {'ingest': ingest, 'retrieve': retrieve}
+
+
+def main(repeat: int = 10):
+    payloads = get_payloads()
+    for name, serializer_class in SERIALIZERS.items():
+        try:
+            serializer = serializer_class()
+        except ImportError:
+            print(f'{name}: not installed')
+            continue
+
+        for payload_name, payload in payloads.items():
+            data = serializer.dumps(payload)
+            with Timer('dumps') as dumps_timer:
+                for _ in range(repeat):
+                    serializer.dumps(payload)
+            with Timer('loads') as loads_timer:
+                for _ in range(repeat):
+                    serializer.loads(data)
+            print(
+                f'{name:>8} {payload_name:>8} ({len(data) / 2**20:.1f}MiB): '
+                f'dumps {dumps_timer.elapsed / repeat * 1000:.2f}ms, '
+                f'loads {loads_timer.elapsed / repeat * 1000:.2f}ms'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares the memory of lists of text spans, which hold an object, a span tuple and a copy of the
+text per span, against TextSpanArray, which holds two integer offsets per span, on large corpora.
+
+    python -m benchmarks.span_memory [corpus size in MiB, defaults to 100]
+"""
+import typing as t
+import tracemalloc
+import sys
+import gc
+
+from melelem.pre_processing import Sentence, Url, TextSpanArray
+from melelem.pre_processing.url import URL_PATTERN
+from melelem.utilities import PATTERNS, Timer
+
+
+PARAGRAPH = (
+    'Dr. Smith met Mr. Jones at 10.30 a.m. on Jan. 5th, e.g. at the U.S. embassy. '
+    'See https://example.com/a.b.c or mail j.doe@example.com for details.\n'
+    'The results were 3.14 and 2.71, i.e. close to the expected values! Was it enough? '
+    'Normal prose continues here with several words and no special tokens at all in it.\n\n'
+)
+
+
+def measure(name: str, function: t.Callable[[], t.Sized]):
+    """Print the memory retained by the result of the function and its peak while running."""
+    gc.collect()
+    tracemalloc.start()
+    with Timer(name) as timer:
+        result = function()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f'{name:<36}: {len(result):>9} spans, retained {current / 2**20:8.1f}MiB, '
+        f'peak {peak / 2**20:8.1f}MiB, {timer.elapsed:6.2f}s'
+    )
+    del result
+
+
+def main():
+    size = int(float(sys.argv[1]) * 2**20) if len(sys.argv) > 1 else 100 * 2**20
+    text = PARAGRAPH * (size // len(PARAGRAPH) + 1)
+    print(f'{len(text) / 2**20:.1f}MiB corpus')
+
+    measure('Sentence.from_text', lambda: Sentence.from_text(text))
+    measure('Sentence.array_from_text', lambda: Sentence.array_from_text(text))
+    measure('Url.from_text', lambda: Url.from_text(text))
+    measure('TextSpanArray.from_matches', lambda: TextSpanArray.from_matches(
+        text, PATTERNS.compile(URL_PATTERN).finditer(text), span_cls=Url
+    ))
+
+
+if __name__ == '__main__':
+    main()
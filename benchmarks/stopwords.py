@@ -0,0 +1,52 @@
+"""
+Compares Stopword.from_text's set lookups against its former implementation, which matched the
+alternation of all the language's stopwords at every word boundary, in all languages.
+
+    python -m benchmarks.stopwords
+"""
+import random
+import re
+
+from melelem.pre_processing.stopword import Stopword, STOPWORDS, STOPWORDS_PATTERNS, STOPWORD_MATCHERS
+from melelem.utilities import Timer
+
+
+FILLERS = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', '2024', 'example']
+TEXT_BYTES = 1 << 18
+
+
+def get_text(rng: random.Random, stopwords):
+    words = []
+    length = 0
+    while length < TEXT_BYTES:
+        words.append(rng.choice(stopwords) if rng.random() < 0.5 else rng.choice(FILLERS))
+        words.append(rng.choice([' ', ' ', ', ', '. ']))
+        length += len(words[-2]) + len(words[-1])
+    return ''.join(words)
+
+
+def main():
+    rng = random.Random(0)
+    with Timer('load') as timer:
+        STOPWORD_MATCHERS()
+    print(f'load matchers: {timer.elapsed * 1000:.2f}ms')
+
+    total = total_legacy = 0.0
+    for language, stopwords in sorted(STOPWORDS().items()):
+        text = get_text(rng, sorted(stopwords))
+        pattern = re.compile(STOPWORDS_PATTERNS()[language], re.IGNORECASE)
+        with Timer('lookup') as timer:
+            Stopword.from_text(text, language)
+        with Timer('legacy') as legacy_timer:
+            Stopword.from_matches(pattern.finditer(text))
+        total += timer.elapsed
+        total_legacy += legacy_timer.elapsed
+        print(
+            f'{language:<12} {len(stopwords):>5} stopwords, {len(text) / 2**10:.0f}KiB: '
+            f'set lookups {timer.elapsed * 1000:8.2f}ms, former {legacy_timer.elapsed * 1000:9.2f}ms'
+        )
+    print(f'{"total":<12} set lookups {total * 1000:8.2f}ms, former {total_legacy * 1000:9.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
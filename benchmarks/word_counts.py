@@ -0,0 +1,60 @@
+"""
+Compares counting the words of a document's sentences with the former TextSpan.words, which
+re-split the text on every access, against the memoized TextSpan.words, TextSpan.word_count and
+TextSpanArray.get_word_counts, which masks the non-word characters of the document in a single pass.
+
+    python -m benchmarks.word_counts
+"""
+import re
+
+from melelem.pre_processing import Sentence, Chunk
+from melelem.utilities import Timer
+
+
+PARAGRAPH = (
+    'Dr. Smith met Mr. Jones at 10.30 a.m. on Jan. 5th, e.g. at the U.S. embassy. '
+    'See https://example.com/a.b.c or mail j.doe@example.com for details.\n'
+    'The results were 3.14 and 2.71, i.e. close to the expected values! Was it enough? '
+    'Normal prose continues here with several words and no special tokens at all in it.\n\n'
+)
+
+
+def words_legacy(text: str):
+    words = re.split(r'\W+', text)
+    if words:
+        words = words[1 if words[0] == '' else 0:]
+    if words:
+        words = words[:-1 if words[-1] == '' else len(words)]
+    return words
+
+
+def main():
+    text = PARAGRAPH * 4096
+    sentences = Sentence.array_from_text(text)
+    sentence_list = list(sentences)
+    print(f'{len(text) / 2**20:.2f}MiB, {len(sentences)} sentences')
+
+    with Timer('former') as timer:
+        word_counts = [len(words_legacy(sentence.text)) for sentence in sentence_list]
+    print(f'{"former words":<34}: {timer.elapsed * 1000:8.2f}ms')
+
+    with Timer('word_count') as timer:
+        assert [sentence.word_count for sentence in sentence_list] == word_counts
+    print(f'{"TextSpan.word_count":<34}: {timer.elapsed * 1000:8.2f}ms')
+
+    for access in ['first', 'next']:
+        with Timer('words') as timer:
+            assert [len(sentence.words) for sentence in sentence_list] == word_counts
+        print(f'{f"TextSpan.words ({access} access)":<34}: {timer.elapsed * 1000:8.2f}ms')
+
+    with Timer('get_word_counts') as timer:
+        assert sentences.get_word_counts() == word_counts
+    print(f'{"TextSpanArray.get_word_counts":<34}: {timer.elapsed * 1000:8.2f}ms')
+
+    with Timer('chunks') as timer:
+        Chunk.from_text(text, max_words=256)
+    print(f'{"Chunk.from_text(max_words=256)":<34}: {timer.elapsed * 1000:8.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
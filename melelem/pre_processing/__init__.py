@@ -1,4 +1,5 @@
 from .abbreviation import *
+from .batch import *
 from .chunk import *
 from .contraction import *
 from .email import *
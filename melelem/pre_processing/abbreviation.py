@@ -2,7 +2,7 @@ import typing as t
 import json
 import re
 
-from ..utilities import LazyLoader
+from ..utilities import LazyLoader, PATTERNS
 from .. import DATA_DIR
 from .text import TextSpan
 from .punctuation import punct
@@ -91,11 +91,11 @@ class Abbreviation(TextSpan):
         # For sentence splitting, to deal with abbreviations which end with a period that is also acting as a sentence boundary.
         if for_segmentation:
             # Match known abbreviations.
-            matches = re.finditer(KNOWN_ABBREVIATIONS_PATTERN_FOR_SEGMENTATION(), text)
+            matches = PATTERNS.compile(KNOWN_ABBREVIATIONS_PATTERN_FOR_SEGMENTATION()).finditer(text)
             known_abbreviations = cls.from_matches(matches)
 
             # Match unknown abbreviations.
-            matches = re.finditer(UNKNOWN_ABBREVIATIONS_PATTERN_FOR_SEGMENTATION(), text, flags=re.MULTILINE)
+            matches = PATTERNS.compile(UNKNOWN_ABBREVIATIONS_PATTERN_FOR_SEGMENTATION(), re.MULTILINE).finditer(text)
             abbreviations = cls.from_matches(matches)
 
             # Get unknown abbreviations.
@@ -103,11 +103,11 @@ class Abbreviation(TextSpan):
             unknown_abbreviations.sort(key=lambda abbreviation: abbreviation.span)
         else:
             # Match known abbreviations.
-            matches = re.finditer(KNOWN_ABBREVIATIONS_PATTERN(), text)
+            matches = PATTERNS.compile(KNOWN_ABBREVIATIONS_PATTERN()).finditer(text)
             known_abbreviations = cls.from_matches(matches)
 
             # Match unknown abbreviations.
-            matches = re.finditer(UNKNOWN_ABBREVIATIONS_PATTERN(), text, flags=re.MULTILINE)
+            matches = PATTERNS.compile(UNKNOWN_ABBREVIATIONS_PATTERN(), re.MULTILINE).finditer(text)
             abbreviations = cls.from_matches(matches)
 
             # Get unknown abbreviations.
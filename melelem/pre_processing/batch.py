@@ -0,0 +1,74 @@
+import typing as t
+from functools import partial
+from itertools import chain, islice
+import multiprocessing
+import sys
+
+from ..utilities import LazyLoader
+
+
+Result = t.TypeVar('Result')
+
+
+def _get_lazy_loaders() -> t.List[LazyLoader]:
+    """Get the LazyLoader resources of the pre_processing modules (e.g. the stopwords)."""
+    package_prefix = __package__ + '.'
+    return [
+        value
+        for module_name, module in list(sys.modules.items())
+        if module_name.startswith(package_prefix) and module is not None
+        for value in vars(module).values()
+        if isinstance(value, LazyLoader)
+    ]
+
+
+def preload_resources():
+    """Load the resources of the pre_processing modules now, instead of on first use."""
+    for lazy_loader in _get_lazy_loaders():
+        lazy_loader()
+
+
+def map_texts(
+    func: t.Callable[..., Result],
+    texts: t.Iterable[str],
+    processes: int = None,
+    chunksize: int = 256,
+    serial_threshold: int = 1024,
+    preload: bool = True,
+    **kwargs
+) -> t.Iterator[Result]:
+    """Map a detector or cleaner (e.g. Sentence.from_text or normalize_chars) over many texts with
+    a pool of processes, yielding the results in the texts' order as soon as they are ready.
+
+    The texts are sent to the workers in chunks of chunksize texts. Inputs of fewer than
+    serial_threshold texts are mapped in the current process, as starting the pool would cost more
+    than it saves. The function and its kwargs must be picklable (e.g. module-level functions or
+    classmethods).
+
+    :param func: The function to call on each text
+    :param texts: The texts (e.g. a generator, which is consumed as the workers need texts)
+    :param processes: The number of worker processes, defaults to the number of CPUs
+    :param chunksize: The number of texts sent to a worker at once, defaults to 256
+    :param serial_threshold: The min number of texts to use the pool, defaults to 1024
+    :param preload: Whether each worker loads the pre_processing resources on start, defaults to True
+    :return: Iterator of the results
+    """
+    if kwargs:
+        func = partial(func, **kwargs)
+
+    texts = iter(texts)
+    first_texts = list(islice(texts, serial_threshold))
+    if len(first_texts) < serial_threshold or processes == 1:
+        yield from map(func, chain(first_texts, texts))
+        return
+
+    pool = multiprocessing.Pool(processes, initializer=preload_resources if preload else None)
+    try:
+        yield from pool.imap(func, chain(first_texts, texts), chunksize)
+    except BaseException:
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
@@ -1,8 +1,132 @@
 from __future__ import annotations
 import typing as t
 from dataclasses import dataclass
+from itertools import accumulate
+from bisect import bisect_right
 
 from .sentence import Sentence
+from .text import TextSpanArray
+from ..utilities.openai import TOKENIZER, GPTEngine
+
+
+# The string which sentences are joined with in a chunk's text.
+SENTENCE_JOINER = ' '
+
+
+class _SizeLimit:
+    """
+    A max size of chunks, where a chunk's size is the sum of its sentences' sizes. The sizes'
+    prefix sums give the size of any run of sentences in O(1) and the longest run within the
+    limit by bisection.
+
+    :param sizes: The size of each sentence
+    :param max_size: The max size of a chunk
+    :param first_sizes: The size of each sentence when it is first in a chunk (if different), defaults to None
+    """
+
+    def __init__(self, sizes: t.Iterable[int], max_size: int, first_sizes: t.List[int] = None):
+        self.prefix_sums = [0] + list(accumulate(sizes))
+        self.max_size = max_size
+        self.first_sizes = first_sizes
+
+    def get_end(self, start: int):
+        """Get the end (exclusive) of the longest run of sentences from start within the limit.
+        Returns start if the sentence at start alone exceeds the limit."""
+        max_prefix_sum = self.prefix_sums[start] + self.max_size
+        if self.first_sizes is not None:
+            max_prefix_sum -= self.first_sizes[start] - (self.prefix_sums[start + 1] - self.prefix_sums[start])
+        # NOTE: The first size may exceed the size by more than the limit, which would end before start.
+        return max(start, bisect_right(self.prefix_sums, max_prefix_sum, lo=start) - 1)
+
+
+def _get_limits(
+    sentences: t.Union[t.List[Sentence], TextSpanArray[Sentence]],
+    max_words: int = 0,
+    max_characters: int = 0,
+    max_tokens: int = 0,
+    engine: t.Union[GPTEngine, str] = None
+):
+    """Get the size limits of chunks. Sentence sizes are computed once, so chunks are packed
+    without re-summing them. The words of an array of sentences are counted in a single pass."""
+    is_array = isinstance(sentences, TextSpanArray)
+    limits: t.List[_SizeLimit] = []
+    if max_characters:
+        lengths = sentences.lengths if is_array else (sentence.length for sentence in sentences)
+        limits.append(_SizeLimit(lengths, max_characters))
+    if max_words:
+        word_counts = (
+            sentences.get_word_counts() if is_array else (sentence.word_count for sentence in sentences)
+        )
+        limits.append(_SizeLimit(word_counts, max_words))
+    if max_tokens:
+        limits.append(_get_token_limit(sentences, max_tokens, engine))
+    return limits
+
+
+def _get_token_limit(
+    sentences: t.Union[t.List[Sentence], TextSpanArray[Sentence]],
+    max_tokens: int,
+    engine: t.Union[GPTEngine, str]
+):
+    """Get the limit of a chunk's tokens. Each sentence is tokenized once as it appears first in a
+    chunk and once as it appears after the joiner, whose tokens are therefore accounted for. A
+    chunk's tokens are exact as long as the tokenizer does not merge tokens across the joiner,
+    which holds for the GPT encodings' pre-tokenization of a space before a sentence."""
+    tokenizer = TOKENIZER(engine.value if isinstance(engine, GPTEngine) else engine)
+    texts = (
+        list(sentences.texts) if isinstance(sentences, TextSpanArray) else [sentence.text for sentence in sentences]
+    )
+    first_sizes = list(map(len, tokenizer.encode_ordinary_batch(texts)))
+    sizes = map(len, tokenizer.encode_ordinary_batch([SENTENCE_JOINER + text for text in texts]))
+    return _SizeLimit(sizes, max_tokens, first_sizes)
+
+
+def _pack_chunks(
+    sentences: t.List[Sentence],
+    limits: t.List[_SizeLimit],
+    max_sentences: int = 0,
+    max_func: t.Callable[[Chunk], bool] = None,
+    sentence_overlap: int = 0
+):
+    """Pack sentences into chunks within the limits, greedily. Yields the (start, end) indices of
+    each chunk's sentences."""
+    sentence_count = len(sentences)
+    sentence_index = 0
+    while sentence_index < sentence_count:
+        # Get the longest chunk within the size limits.
+        chunk_end = sentence_count
+        if max_sentences:
+            chunk_end = min(chunk_end, sentence_index + max_sentences)
+        for limit in limits:
+            chunk_end = min(chunk_end, limit.get_end(sentence_index))
+
+        #NOTE: If the sentence is bigger than the chunk size, just add it as a chunk.
+        if chunk_end == sentence_index or (
+            max_func and max_func(Chunk(sentences=sentences[sentence_index:sentence_index + 1]))
+        ):
+            yield sentence_index, sentence_index + 1
+            sentence_index += 1
+            continue
+
+        # Shorten the chunk to before the first sentence which meets the max condition.
+        if max_func:
+            for next_index in range(sentence_index + 1, chunk_end):
+                if max_func(Chunk(sentences=sentences[sentence_index:next_index + 1])):
+                    chunk_end = next_index
+                    break
+
+        yield sentence_index, chunk_end
+
+        # Increase index by chunk size and decrease by max sentence overlap length.
+        chunk_sentence_count = chunk_end - sentence_index
+        sentence_index = chunk_end
+        # NOTE: Can't overlap a single sentence and the last sentence.
+        if chunk_sentence_count > 1 and sentence_index < sentence_count:
+            sentence_index -= (
+                sentence_overlap
+                if sentence_overlap < chunk_sentence_count
+                else chunk_sentence_count - 1
+            )
 
 
 @dataclass(frozen=True)
@@ -12,7 +136,7 @@ class Chunk:
 
     @property
     def text(self):
-        return ' '.join(sentence.text for sentence in self.sentences)
+        return SENTENCE_JOINER.join(sentence.text for sentence in self.sentences)
 
     @property
     def span_start(self):
@@ -35,11 +159,13 @@ class Chunk:
         max_characters: int = 0,
         max_func: t.Callable[[Chunk], bool] = None,
         sentence_overlap: int = 0,
-        line_break_sentence_split = False
+        line_break_sentence_split = False,
+        max_tokens: int = 0,
+        engine: t.Union[GPTEngine, str] = GPTEngine.chatgpt
     ):
         """Split text into collections of sentences (chunks). Chunk sizes may be limited by their
-        number of characters, sentences, words. To disable a max limitation, set its value to 0. At
-        least one max limit must be set. Sentences between chunks may also be overlapped.
+        number of characters, sentences, words or tokens. To disable a max limitation, set its value
+        to 0. At least one max limit must be set. Sentences between chunks may also be overlapped.
 
         :param text: Text to be split into chunks.
         :param max_words: Max number of words a chunk may contain, defaults to 0.
@@ -48,64 +174,78 @@ class Chunk:
         :param max_func: Callable which returns true on custom max condition, defaults to None.
         :param sentence_overlap: The number of sentences to overlap between chunks, defaults to 0.
         :param line_break_sentence_split: Whether to consider line breaks as sentence boundaries.
+        :param max_tokens: Max number of tokens a chunk's text may contain, defaults to 0. To fill an engine's context window, subtract the prompt's tokens from GPT_ENGINE_SPECS[engine].max_tokens.
+        :param engine: The engine whose tokenizer counts the tokens, defaults to GPTEngine.chatgpt.
         :return: A list of chunks.
         """
         if not max_func and all(max_value < 1 for max_value in [
-            max_words, max_sentences, max_characters
+            max_words, max_sentences, max_characters, max_tokens
         ]):
             raise ValueError(
                 'At least one of the max arguments must be >= 1 or provide a max function.'
             )
         
-        def _larger(temp_chunk: Chunk, character_len: int, word_len: int, func: callable):
-            if (
-                    (max_characters and character_len > max_characters) or 
-                    (max_words and word_len > max_words) or 
-                    (max_func and func(temp_chunk))
+        sentences = Sentence.array_from_text(text, line_break_split=line_break_sentence_split)
+        limits = _get_limits(sentences, max_words, max_characters, max_tokens, engine)
+        sentences = list(sentences)
+
+        return [
+            cls(sentences=sentences[chunk_start:chunk_end])
+            for chunk_start, chunk_end in _pack_chunks(
+                sentences, limits, max_sentences, max_func, sentence_overlap
+            )
+        ]
+
+    @classmethod
+    def iter_text(
+        cls,
+        pieces: t.Union[t.Iterable[str], t.TextIO],
+        max_words: int = 0,
+        max_sentences: int = 0,
+        max_characters: int = 0,
+        max_func: t.Callable[[Chunk], bool] = None,
+        sentence_overlap: int = 0,
+        line_break_sentence_split = False,
+        max_tokens: int = 0,
+        engine: t.Union[GPTEngine, str] = GPTEngine.chatgpt,
+        batch_size: int = 256
+    ) -> t.Iterator[Chunk]:
+        """Split a stream of text into chunks, like from_text, yielding each chunk as soon as it is
+        complete. The text's sentences are streamed by Sentence.iter_text and packed in batches.
+
+        :param pieces: The text's pieces (e.g. a generator of strings) or a text file object.
+        :param batch_size: The number of new sentences to pack at once, defaults to 256.
+        :return: Iterator of chunks. See from_text for the other params.
+        """
+        if not max_func and all(max_value < 1 for max_value in [
+            max_words, max_sentences, max_characters, max_tokens
+        ]):
+            raise ValueError(
+                'At least one of the max arguments must be >= 1 or provide a max function.'
+            )
+
+        def pack(sentences: t.List[Sentence], final: bool):
+            """Yield the complete chunks and get the index of the first sentence still to pack."""
+            limits = _get_limits(sentences, max_words, max_characters, max_tokens, engine)
+            for chunk_start, chunk_end in _pack_chunks(
+                sentences, limits, max_sentences, max_func, sentence_overlap
             ):
-                return True
-            return False
-
-        sentences = Sentence.from_text(text, line_break_split=line_break_sentence_split)
-        sentence_count = len(sentences)
-        sentence_index = 0
-
-        chunks: t.List[cls] = []
-        while sentence_index < sentence_count:
-            # Get sentence and validate its length.
-            sentence = sentences[sentence_index]
-            if _larger(cls(sentences=[sentence]), sentence.length, len(sentence.words), max_func):
-                sentence_index += 1
-                #NOTE: If the sentence is bigger than the chunk size, just add it to the list.
-                chunks.append(cls(sentences=[sentence]))
-                continue
-
-            # Add next sentences to chunk until its size limits are exceeded.
-            chunk = [sentence]
-            for next_sentence in sentences[sentence_index + 1:]:
-                if _larger(
-                    cls(sentences=chunk + [next_sentence]),
-                    sum(s.length for s in chunk + [next_sentence]),
-                    sum(len(s.words) for s in chunk + [next_sentence]),
-                    max_func
-                ) or (max_sentences and len(chunk) + 1 > max_sentences):
-                    break
-                chunk.append(next_sentence)
-
-            # Increase index by chunk size and decrease by max sentence overlap length.
-            chunk_sentence_count = len(chunk)
-            sentence_index += chunk_sentence_count
-            # NOTE: Can't overlap a single sentence and the last sentence.
-            if chunk_sentence_count > 1 and sentence_index < sentence_count:
-                sentence_index -= (
-                    sentence_overlap
-                    if sentence_overlap < chunk_sentence_count
-                    else chunk_sentence_count - 1
-                )
-
-            chunks.append(cls(sentences=chunk))
-
-        return chunks
+                # NOTE: A chunk which ends with the last sentence may grow with the next ones.
+                if chunk_end == len(sentences) and not final:
+                    return chunk_start
+                yield cls(sentences=sentences[chunk_start:chunk_end])
+            return len(sentences)
+
+        sentences: t.List[Sentence] = []
+        new_sentence_count = 0
+        for sentence in Sentence.iter_text(pieces, line_break_split=line_break_sentence_split):
+            sentences.append(sentence)
+            new_sentence_count += 1
+            if new_sentence_count >= batch_size:
+                new_sentence_count = 0
+                sentences = sentences[(yield from pack(sentences, final=False)):]
+        if sentences:
+            yield from pack(sentences, final=True)
 
 
 def remove_overlaps(chunks: t.List[t.Union[dict, Chunk]]) -> str:
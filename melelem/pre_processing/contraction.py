@@ -1,4 +1,5 @@
 import typing as t
+from functools import lru_cache
 import json
 import re
 
@@ -12,7 +13,73 @@ def _load_contractions() -> t.Dict[str, str]:
         return json.load(contractions_file)
 
 
+class ContractionExpander:
+    """
+    Expands the contractions in texts. The pattern and lookup table are built once, so an expander
+    should be reused (see get_contraction_expander).
+
+    :param contractions: The expansion of each contraction
+    :param ignore_case: Whether to expand the contractions in any case, defaults to True
+    """
+
+    def __init__(self, contractions: t.Dict[str, str], ignore_case: bool = True):
+        self.ignore_case = ignore_case
+        pattern = (
+            r'(?:(?<=^)|(?<= ))'
+            + f"({'|'.join(map(re.escape, contractions.keys()))})"
+            + r'(?:(?=$)|(?= )|(?=\.))'
+        )
+        flags = re.MULTILINE
+        if ignore_case:
+            flags |= re.IGNORECASE
+            contractions = {
+                contraction.lower(): expansion
+                for contraction, expansion in contractions.items()
+            }
+        self.contractions = contractions
+        self.pattern = re.compile(pattern, flags)
+
+    def _expand_contraction(self, match: re.Match):
+        contraction: str = match.group()
+        contraction = contraction.lower() if self.ignore_case else contraction
+        expansion = self.contractions[contraction]
+        if contraction[0].isupper() and expansion[1].islower():
+            expansion = expansion[0].upper() + expansion[1:]
+        return expansion
+
+    def expand(self, text: str):
+        return self.pattern.sub(self._expand_contraction, text)
+
+    def expand_batch(self, texts: t.Iterable[str]):
+        return [self.pattern.sub(self._expand_contraction, text) for text in texts]
+
+
+@lru_cache(maxsize=32)
+def _get_custom_contraction_expander(contractions: t.Tuple[t.Tuple[str, str], ...], ignore_case: bool):
+    return ContractionExpander(dict(contractions), ignore_case)
+
+
+def get_contraction_expander(contractions: t.Dict[str, str] = None, ignore_case: bool = True):
+    """Get the cached expander of the contractions.
+
+    :param contractions: The expansion of each contraction, defaults to CONTRACTIONS
+    :param ignore_case: Whether to expand the contractions in any case, defaults to True
+    :return: The expander
+    """
+    if contractions is None:
+        return CONTRACTION_EXPANDERS()[bool(ignore_case)]
+    return _get_custom_contraction_expander(tuple(contractions.items()), bool(ignore_case))
+
+
+def _load_contraction_expanders():
+    return {
+        ignore_case: ContractionExpander(CONTRACTIONS(), ignore_case)
+        for ignore_case in [True, False]
+    }
+
+
 CONTRACTIONS = LazyLoader(_load_contractions)
+CONTRACTION_EXPANDERS = LazyLoader(_load_contraction_expanders)
 
 
 def expand_contractions(
@@ -20,27 +87,4 @@ def expand_contractions(
     contractions: t.Dict[str, str] = None,
     ignore_case: bool = True
 ):
-    if contractions is None:
-        contractions = CONTRACTIONS()
-    pattern = (
-        r'(?:(?<=^)|(?<= ))'
-        + f"({'|'.join(map(re.escape, contractions.keys()))})"
-        + r'(?:(?=$)|(?= )|(?=\.))'
-    )
-    flags = re.MULTILINE
-    if ignore_case:
-        flags |= re.IGNORECASE
-        contractions = {
-            contraction.lower(): expansion
-            for contraction, expansion in contractions.items()
-        }
-
-    def expand_contraction(match: re.Match):
-        contraction: str = match.group()
-        contraction = contraction.lower() if ignore_case else contraction
-        expansion = contractions[contraction]
-        if contraction[0].isupper() and expansion[1].islower():
-            expansion = expansion[0].upper() + expansion[1:]
-        return expansion
-
-    return re.compile(pattern, flags).sub(expand_contraction, text)
+    return get_contraction_expander(contractions, ignore_case).expand(text)
@@ -1,5 +1,4 @@
-import re
-
+from ..utilities import PATTERNS
 from .text import TextSpan
 
 
@@ -14,10 +13,10 @@ class Email(TextSpan):
         :param text: Text to get emails from
         :return: List of email spans
         """
-        matches = re.finditer(EMAIL_PATTERN, text)
+        matches = PATTERNS.compile(EMAIL_PATTERN).finditer(text)
         return cls.from_matches(matches)
 
 
 def replace_emails(text: str, replacement: str = 'email'):
     # NOTE: https://www.w3resource.com/javascript/form/email-validation.php
-    return re.sub(EMAIL_PATTERN, replacement, text)
+    return PATTERNS.compile(EMAIL_PATTERN).sub(replacement, text)
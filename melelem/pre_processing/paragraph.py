@@ -1,5 +1,4 @@
-import re
-
+from ..utilities import PATTERNS
 from .text import TextSpan
 
 
@@ -9,5 +8,5 @@ class Paragraph(TextSpan):
         """
         Splits a given text into a list of paragraphs
         """
-        matches = re.finditer(r'[\S ]+', text)
+        matches = PATTERNS.compile(r'[\S ]+').finditer(text)
         return cls.from_matches(matches)
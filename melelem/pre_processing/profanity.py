@@ -4,7 +4,7 @@ import re
 
 from ..utilities import LazyLoader
 from .. import DATA_DIR
-from .text import TextSpan, CHAR_SUBSTITUTION_PATTERNS
+from .text import TextSpan, CHAR_SUBSTITUTIONS, CHAR_SUBSTITUTION_PATTERNS
 
 
 def _load_profanities() -> t.Set[str]:
@@ -13,29 +13,93 @@ def _load_profanities() -> t.Set[str]:
         return set(json.load(profanities_file))
 
 
+def _get_char_patterns(profanity: str):
+    char_patterns = []
+    for char in profanity:
+        char_pattern = CHAR_SUBSTITUTION_PATTERNS().get(char.upper())
+        if char_pattern is None:
+            char_pattern = r' +' if char == ' ' else char
+        char_patterns.append(char_pattern)
+    return char_patterns
+
+
+def _get_first_chars(char: str) -> t.Set[str]:
+    """Get the chars with which the pattern of a profanity's char can start."""
+    substitutions = CHAR_SUBSTITUTIONS().get(char.upper())
+    if substitutions is None:
+        return {char}
+    return {char.upper(), char.lower()} | {substitution[0] for substitution in substitutions}
+
+
 def _load_profanity_patterns():
     profanity_patterns: t.Set[str] = set()
     for profanity in PROFANITIES():
-        char_patterns = []
-        for char in profanity:
-            char_pattern = CHAR_SUBSTITUTION_PATTERNS().get(char.upper())
-            if char_pattern is None:
-                char_pattern = r' +' if char == ' ' else char
-            char_patterns.append(char_pattern)
-        profanity_pattern = r'\b{}\b'.format(''.join(char_patterns))
+        profanity_pattern = r'\b{}\b'.format(''.join(_get_char_patterns(profanity)))
         profanity_patterns.add(profanity_pattern)
     return profanity_patterns
 
 
+class ProfanityMatcher:
+    """
+    Finds the matches of all the profanity patterns in one scan of a text.
+
+    The profanities are compiled into a trie of their chars' (substitution) patterns, which is
+    searched in a lookahead at every word boundary. It finds the positions at which any profanity
+    matches while trying each char's pattern once per trie node, instead of once per profanity.
+    At these (rare) positions, the profanities which may start with the char are matched one by
+    one, so each profanity's matches are exactly those of finditer with its own pattern.
+    """
+
+    def __init__(self, profanities: t.Iterable[str]):
+        profanities = sorted(profanities)
+        trie: t.Dict[str, t.Any] = {}
+        self.patterns_by_first_char: t.Dict[str, t.List[t.Tuple[int, t.Pattern]]] = {}
+        for index, profanity in enumerate(profanities):
+            char_patterns = _get_char_patterns(profanity)
+            node = trie
+            for char_pattern in char_patterns:
+                node = node.setdefault(char_pattern, {})
+            node[None] = {}
+
+            pattern = re.compile(r'\b{}\b'.format(''.join(char_patterns)))
+            for first_char in _get_first_chars(profanity[0]):
+                self.patterns_by_first_char.setdefault(first_char, []).append((index, pattern))
+        self.pattern_count = len(profanities)
+        self.candidate_pattern = re.compile(r'\b(?={})'.format(self._get_trie_pattern(trie)))
+
+    @classmethod
+    def _get_trie_pattern(cls, node: t.Dict[str, t.Any]) -> str:
+        branches = [
+            r'\b' if char_pattern is None else char_pattern + cls._get_trie_pattern(child)
+            for char_pattern, child in node.items()
+        ]
+        return branches[0] if len(branches) == 1 else '(?:{})'.format('|'.join(branches))
+
+    def finditer(self, text: str) -> t.Iterator[re.Match]:
+        """Find the matches of all the profanity patterns, sorted by start.
+
+        :param text: The text to find profanities in
+        :return: Iterator of matches
+        """
+        # The end of each profanity's last match, before which it cannot match again.
+        last_ends = [0] * self.pattern_count
+        for candidate in self.candidate_pattern.finditer(text):
+            position = candidate.start()
+            for index, pattern in self.patterns_by_first_char.get(text[position], []):
+                if position < last_ends[index]:
+                    continue
+                match = pattern.match(text, position)
+                if match:
+                    last_ends[index] = match.end()
+                    yield match
+
+
 PROFANITIES = LazyLoader(_load_profanities)
 PROFANITY_PATTERNS = LazyLoader(_load_profanity_patterns)
+PROFANITY_MATCHER = LazyLoader(lambda: ProfanityMatcher(PROFANITIES()))
 
 
 class Profanity(TextSpan):
     @classmethod
     def from_text(cls, text: str):
-        return cls.from_matches([
-            match
-            for profanity_pattern in PROFANITY_PATTERNS()
-            for match in re.finditer(profanity_pattern, text)
-        ])
+        return cls.from_matches(PROFANITY_MATCHER().finditer(text))
@@ -1,7 +1,7 @@
 import typing as t
 import string
-import re
 
+from ..utilities import PATTERNS
 from .text import TextSpan
 
 
@@ -12,14 +12,14 @@ not_punct = r'[^{}]'.format(string.punctuation)
 class Punctuation(TextSpan):
     @classmethod
     def from_text(cls, text: str):
-        matches = re.finditer(punct, text)
+        matches = PATTERNS.compile(punct).finditer(text)
         return cls.from_matches(matches)
 
 
 def split_punctuations(text: str, span_offset: int = 0):
     pattern = r'{not_punct}+'.format(not_punct=not_punct)
     text_spans: t.List[TextSpan] = []
-    for match in re.finditer(pattern, text):
+    for match in PATTERNS.compile(pattern).finditer(text):
         span = match.span()
         text_spans.append(TextSpan(
             text=match.group(),
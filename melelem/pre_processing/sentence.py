@@ -1,11 +1,37 @@
 import typing as t
-from functools import reduce
+from array import array
 import re
 
-from .text import TextSpan, Span
-from .abbreviation import Abbreviation
-from .email import Email
-from .url import Url
+from ..utilities import LazyLoader, PATTERNS
+from .text import TextSpan, TextSpanArray, Span
+from .abbreviation import (
+    KNOWN_ABBREVIATIONS_PATTERN_FOR_SEGMENTATION,
+    UNKNOWN_ABBREVIATIONS_PATTERN_FOR_SEGMENTATION
+)
+from .email import EMAIL_PATTERN
+from .url import URL_PATTERN
+
+
+# The regions in which a punctuation or line break does not end a sentence.
+FLOATING_POINT_NUMBER_PATTERN = r'\b(?:\d+\.\d+)'
+NUMBERED_LIST_PATTERN = r'(?:\n[\d|A-Za-z]{1,3})(\.)'
+
+
+def _load_non_break_patterns() -> t.List[t.Pattern]:
+    return [
+        PATTERNS.compile(KNOWN_ABBREVIATIONS_PATTERN_FOR_SEGMENTATION()),
+        PATTERNS.compile(UNKNOWN_ABBREVIATIONS_PATTERN_FOR_SEGMENTATION(), re.MULTILINE),
+        PATTERNS.compile(URL_PATTERN),
+        PATTERNS.compile(EMAIL_PATTERN),
+        PATTERNS.compile(FLOATING_POINT_NUMBER_PATTERN),
+        PATTERNS.compile(NUMBERED_LIST_PATTERN)
+    ]
+
+
+NON_BREAK_PATTERNS = LazyLoader(_load_non_break_patterns)
+# A sentence-breaking punctuation (group 1) or a run of line breaks.
+BOUNDARY_PATTERN = r'([.!?])|[\r\n\t\f]+'
+WHITESPACE_PATTERN = r'\s+'
 
 
 class Sentence(TextSpan):
@@ -14,43 +40,75 @@ class Sentence(TextSpan):
         return self.text.istitle()
 
     @staticmethod
-    def _reduce_non_break_spans(*text_span_lists: t.List[TextSpan]):
-        def get_spans(spans: t.List[Span], text_spans: t.List[TextSpan]):
-            return spans + [text_span.span for text_span in text_spans]
-        return reduce(get_spans, text_span_lists, [])
+    def _get_non_break_spans(text: str) -> t.List[Span]:
+        """Get the regions of the text which are never split (abbreviations, URLs, emails, floating
+        point numbers and numbered lists), merged and sorted.
 
-    @classmethod
-    def _get_sent_boundaries(cls, text: str, non_break_spans: t.List[Span], line_break_split=False):
-        punct_break_spans = [match.span() for match in re.finditer(r'[.!?]', text)]
-        punct_break_spans = cls.get_non_overlapping_spans(non_break_spans, punct_break_spans)
-        punct_break_spans = cls.merge_spans(punct_break_spans)
-        
-        line_break_spans = None
-        if line_break_split:
-            line_break_spans = [match.span() for match in re.finditer(r'[\r\n\t\f]+', text)]
-            line_break_spans = cls.get_non_overlapping_spans(non_break_spans, line_break_spans)
-
-        return punct_break_spans, line_break_spans
+        NOTE: Matches of different patterns may overlap, and an alternation of the patterns would
+        only find the first of overlapping matches, so each pattern scans the text on its own.
+        """
+        spans = [match.span() for pattern in NON_BREAK_PATTERNS() for match in pattern.finditer(text)]
+        return TextSpan.merge_spans(spans)
 
     @classmethod
-    def _get_split_spans(
-        cls,
-        text: str,
-        punct_sent_boundaries: t.List[Span],
-        line_sent_boundaries: t.List[Span] = None
-    ):
-        split_spans = []
-        if line_sent_boundaries:
-            split_spans = line_sent_boundaries.copy()
-        for (_, span_end) in punct_sent_boundaries:
-            match = re.match(r'\s+', text[span_end:])
-            if match:
-                span = match.span()
-                span = (span_end + span[0], span_end + span[1])
+    def _get_split_offsets(cls, text: str, line_break_split=False) -> t.Tuple[t.List[int], t.List[int]]:
+        """Find the sentence boundaries in a single scan of the text, outside the non-break spans.
+
+        Consecutive breaking punctuations form one boundary, which is split on along with the
+        whitespaces following it. Line break runs are split on if line_break_split.
+
+        :param text: The text to split into sentences
+        :param line_break_split: Whether to consider line breaks as sentence boundaries
+        :return: The starts and ends of the merged, sorted spans to split the text on
+        """
+        non_break_spans = cls._get_non_break_spans(text)
+        non_break_count = len(non_break_spans)
+        non_break_index = 0
+
+        split_starts: t.List[int] = []
+        split_ends: t.List[int] = []
+
+        def add_split_span(span_start: int, span_end: int):
+            if split_ends and span_start <= split_ends[-1]:
+                if span_end > split_ends[-1]:
+                    split_ends[-1] = span_end
+            else:
+                split_starts.append(span_start)
+                split_ends.append(span_end)
+
+        whitespace_pattern = PATTERNS.compile(WHITESPACE_PATTERN)
+
+        def add_punct_split_span(punct_end: int):
+            match = whitespace_pattern.match(text, punct_end)
+            add_split_span(punct_end, match.end() if match else punct_end)
+
+        # The end of the consecutive breaking punctuations pending to be split on.
+        punct_end = None
+        for match in PATTERNS.compile(BOUNDARY_PATTERN).finditer(text):
+            is_punct = match.start(1) >= 0
+            if not is_punct and not line_break_split:
+                continue
+
+            span_start, span_end = match.span()
+            while non_break_index < non_break_count and non_break_spans[non_break_index][1] <= span_start:
+                non_break_index += 1
+            if non_break_index < non_break_count and non_break_spans[non_break_index][0] < span_end:
+                continue
+
+            if is_punct and punct_end == span_start:
+                punct_end = span_end
+                continue
+            if punct_end is not None:
+                add_punct_split_span(punct_end)
+                punct_end = None
+            if is_punct:
+                punct_end = span_end
             else:
-                span = (span_end, span_end)
-            split_spans.append(span)
-        return split_spans
+                add_split_span(span_start, span_end)
+        if punct_end is not None:
+            add_punct_split_span(punct_end)
+
+        return split_starts, split_ends
 
     @classmethod
     def from_text(cls, text: str, span_offset: int = 0, line_break_split=False):
@@ -61,30 +119,91 @@ class Sentence(TextSpan):
         :param line_break_split: Whether to consider line breaks as sentence boundaries
         :return: List of sentence spans
         """
-        # Get non break text spans.
-        known_abbreviations, unknown_abbreviations = Abbreviation.from_text(text, for_segmentation=True)
-        urls = Url.from_text(text)
-        emails = Email.from_text(text)
-        floating_point_numbers = TextSpan.from_matches(re.finditer(r'\b(?:\d+\.\d+)', text))
-        numbered_lists = TextSpan.from_matches(re.finditer(r'(?:\n[\d|A-Za-z]{1,3})(\.)', text))
-        non_break_spans = cls._reduce_non_break_spans(
-            known_abbreviations,
-            unknown_abbreviations,
-            urls,
-            emails,
-            floating_point_numbers,
-            numbered_lists
-        )
-
-        punct_sent_boundaries, line_sent_boundaries = cls._get_sent_boundaries(text, non_break_spans, line_break_split)
-        if punct_sent_boundaries or line_sent_boundaries:
-            split_spans = cls._get_split_spans(text, punct_sent_boundaries, line_sent_boundaries)
-            return cls.split(text, split_spans, span_offset)
-        else:
-            return [cls(
-                text=text,
-                span=(span_offset, span_offset + len(text))
-            )]
+        return list(cls.array_from_text(text, span_offset, line_break_split))
+
+    @classmethod
+    def array_from_text(cls, text: str, span_offset: int = 0, line_break_split=False) -> TextSpanArray['Sentence']:
+        """Like from_text, but the sentences are stored compactly as offsets into the text, which
+        saves most of the memory of large documents' sentences.
+
+        :return: Array of sentence spans
+        """
+        split_starts, split_ends = cls._get_split_offsets(text, line_break_split)
+        if not split_starts:
+            return TextSpanArray(text, [0], [len(text)], span_offset, cls)
+
+        starts, ends = array('q'), array('q')
+        for span_start, span_end in zip([0] + split_ends, split_starts + [len(text)]):
+            if span_start != span_end:
+                starts.append(span_start)
+                ends.append(span_end)
+        return TextSpanArray(text, starts, ends, span_offset, cls)
+
+    @classmethod
+    def iter_text(
+        cls,
+        pieces: t.Union[t.Iterable[str], t.TextIO],
+        line_break_split=False,
+        lookahead: int = 256,
+        min_segment_length: int = 1 << 16
+    ) -> t.Iterator['Sentence']:
+        """Split a stream of text into sentences, like from_text, yielding each sentence as soon as
+        it is certain. Memory is bounded by the longest sentence plus the buffered text.
+
+        The text is buffered and segmented every min_segment_length characters. A sentence is only
+        yielded once at least lookahead characters follow it, so abbreviations, URLs and numbers
+        spanning a piece boundary are segmented as in the whole text. The last yielded sentence is
+        kept as the next segmentation's left context.
+
+        :param pieces: The text's pieces (e.g. a generator of strings) or a text file object
+        :param line_break_split: Whether to consider line breaks as sentence boundaries
+        :param lookahead: The min number of characters which must follow a sentence to yield it, defaults to 256
+        :param min_segment_length: The min number of new characters to segment the buffer, defaults to 65536
+        :return: Iterator of sentence spans, with offsets in the whole text
+        """
+        if hasattr(pieces, 'read'):
+            file = pieces
+            pieces = iter(lambda: file.read(min_segment_length), '')
+
+        buffer, buffer_offset = '', 0
+        # The end of the last yielded sentence (in the whole text).
+        yielded_end = 0
+        new_length = 0
+
+        def segment(final: bool):
+            nonlocal buffer, buffer_offset, yielded_end
+            sentences = cls.from_text(buffer, span_offset=buffer_offset, line_break_split=line_break_split)
+            if not final:
+                # Keep the last sentence and those within the lookahead.
+                certain_end = buffer_offset + len(buffer) - lookahead
+                sentences = [sentence for sentence in sentences[:-1] if sentence.span_end <= certain_end]
+
+            context_start = None
+            for sentence in sentences:
+                if sentence.span_end <= yielded_end:
+                    # Already yielded (left context).
+                    continue
+                if sentence.span_start < yielded_end:
+                    # NOTE: Defensive, the left context's end should remain a boundary.
+                    sentence = cls(
+                        text=buffer[yielded_end - buffer_offset:sentence.span_end - buffer_offset],
+                        span=(yielded_end, sentence.span_end)
+                    )
+                yield sentence
+                yielded_end, context_start = sentence.span_end, sentence.span_start
+
+            if context_start is not None:
+                buffer = buffer[context_start - buffer_offset:]
+                buffer_offset = context_start
+
+        for piece in pieces:
+            buffer += piece
+            new_length += len(piece)
+            if new_length >= min_segment_length and len(buffer) > lookahead:
+                new_length = 0
+                yield from segment(final=False)
+        if buffer:
+            yield from segment(final=True)
 
 
 def fix_truncated_text(answer: str):
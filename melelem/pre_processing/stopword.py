@@ -1,10 +1,11 @@
 import typing as t
+import heapq
 import os
 import re
 
-from ..utilities import LazyLoader
+from ..utilities import LazyLoader, PATTERNS
 from .. import DATA_DIR
-from .text import TextSpan
+from .text import TextSpan, Span, WORD_PATTERN
 
 
 def _load_stopwords():
@@ -25,8 +26,132 @@ def _load_stopwords_patterns():
     }
 
 
+def _is_word_char(char: str):
+    # NOTE: As \w in the re module.
+    return char.isalnum() or char == '_'
+
+
+def _fold_case(text: str, strict: bool = False):
+    # NOTE: Through upper case and with a single sigma, so chars only equal in upper case (e.g. 'ı'
+    # and 'i') are equal, as with re.IGNORECASE, unless it changes the length (e.g. 'ß' to 'SS').
+    # Then None if strict, else the text in lower case.
+    folded_text = text.upper().lower().replace('ς', 'σ')
+    if len(folded_text) == len(text):
+        return folded_text
+    return None if strict else text.lower().replace('ς', 'σ')
+
+
+def _is_word_boundary(text: str, index: int):
+    is_word_before = index > 0 and _is_word_char(text[index - 1])
+    is_word_after = index < len(text) and _is_word_char(text[index])
+    return is_word_before != is_word_after
+
+
+class StopwordMatcher:
+    """
+    Finds the stopwords of a language in a text, like the regex \\b(stopword|...)\\b but by looking
+    up each word of the text in a set, instead of trying every stopword at every word boundary.
+
+    Stopwords with non-word chars (e.g. "don't", "pertama-tama" or multiple words) are indexed by
+    their first word and tried longest first where it occurs. The few which start with a non-word
+    char are tried after every word. Where stopwords overlap (e.g. "don" and "don't"), the longest
+    one is matched.
+
+    :param stopwords: The stopwords
+    :param ignore_case: Whether to match the stopwords in any case, defaults to True
+    """
+
+    def __init__(self, stopwords: t.Iterable[str], ignore_case: bool = True):
+        self.ignore_case = ignore_case
+        self.words: t.Set[str] = set()
+        self.phrases_by_first_word: t.Dict[str, t.List[str]] = {}
+        self.non_word_phrases: t.List[str] = []
+
+        word_pattern = PATTERNS.compile(WORD_PATTERN)
+        for stopword in stopwords:
+            if not stopword:
+                continue
+            if ignore_case:
+                stopword = _fold_case(stopword)
+            first_word = word_pattern.match(stopword)
+            if first_word is None:
+                self.non_word_phrases.append(stopword)
+            elif first_word.end() == len(stopword):
+                self.words.add(stopword)
+            else:
+                self.phrases_by_first_word.setdefault(first_word.group(), []).append(stopword)
+
+        for phrases in self.phrases_by_first_word.values():
+            phrases.sort(key=len, reverse=True)
+        self.non_word_phrases.sort(key=len, reverse=True)
+
+    def _match_phrase(self, text: str, folded_text: t.Optional[str], start: int, phrases: t.List[str]):
+        for phrase in phrases:
+            end = start + len(phrase)
+            if folded_text is not None:
+                phrase_text = folded_text[start:end]
+            else:
+                phrase_text = _fold_case(text[start:end]) if self.ignore_case else text[start:end]
+            if phrase_text == phrase and _is_word_boundary(text, end):
+                return end
+        return None
+
+    def find_spans(self, text: str) -> t.List[Span]:
+        """Find the spans of the stopwords in a text, in order.
+
+        :param text: The text to find stopwords in
+        :return: The stopwords' spans
+        """
+        # The text whose slices are looked up, unless some char's case changes its length, and the
+        # slices are then folded one by one.
+        folded_text = _fold_case(text, strict=True) if self.ignore_case else text
+
+        spans: t.List[Span] = []
+        words, phrases_by_first_word, non_word_phrases = self.words, self.phrases_by_first_word, self.non_word_phrases
+        last_end = 0
+        for match in PATTERNS.compile(WORD_PATTERN).finditer(text):
+            start, end = match.span()
+            if start >= last_end:
+                word = folded_text[start:end] if folded_text is not None else _fold_case(match.group())
+                phrases = phrases_by_first_word.get(word)
+                phrase_end = self._match_phrase(text, folded_text, start, phrases) if phrases else None
+                if phrase_end is not None:
+                    spans.append((start, phrase_end))
+                    last_end = phrase_end
+                elif word in words:
+                    spans.append((start, end))
+                    last_end = end
+
+            if non_word_phrases and end >= last_end and end < len(text):
+                phrase_end = self._match_phrase(text, folded_text, end, non_word_phrases)
+                if phrase_end is not None:
+                    spans.append((end, phrase_end))
+                    last_end = phrase_end
+        return spans
+
+
+def _load_stopword_language_index():
+    """Get the languages, and the bitmask of the languages (by index) of which each word is a stopword."""
+    languages = list(STOPWORDS())
+    language_masks: t.Dict[str, int] = {}
+    for index, language in enumerate(languages):
+        for stopword in STOPWORDS()[language]:
+            language_masks[stopword] = language_masks.get(stopword, 0) | (1 << index)
+    return languages, language_masks
+
+
+def _load_stopword_matchers():
+    return {
+        (language, ignore_case): StopwordMatcher(stopwords, ignore_case)
+        for language, stopwords in STOPWORDS().items()
+        for ignore_case in [True, False]
+    }
+
+
 STOPWORDS = LazyLoader(_load_stopwords)
 STOPWORDS_PATTERNS = LazyLoader(_load_stopwords_patterns)
+STOPWORD_MATCHERS = LazyLoader(_load_stopword_matchers)
+STOPWORD_LANGUAGE_INDEX = LazyLoader(_load_stopword_language_index)
 
 
 class Stopword(TextSpan):
@@ -38,9 +163,11 @@ class Stopword(TextSpan):
         ignore_case: bool = True,
         span_offset: int = 0
     ):
-        pattern = STOPWORDS_PATTERNS()[language.lower()]
-        matches = re.finditer(pattern, text, flags=re.IGNORECASE if ignore_case else None)
-        return cls.from_matches(matches, span_offset)
+        matcher = STOPWORD_MATCHERS()[(language.lower(), bool(ignore_case))]
+        return [
+            cls(text=text[span_start:span_end], span=(span_offset + span_start, span_offset + span_end))
+            for span_start, span_end in matcher.find_spans(text)
+        ]
 
     @classmethod
     def split_text(
@@ -55,11 +182,76 @@ class Stopword(TextSpan):
         return TextSpan.split(text, spans, span_offset) if spans else []
 
 
-def get_language(text: str):
-    """Detect language based on the presence of stop words."""
-    words = set(text.lower().split())
-    lang_stopword_counts = {
-        lang: len(words & stopwords)
-        for lang, stopwords in STOPWORDS().items()
-    }
-    return max(lang_stopword_counts.items(), key=lambda item: item[1])[0]
+# The min number of chars of a sample's window, below which most of its words would be cut.
+MIN_SAMPLE_WINDOW_SIZE = 64
+
+
+def _get_sample_words(text: str, sample_size: int, max_window_count: int = 8) -> t.List[str]:
+    """Get the words of windows of the text, evenly spread and of sample_size chars in total. The
+    words cut by a window's edges are dropped. Samples too small for a window of
+    MIN_SAMPLE_WINDOW_SIZE chars get the words of the whole text."""
+    window_count = min(max_window_count, sample_size // MIN_SAMPLE_WINDOW_SIZE)
+    if window_count < 1 or len(text) <= sample_size:
+        return text.split()
+
+    window_size = sample_size // window_count
+    step = len(text) // window_count
+    words: t.List[str] = []
+    for window_start in range(0, window_count * step, step):
+        window_end = window_start + window_size
+        window_words = text[window_start:window_end].split()
+        if window_start > 0 and not text[window_start - 1].isspace() and window_words:
+            window_words = window_words[1:]
+        if window_end < len(text) and not text[window_end].isspace() and window_words:
+            window_words = window_words[:-1]
+        words.extend(window_words)
+    return words
+
+
+def get_language(text: str, early_stop_margin: int = None, sample_size: int = None):
+    """Detect language based on the presence of stop words: the language with the most distinct
+    stopwords in the text.
+
+    :param text: The text
+    :param early_stop_margin: Stop counting once a language has this many more stopwords than any other, defaults to None
+    :param sample_size: Only count the stopwords in this many chars of longer texts (at least MIN_SAMPLE_WINDOW_SIZE), defaults to None
+    :return: The language
+    """
+    languages, language_masks = STOPWORD_LANGUAGE_INDEX()
+    if sample_size is not None:
+        words = _get_sample_words(text.lower(), sample_size)
+    else:
+        words = text.lower().split()
+
+    if early_stop_margin is None:
+        # NOTE: The order does not matter, so the distinct stopwords are found at once.
+        words = language_masks.keys() & set(words)
+
+    counts = [0] * len(languages)
+    counted_words: t.Set[str] = set()
+    for word in words:
+        mask = language_masks.get(word)
+        if mask is None or word in counted_words:
+            continue
+        counted_words.add(word)
+        while mask:
+            bit = mask & -mask
+            counts[bit.bit_length() - 1] += 1
+            mask ^= bit
+
+        if early_stop_margin is not None:
+            first_count, second_count = heapq.nlargest(2, counts)
+            if first_count - second_count >= early_stop_margin:
+                break
+    return languages[counts.index(max(counts))]
+
+
+def get_languages(texts: t.Iterable[str], early_stop_margin: int = None, sample_size: int = None):
+    """Detect the language of many texts (see get_language).
+
+    :param texts: The texts
+    :param early_stop_margin: Stop counting once a language has this many more stopwords than any other, defaults to None
+    :param sample_size: Only count the stopwords in this many chars of longer texts, defaults to None
+    :return: The languages
+    """
+    return [get_language(text, early_stop_margin, sample_size) for text in texts]
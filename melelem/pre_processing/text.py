@@ -1,9 +1,13 @@
 import typing as t
 from dataclasses import dataclass
+from bisect import bisect_left
+from itertools import accumulate
+from array import array
+import codecs
 import json
 import re
 
-from ..utilities import LazyLoader
+from ..utilities import LazyLoader, PATTERNS
 from .. import DATA_DIR
 
 
@@ -28,6 +32,21 @@ CHAR_SUBSTITUTION_PATTERNS = LazyLoader(_load_char_substitution_patterns)
 
 
 Span = t.Tuple[int, int]
+# A word is a maximal run of word characters, i.e. what remains of splitting on non-word characters.
+WORD_PATTERN = r'\w+'
+NON_WORD_CHAR_PATTERN = r'\W'
+# Maps the ASCII non-word characters to spaces (as \W in the re module).
+ASCII_NON_WORD_CHAR_TABLE = str.maketrans({
+    chr(code): ' ' for code in range(128) if not (chr(code).isalnum() or chr(code) == '_')
+})
+
+
+def _mask_non_word_chars(text: str):
+    """Replace every non-word character by a space, so the words are what str.split returns and
+    the offsets are unchanged. Translating is much faster than the regex for ASCII text."""
+    if text.isascii():
+        return text.translate(ASCII_NON_WORD_CHAR_TABLE)
+    return PATTERNS.compile(NON_WORD_CHAR_PATTERN).sub(' ', text)
 
 
 @dataclass(frozen=True)
@@ -48,37 +67,48 @@ class TextSpan:
         return self.span[1]
 
     @property
-    def words(self):
-        words = re.split(r'\W+', self.text)
-        if words:
-            words = words[1 if words[0] == '' else 0:]
-        if words:
-            words = words[:-1 if words[-1] == '' else len(words)]
+    def words(self) -> t.List[str]:
+        """The words of the text. They are segmented once and memoized, so the list must not be
+        modified."""
+        words = self.__dict__.get('_words')
+        if words is None:
+            words = PATTERNS.compile(WORD_PATTERN).findall(self.text)
+            # NOTE: The dataclass is frozen, so the words are memoized around its __setattr__.
+            object.__setattr__(self, '_words', words)
         return words
 
+    @property
+    def word_count(self):
+        """The number of words of the text, counted without segmenting them (unless memoized)."""
+        words = self.__dict__.get('_words')
+        if words is not None:
+            return len(words)
+        return len(_mask_non_word_chars(self.text).split())
+
     @staticmethod
-    def merge_spans(spans: t.List[Span]):
-        spans = spans.copy()
+    def merge_spans(spans: t.List[Span], is_sorted: bool = False):
+        """Merge the spans which overlap or touch (e.g. (0, 5) and (5, 8) merge into (0, 8)).
+
+        :param spans: The spans to merge
+        :param is_sorted: Whether the spans are already sorted, so they need not be copied and sorted, defaults to False
+        :return: The merged spans, sorted
+        """
+        if not is_sorted:
+            spans = sorted(spans)
+
         merged_spans: t.List[Span] = []
-        while spans:
-            span = spans.pop(0)
-            span_index = 0
-            while span_index < len(spans):
-                next_span = spans[span_index]
-                if (
-                    next_span[0] <= span[0] <= next_span[1]
-                    or next_span[0] <= span[1] <= next_span[1]
-                ):
-                    span = (
-                        span[0] if span[0] <= next_span[0] else next_span[0],
-                        span[1] if span[1] >= next_span[1] else next_span[1]
-                    )
-                    spans.pop(span_index)
-                    span_index = 0
-                else:
-                    span_index += 1
-            merged_spans.append(span)
-        merged_spans.sort()
+        span_start = span_end = None
+        for next_span_start, next_span_end in spans:
+            if span_start is None:
+                span_start, span_end = next_span_start, next_span_end
+            elif next_span_start <= span_end:
+                if next_span_end > span_end:
+                    span_end = next_span_end
+            else:
+                merged_spans.append((span_start, span_end))
+                span_start, span_end = next_span_start, next_span_end
+        if span_start is not None:
+            merged_spans.append((span_start, span_end))
         return merged_spans
 
     @classmethod
@@ -121,51 +151,214 @@ class TextSpan:
 
     @staticmethod
     def get_non_overlapping_spans(spans: t.List[Span], possibly_overlapping_spans: t.List[Span]):
-        return [
-            possibly_overlapping_span
-            for possibly_overlapping_span in possibly_overlapping_spans
-            if all(
-                possibly_overlapping_span[0] >= span[1]
-                or possibly_overlapping_span[1] <= span[0]
-                for span in spans
+        """Get the possibly overlapping spans which overlap none of the spans, in their order.
+
+        The spans are sorted by start, so the spans starting before a possibly overlapping span
+        ends are found by bisection and overlap it iff the max of their ends is past its start.
+
+        :param spans: The spans not to overlap
+        :param possibly_overlapping_spans: The spans to filter
+        :return: The non-overlapping spans
+        """
+        if not spans:
+            return list(possibly_overlapping_spans)
+
+        spans = sorted(spans)
+        span_starts = [span[0] for span in spans]
+        max_span_ends = list(accumulate((span[1] for span in spans), max))
+        non_overlapping_spans = []
+        for possibly_overlapping_span in possibly_overlapping_spans:
+            span_count = bisect_left(span_starts, possibly_overlapping_span[1])
+            if span_count == 0 or max_span_ends[span_count - 1] <= possibly_overlapping_span[0]:
+                non_overlapping_spans.append(possibly_overlapping_span)
+        return non_overlapping_spans
+
+
+TextSpanType = t.TypeVar('TextSpanType', bound=TextSpan)
+
+
+class TextSpanArray(t.Sequence[TextSpanType]):
+    """
+    A compact, immutable sequence of text spans of one source text. The spans' offsets are stored
+    in parallel integer arrays (8 bytes per offset) and their texts are sliced from the source
+    text only when accessed, instead of an object, a tuple and a copy of the text per span.
+    Indexing and iterating produce the span_cls objects, so it can be used in place of a list.
+
+    :param text: The source text, which the offsets index
+    :param starts: The start of each span in the source text
+    :param ends: The end of each span in the source text
+    :param span_offset: Offset all spans produced (useful if text is subtext), defaults to 0
+    :param span_cls: The class of the spans produced, defaults to TextSpan
+    """
+
+    __slots__ = ('source', 'starts', 'ends', 'span_offset', 'span_cls')
+
+    def __init__(
+        self,
+        text: str,
+        starts: t.Iterable[int],
+        ends: t.Iterable[int],
+        span_offset: int = 0,
+        span_cls: t.Type[TextSpanType] = TextSpan
+    ):
+        self.source = text
+        self.starts = starts if isinstance(starts, array) else array('q', starts)
+        self.ends = ends if isinstance(ends, array) else array('q', ends)
+        if len(self.starts) != len(self.ends):
+            raise ValueError('starts and ends must have the same length.')
+        self.span_offset = span_offset
+        self.span_cls = span_cls
+
+    @classmethod
+    def from_matches(
+        cls,
+        text: str,
+        matches: t.Iterator[re.Match],
+        span_offset: int = 0,
+        span_cls: t.Type[TextSpanType] = TextSpan
+    ):
+        """Like TextSpan.from_matches, but only the offsets of the matches are kept.
+
+        :param text: The text which was searched
+        :param matches: The matches in the text
+        """
+        starts, ends = array('q'), array('q')
+        for match in matches:
+            span_start, span_end = match.span()
+            starts.append(span_start)
+            ends.append(span_end)
+        return cls(text, starts, ends, span_offset, span_cls)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(self.source, self.starts[index], self.ends[index], self.span_offset, self.span_cls)
+        span_start, span_end = self.starts[index], self.ends[index]
+        return self.span_cls(
+            text=self.source[span_start:span_end],
+            span=(self.span_offset + span_start, self.span_offset + span_end)
+        )
+
+    def __iter__(self):
+        source, span_offset, span_cls = self.source, self.span_offset, self.span_cls
+        for span_start, span_end in zip(self.starts, self.ends):
+            yield span_cls(
+                text=source[span_start:span_end],
+                span=(span_offset + span_start, span_offset + span_end)
+            )
+
+    def __eq__(self, other):
+        if isinstance(other, TextSpanArray):
+            return (
+                self.span_cls is other.span_cls
+                and self.spans == other.spans
+                and all(map(str.__eq__, self.texts, other.texts))
             )
+        return NotImplemented
+
+    def __repr__(self):
+        return f'{type(self).__name__}(span_cls={self.span_cls.__name__}, length={len(self)})'
+
+    @property
+    def spans(self) -> t.List[Span]:
+        return [
+            (self.span_offset + span_start, self.span_offset + span_end)
+            for span_start, span_end in zip(self.starts, self.ends)
+        ]
+
+    @property
+    def texts(self) -> t.Iterator[str]:
+        """The spans' texts, sliced one at a time."""
+        source = self.source
+        return (source[span_start:span_end] for span_start, span_end in zip(self.starts, self.ends))
+
+    @property
+    def lengths(self) -> t.Iterator[int]:
+        return map(int.__sub__, self.ends, self.starts)
+
+    def get_word_counts(self) -> t.List[int]:
+        """Get the number of words of each span, like TextSpan.word_count, masking the non-word
+        characters of the source text in a single pass. A span which cuts a word counts its part.
+
+        :return: The word count of each span
+        """
+        if not self.starts:
+            return []
+        mask_start = min(self.starts)
+        mask = _mask_non_word_chars(self.source[mask_start:max(self.ends)])
+        return [
+            len(mask[span_start - mask_start:span_end - mask_start].split())
+            for span_start, span_end in zip(self.starts, self.ends)
         ]
 
 
 def remove_possessions(text: str):
-    return re.sub(r'(?<=\w)\'s', '', text)
+    return PATTERNS.compile(r'(?<=\w)\'s').sub('', text)
 
 
 def replace_newlines(text: str, replacement: str = ' '):
-    return re.sub(r'[\r|\n|\r\n]+', replacement, text)
+    return PATTERNS.compile(r'[\r|\n|\r\n]+').sub(replacement, text)
 
 
 def replace_excessive_spaces(text: str):
-    return re.sub(r'[ ]{2,}', ' ', text)
+    return PATTERNS.compile(r'[ ]{2,}').sub(' ', text)
 
 
 def replace_brackets(text: str, replacement: str = ''):
-    return re.sub(r'( )?[\(\[].*?[\)\]]', replacement, text)
+    return PATTERNS.compile(r'( )?[\(\[].*?[\)\]]').sub(replacement, text)
 
 
 def replace_special_chars(text: str, replacement: str = ''):
-    return re.sub(r'[^a-zA-Z0-9.,!?/:;\"\'\s]', replacement, text)
-
+    return PATTERNS.compile(r'[^a-zA-Z0-9.,!?/:;\"\'\s]').sub(replacement, text)
 
-def normalize_chars(text: str, encoding: str = 'utf-8', errors: str = 'ignore'):
-    text = re.sub(r'\x0d|\x1b|\x07|\uf0b7|\uf020|\u202f|\x02|(\(cid:\d+\))', '', text)
 
+# The chars which normalize_chars removes or replaces.
+CHAR_NORMALIZATIONS: t.Dict[str, str] = {
+    # removed
+    **dict.fromkeys('\x0d\x1b\x07\uf0b7\uf020\u202f\x02', ''),
     # whitespaces
-    text = re.sub(r'\x0c|\x0b|\xa0|\x09', ' ', text)
+    **dict.fromkeys('\x0c\x0b\xa0\x09', ' '),
+    # apostrophes
+    '\u201c': '"',
+    '\u201d': '"',
+    '\u2018': '\'',
+    '\u2019': '\'',
+    '\u2013': '-'
+}
+# str.translate is only fast on ASCII text mapped 1:1, so the ASCII chars to remove are mapped to
+# '\r' (which is removed too) and removed at once after the translation.
+ASCII_CHAR_NORMALIZATION_TABLE = str.maketrans({
+    char: normalization or '\r'
+    for char, normalization in CHAR_NORMALIZATIONS.items()
+    if char.isascii()
+})
+CHAR_NORMALIZATION_PATTERN = '[{}]'.format(re.escape(''.join(CHAR_NORMALIZATIONS)))
+
+
+def _normalize_char(match: re.Match):
+    return CHAR_NORMALIZATIONS[match.group()]
 
-    # normalize apostrophes
-    text = re.sub(r"\u201c|\u201d", "\"", text)
-    text = re.sub(r'“|”', '"', text)
-    text = re.sub(r'‘|’', '\'', text)
-    text = re.sub(r'\'\'', '"', text)
-    text = re.sub(r'``', '"', text)
-    text = re.sub(r'–', '-', text)
 
+def normalize_chars(text: str, encoding: str = 'utf-8', errors: str = 'ignore'):
+    # NOTE: (cid:N) are removed first, so removing chars cannot form new ones (as in a single pass).
+    if '(cid:' in text:
+        text = PATTERNS.compile(r'\(cid:\d+\)').sub('', text)
+
+    is_ascii = text.isascii()
+    if is_ascii:
+        text = text.translate(ASCII_CHAR_NORMALIZATION_TABLE).replace('\r', '')
+    else:
+        text = PATTERNS.compile(CHAR_NORMALIZATION_PATTERN).sub(_normalize_char, text)
+
+    # NOTE: After the chars, as they may form new '' (e.g. from ‘’).
+    if '\'\'' in text or '``' in text:
+        text = PATTERNS.compile(r"''|``").sub('"', text)
+
+    # Only lone surrogates do not survive a UTF-8 round trip, and ASCII text has none.
+    if is_ascii and codecs.lookup(encoding).name == 'utf-8':
+        return text
     return text.encode(encoding, errors).decode(encoding, errors)
 
 
@@ -173,12 +366,12 @@ def normalize_whitespaces(text: str):
     text = text.strip()
 
     # Replace multiple consecutive spaces and tabs with just one space
-    text = re.sub(r'[ |\t]{2,}', ' ', text)
+    text = PATTERNS.compile(r'[ |\t]{2,}').sub(' ', text)
     # Replace multiple consecutive new lines with just 2
     # Single and double new lines are important formatting information on which
     # certain pre-processing rules rely. (e.g. identifying non breaking periods
     # on numbered lists)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = PATTERNS.compile(r'\n{3,}').sub('\n\n', text)
 
     return text
 
@@ -1,5 +1,4 @@
-import re
-
+from ..utilities import PATTERNS
 from .text import TextSpan
 
 
@@ -9,9 +8,9 @@ URL_PATTERN = r"(?i)\b((?:https?://|www\d{0,3}[.]|[a-z0-9.\-]+[.][a-z]{2,4}/)(?:
 class Url(TextSpan):
     @classmethod
     def from_text(cls, text: str):
-        matches = re.finditer(URL_PATTERN, text)
+        matches = PATTERNS.compile(URL_PATTERN).finditer(text)
         return cls.from_matches(matches)
 
 
 def replace_urls(text: str, replacement: str = 'url'):
-    return re.sub(URL_PATTERN, replacement, text)
+    return PATTERNS.compile(URL_PATTERN).sub(replacement, text)
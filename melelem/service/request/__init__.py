@@ -1,13 +1,19 @@
-from .coref import CorefModelService
-from .documents import DocumentsService
-from .llm_select import LLMSelectorService
-from .paraphrase import ParaphraseService
-from .profanity_model import ProfanityModelService
-from .profanity import ProfanityService
-from .qna_generation import QnAGenerationService
-from .query_parser import QueryParserService
-from .question_answering import QuestionAnsweringService
-from .stanza import StanzaService
-from .summarization import SummarizationService
-from .transformer_models import TransformerModelService
-from .translation import TranslationService
+from ._base import ServiceStream
+from ._async_base import AsyncServiceRequestSession, AsyncServiceStream
+from ._pool import CONNECTION_POOLS, ConnectionPoolRegistry, PoolConfig
+from ._bulk import BulkMetrics, BulkResult
+from ._compression import Transfer, TransferMetrics
+from ._serialization import JsonSerializer, OrjsonSerializer, get_serializer
+from .coref import CorefModelService, AsyncCorefModelService
+from .documents import DocumentsService, AsyncDocumentsService
+from .llm_select import LLMSelectorService, AsyncLLMSelectorService
+from .paraphrase import ParaphraseService, AsyncParaphraseService
+from .profanity_model import ProfanityModelService, AsyncProfanityModelService
+from .profanity import ProfanityService, AsyncProfanityService
+from .qna_generation import QnAGenerationService, AsyncQnAGenerationService
+from .query_parser import QueryParserService, AsyncQueryParserService
+from .question_answering import QuestionAnsweringService, AsyncQuestionAnsweringService
+from .stanza import StanzaService, AsyncStanzaService
+from .summarization import SummarizationService, AsyncSummarizationService
+from .transformer_models import TransformerModelService, AsyncTransformerModelService
+from .translation import TranslationService, AsyncTranslationService
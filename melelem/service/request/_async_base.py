@@ -0,0 +1,290 @@
+import typing as t
+from weakref import WeakKeyDictionary
+from functools import partial
+import asyncio
+
+import aiohttp
+
+from ...settings import DEBUG
+from ._base import (
+    Response,
+    _build_request,
+    _serialize,
+    _raise_response_error,
+    _unpack_debug_response,
+    _create_response,
+    _is_octet_stream,
+    ServiceRequestSession,
+    _write_chunks,
+    BYTES_CHUNK_SIZE,
+    _EventStreamDecoder,
+    ServiceStream
+)
+from ._serialization import JsonSerializer, DEFAULT_SERIALIZER
+from ._compression import Transfer, TransferMetrics
+
+
+# Status codes for which the Retry-After header is respected (same as urllib3).
+RETRY_AFTER_STATUS_CODES = {413, 429, 503}
+
+
+async def _build_request_async(*args, **kwargs):
+    """Like _build_request, but in the default executor, as resolving the service's URL may block
+    on kubernetes' API (on a cache miss), which would stall every coroutine of the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(None, partial(_build_request, *args, **kwargs))
+
+
+class AsyncServiceStream(ServiceStream):
+    """Asyncio variant of ServiceStream. Its events must be iterated with "async for"."""
+
+    response: aiohttp.ClientResponse
+
+    def __iter__(self):
+        raise TypeError('AsyncServiceStream must be iterated with "async for"')
+
+    async def __aiter__(self) -> t.AsyncIterator[t.Dict[str, t.Any]]:
+        encoding = self.response.charset or 'utf-8'
+        decoder = _EventStreamDecoder()
+        try:
+            async for line in self.response.content:
+                data = decoder.decode(line.decode(encoding))
+                if data == decoder.DONE:
+                    return
+                if data is not None:
+                    yield self._parse(data)
+
+            data = decoder.flush()
+            if data is not None and data != decoder.DONE:
+                yield self._parse(data)
+        finally:
+            self.close()
+
+    def close(self):
+        self.response.release()
+
+
+class AsyncServiceRequestSession:
+    """
+    Asyncio counterpart of ServiceRequestSession. Its request() has the same contract but must be
+    awaited. All instances running on the same event loop share one HTTP session and, therefore,
+    one connection pool.
+    """
+
+    name: str
+
+    # The max number of simultaneous connections in the shared connection pool.
+    connection_limit: int = 100
+
+    _client_sessions: 'WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]' = WeakKeyDictionary()
+
+    def __init__(
+        self,
+        retry_total: int = 3,
+        retry_backoff_factor: float = 0.1,
+        retry_status_forcelist: t.Set[int] = {429},
+        retry_backoff_max: float = 120,
+        serializer: JsonSerializer = None,
+        compression: str = None,
+        compression_threshold: int = 1024
+    ):
+        self.serializer = serializer or DEFAULT_SERIALIZER
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.transfer_metrics = TransferMetrics()
+        self.retry_total = retry_total
+        self.retry_backoff_factor = retry_backoff_factor
+        self.retry_status_forcelist = retry_status_forcelist
+        self.retry_backoff_max = retry_backoff_max
+
+    last_transfer = ServiceRequestSession.last_transfer
+    _record_transfer = ServiceRequestSession._record_transfer
+
+    @staticmethod
+    def _get_client_session():
+        loop = asyncio.get_running_loop()
+        client_session = AsyncServiceRequestSession._client_sessions.get(loop)
+        if client_session is None or client_session.closed:
+            client_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=AsyncServiceRequestSession.connection_limit)
+            )
+            AsyncServiceRequestSession._client_sessions[loop] = client_session
+        return client_session
+
+    @staticmethod
+    async def close_client_session():
+        """Close the HTTP session shared on the running event loop."""
+        client_session = AsyncServiceRequestSession._client_sessions.pop(
+            asyncio.get_running_loop(), None
+        )
+        if client_session is not None:
+            await client_session.close()
+
+    def _get_backoff_time(self, retry: int, response: aiohttp.ClientResponse = None):
+        """Get the seconds to sleep before a retry, mirroring urllib3's Retry."""
+        if response is not None and response.status in RETRY_AFTER_STATUS_CODES:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after is not None and retry_after.isdigit():
+                return float(retry_after)
+
+        if retry <= 1:
+            return 0
+        return min(self.retry_backoff_max, self.retry_backoff_factor * (2 ** (retry - 1)))
+
+    async def _send(
+        self,
+        url: str,
+        data: bytes,
+        timeout: float = None,
+        headers: t.Dict[str, str] = None
+    ):
+        """Send a request, retrying on connection errors and the forced statuses."""
+        client_session = self._get_client_session()
+        retry = 0
+        while True:
+            try:
+                response = await client_session.post(
+                    url,
+                    data=data,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                )
+            except aiohttp.ClientConnectionError:
+                retry += 1
+                if retry > self.retry_total:
+                    raise
+                await asyncio.sleep(self._get_backoff_time(retry))
+                continue
+
+            if response.status not in self.retry_status_forcelist or retry >= self.retry_total:
+                return response
+
+            retry += 1
+            await asyncio.sleep(self._get_backoff_time(retry, response))
+            response.release()
+
+    @t.overload
+    async def request(
+        self,
+        json: t.Dict[str, t.Any],
+        path: str = None,
+        timeout: float = None,
+        headers: t.Dict[str, str] = None
+    ) -> t.Dict[str, t.Any]: ...
+
+    @t.overload
+    async def request(
+        self,
+        json: t.Dict[str, t.Any],
+        path: str = None,
+        timeout: float = None,
+        headers: t.Dict[str, str] = None,
+        response_type: t.Type[Response] = None
+    ) -> Response: ...
+
+    @t.overload
+    async def request(
+        self,
+        json: t.Dict[str, t.Any],
+        path: str = None,
+        timeout: float = None,
+        headers: t.Dict[str, str] = None,
+        response_type: t.Type[bytes] = None,
+        sink: t.BinaryIO = None
+    ) -> int: ...
+
+    async def request(
+        self,
+        json: t.Dict[str, t.Any],
+        path: str = None,
+        timeout: float = None,
+        headers: t.Dict[str, str] = None,
+        response_type: t.Type[Response] = None,
+        sink: t.BinaryIO = None
+    ):
+        # Build request.
+        url, json, headers = await _build_request_async(self.name, json, path, headers, response_type)
+        data, headers, raw_request_bytes = _serialize(
+            self.serializer, json, headers, self.compression, self.compression_threshold
+        )
+
+        # Send request and get response.
+        async with await self._send(url, data, timeout, headers) as response:
+            result, raw_response_bytes = await self._read_response(response, response_type, sink)
+
+        # NOTE: aiohttp only exposes the response's decoded bytes, so its wire bytes are
+        # taken from the Content-Length header if the response was encoded.
+        wire_response_bytes = raw_response_bytes
+        if response.headers.get('Content-Encoding', 'identity') != 'identity':
+            content_length = response.headers.get('Content-Length')
+            wire_response_bytes = int(content_length) if content_length is not None else None
+        self._record_transfer(Transfer(
+            raw_request_bytes=raw_request_bytes,
+            wire_request_bytes=len(data),
+            raw_response_bytes=raw_response_bytes,
+            wire_response_bytes=wire_response_bytes
+        ))
+        return result
+
+    async def _read_response(
+        self,
+        response: aiohttp.ClientResponse,
+        response_type: t.Type[Response] = None,
+        sink: t.BinaryIO = None
+    ):
+        """Get the result of a response and its number of bytes (after content decoding)."""
+        # Validate response is ok.
+        if not response.ok:
+            _raise_response_error(response.status, self.serializer.loads(await response.read()))
+
+        # Handle bytes responses, which the DEBUG gateway may pass through as they are.
+        if response_type == bytes:
+            if DEBUG and not _is_octet_stream(response.headers.get('Content-Type')):
+                content = await response.read()
+                result = _unpack_debug_response(self.serializer.loads(content), response_type)
+                return (result if sink is None else _write_chunks([result], sink)), len(content)
+            if sink is None:
+                content = await response.read()
+                return content, len(content)
+            size = 0
+            async for chunk in response.content.iter_chunked(BYTES_CHUNK_SIZE):
+                size += _write_chunks([chunk], sink)
+            return size, size
+
+        # Unpack response.
+        content = await response.read()
+        if DEBUG:
+            return _unpack_debug_response(self.serializer.loads(content), response_type), len(content)
+
+        # Handle response type.
+        if response_type == str:
+            return await response.text(), len(content)
+
+        return _create_response(self.serializer.loads(content), response_type), len(content)
+
+    async def request_stream(
+        self,
+        json: t.Dict[str, t.Any],
+        path: str = None,
+        timeout: float = None,
+        headers: t.Dict[str, str] = None
+    ):
+        """Send a request whose response is streamed. Has the same contract as
+        ServiceRequestSession.request_stream(), but the returned AsyncServiceStream must be
+        iterated with "async for". The timeout applies to the whole stream."""
+        url, json, headers = await _build_request_async(self.name, json, path, headers, stream=True)
+        data, headers, _ = _serialize(
+            self.serializer,
+            json,
+            {'Accept': 'text/event-stream', **(headers or {})},
+            self.compression,
+            self.compression_threshold
+        )
+
+        response = await self._send(url, data, timeout, headers)
+        if not response.ok:
+            try:
+                _raise_response_error(response.status, self.serializer.loads(await response.read()))
+            finally:
+                response.release()
+
+        return AsyncServiceStream(response, self.serializer.loads)
@@ -1,16 +1,202 @@
 import typing as t
 from urllib3.util.retry import Retry
-from json import dumps as json_dumps
+from json import dumps as json_dumps, loads as json_loads
 
 import requests
+import base64
 import os
 
 from ...settings import get_service_url, DEBUG
 from ..exceptions import BadRequestException, InternalServerErrorException
+from ._pool import SharedPoolHTTPAdapter
+from ._serialization import JsonSerializer, DEFAULT_SERIALIZER
+from ._compression import compress, Transfer, TransferMetrics, LAST_TRANSFER
 
 
 Response = t.TypeVar('Response')
 
+# The size of the chunks in which bytes responses are written to a sink.
+BYTES_CHUNK_SIZE = 1 << 16
+
+
+def _build_request(
+    name: str,
+    json: t.Dict[str, t.Any],
+    path: str = None,
+    headers: t.Dict[str, str] = None,
+    response_type: t.Type[Response] = None,
+    stream: bool = False
+):
+    """Get the url, json and headers of a request to a service."""
+    if DEBUG:
+        try:
+            authorization = os.environ['Melelem_API_KEY']
+            if headers is not None:
+                headers['Authorization'] = authorization
+            else:
+                headers = {"Authorization": authorization}
+        except KeyError as ex:
+            raise Exception("Please specify a Melelem API key in the environment variable Melelem_API_KEY") from ex
+
+        url = 'https://dev-api.melelem.ai/service/service/'
+        json = {
+            'name': name,
+            'request': json
+        }
+        if path:
+            json['path'] = path
+        if response_type in [bytes, str]:
+            json['response_type'] = response_type.__name__
+        if response_type == bytes:
+            # NOTE: The gateway either passes the bytes through (application/octet-stream) or
+            # wraps them in its JSON response as base64.
+            json['response_encoding'] = 'base64'
+        if stream:
+            json['stream'] = True
+    else:
+        url = get_service_url(name)
+        if path:
+            url += path
+
+    return url, json, headers
+
+
+def _serialize(
+    serializer: JsonSerializer,
+    json: t.Any,
+    headers: t.Dict[str, str] = None,
+    compression: str = None,
+    compression_threshold: int = 1024
+):
+    """Serialize (and compress) the payload of a request to bytes. Returns the bytes, the request's
+    headers and the number of bytes before compression."""
+    data = serializer.dumps(json)
+    headers = {'Content-Type': serializer.content_type, **(headers or {})}
+    return (*compress(data, headers, compression, compression_threshold), len(data))
+
+
+def _raise_response_error(status_code: int, response_json: t.Dict[str, t.Any]):
+    """Cast a response which is not ok to an exception. Other errors than bad requests and
+    validation errors are InternalServerErrorExceptions, with the response's status code."""
+    if status_code == 400:
+        raise BadRequestException(**response_json)
+    elif status_code == 422:
+        raise Exception(str(response_json))
+    else:
+        ex = InternalServerErrorException(**response_json)
+        ex.status_code = status_code
+        raise ex
+
+
+def _unpack_debug_response(response_json: t.Dict[str, t.Any], response_type: t.Type[Response] = None):
+    """Unpack the response of a service from the DEBUG gateway's response."""
+    response_json = response_json['response']
+    if response_type == bytes:
+        return base64.b64decode(response_json)
+    elif response_type == str:
+        return json_dumps(response_json)
+
+    return _create_response(response_json, response_type)
+
+
+def _is_octet_stream(content_type: t.Optional[str]):
+    return (content_type or '').split(';')[0].strip().lower() == 'application/octet-stream'
+
+
+def _get_wire_response_bytes(response: requests.Response, raw_response_bytes: int) -> t.Optional[int]:
+    """Get the bytes of a response's body on the wire, or None if unknown."""
+    if response.headers.get('Content-Encoding', 'identity') == 'identity':
+        return raw_response_bytes
+    # NOTE: urllib3 does not count the bytes of chunked responses in tell().
+    if 'chunked' in response.headers.get('Transfer-Encoding', '').lower():
+        return None
+    return response.raw.tell()
+
+
+def _write_chunks(chunks: t.Iterable[bytes], sink: t.BinaryIO):
+    """Write chunks of bytes to a sink and get the number of bytes written."""
+    size = 0
+    for chunk in chunks:
+        sink.write(chunk)
+        size += len(chunk)
+    return size
+
+
+def _create_response(response_json: t.Dict[str, t.Any], response_type: t.Type[Response] = None):
+    """Optional: create response object."""
+    return response_type(**response_json) if response_type else response_json
+
+
+class _EventStreamDecoder:
+    """
+    Decodes the lines of a streamed response into the data of its events. Supports server-sent
+    events ("data: ..." lines, dispatched on a blank line) and newline-delimited JSON.
+    """
+
+    DONE = '[DONE]'
+
+    def __init__(self):
+        self._data: t.List[str] = []
+
+    def decode(self, line: str) -> t.Optional[str]:
+        """Decode a line, returning the data of an event once it is complete."""
+        line = line.rstrip('\r\n')
+        if not line:
+            data, self._data = self._data, []
+            return '\n'.join(data) if data else None
+        if line.startswith('data:'):
+            data = line[5:]
+            self._data.append(data[1:] if data.startswith(' ') else data)
+        elif line[0] in '{[':
+            return line
+        # NOTE: Comments (":") and other fields (event, id, retry) are ignored.
+        return None
+
+    def flush(self):
+        """Get the data of the last event if the stream ended without a blank line."""
+        return self.decode('')
+
+
+class ServiceStream:
+    """
+    Iterator over the events of a streamed service response (e.g. incremental LLM deltas), parsed
+    as JSON. Once exhausted, `usage` holds the usage reported by the stream's last event which had
+    one, in the shape calculate_usage_overview consumes.
+    """
+
+    def __init__(self, response: requests.Response, loads: t.Callable[[str], t.Any] = json_loads):
+        self.response = response
+        self.loads = loads
+        self.usage: t.Optional[t.Dict[str, t.Any]] = None
+
+    def _parse(self, data: str):
+        event = self.loads(data)
+        if isinstance(event, dict) and event.get('usage'):
+            self.usage = event['usage']
+        return event
+
+    def __iter__(self) -> t.Iterator[t.Dict[str, t.Any]]:
+        if self.response.encoding is None:
+            self.response.encoding = 'utf-8'
+
+        decoder = _EventStreamDecoder()
+        try:
+            for line in self.response.iter_lines(decode_unicode=True):
+                data = decoder.decode(line)
+                if data == decoder.DONE:
+                    return
+                if data is not None:
+                    yield self._parse(data)
+
+            data = decoder.flush()
+            if data is not None and data != decoder.DONE:
+                yield self._parse(data)
+        finally:
+            self.close()
+
+    def close(self):
+        self.response.close()
+
 
 class ServiceRequestSession:
 
@@ -20,11 +206,25 @@ class ServiceRequestSession:
         self,
         retry_total: int = 3,
         retry_backoff_factor: float = 0.1,
-        retry_status_forcelist: t.Set[int] = {429}
+        retry_status_forcelist: t.Set[int] = {429},
+        serializer: JsonSerializer = None,
+        compression: str = None,
+        compression_threshold: int = 1024
     ):
+        """
+        Args:
+            serializer (JsonSerializer, optional): Serializes payloads and deserializes responses. Defaults to None (the fastest JSON backend available).
+            compression (str, optional): The Content-Encoding to compress request bodies with: "gzip" or "zstd" (requires zstandard). Defaults to None (no compression).
+            compression_threshold (int, optional): The min number of bytes of a request body to compress. Defaults to 1024.
+        """
+        self.serializer = serializer or DEFAULT_SERIALIZER
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.transfer_metrics = TransferMetrics()
         self._session = requests.Session()
 
-        http_adapter = requests.adapters.HTTPAdapter(max_retries=Retry(
+        # NOTE: Connections are pooled per service and shared between instances (see CONNECTION_POOLS).
+        http_adapter = SharedPoolHTTPAdapter(self.name, max_retries=Retry(
             total=retry_total,
             backoff_factor=retry_backoff_factor,
             status_forcelist=retry_status_forcelist
@@ -32,6 +232,15 @@ class ServiceRequestSession:
         for prefix in {'http://', 'https://'}:
             self._session.mount(prefix, http_adapter)
 
+    @property
+    def last_transfer(self) -> t.Optional[Transfer]:
+        """The byte counters of the last request made in the current thread or task."""
+        return LAST_TRANSFER.get()
+
+    def _record_transfer(self, transfer: Transfer):
+        LAST_TRANSFER.set(transfer)
+        self.transfer_metrics.add(transfer)
+
     @t.overload
     def request(
         self,
@@ -51,80 +260,141 @@ class ServiceRequestSession:
         response_type: t.Type[Response] = None
     ) -> Response: ...
 
+    @t.overload
     def request(
         self,
         json: t.Dict[str, t.Any],
         path: str = None,
         timeout: float = None,
         headers: t.Dict[str, str] = None,
-        response_type: t.Type[Response] = None
+        response_type: t.Type[bytes] = None,
+        sink: t.BinaryIO = None
+    ) -> int: ...
+
+    def request(
+        self,
+        json: t.Dict[str, t.Any],
+        path: str = None,
+        timeout: float = None,
+        headers: t.Dict[str, str] = None,
+        response_type: t.Type[Response] = None,
+        sink: t.BinaryIO = None
     ):
+        """Send a request to the service.
+
+        Args:
+            json (t.Dict[str, t.Any]): The request's payload.
+            path (str, optional): The path of the service's endpoint. Defaults to None.
+            timeout (float, optional): Seconds to wait for the response. Defaults to None.
+            headers (t.Dict[str, str], optional): The request's headers. Defaults to None.
+            response_type (t.Type[Response], optional): The type to cast the response to (e.g. bytes or str). Defaults to None (JSON).
+            sink (t.BinaryIO, optional): File-like object to stream a bytes response to, instead of holding it in memory. Defaults to None.
+
+        Returns:
+            The response, or the number of bytes written to the sink.
+        """
         try:
             # Build request.
-            if DEBUG:
-                try:
-                    authorization = os.environ['Melelem_API_KEY']
-                    if headers is not None:
-                        headers['Authorization'] = authorization
-                    else:
-                        headers = {"Authorization": authorization}
-                except KeyError as ex:
-                    raise Exception("Please specify a Melelem API key in the environment variable Melelem_API_KEY") from ex
-                    
-                url = 'https://dev-api.melelem.ai/service/service/'
-                json = {
-                    'name': self.name,
-                    'request': json
-                }
-                if path:
-                    json['path'] = path
-                if response_type in [bytes, str]:
-                    json['response_type'] = response_type.__name__
-            else:
-                url = get_service_url(self.name)
-                if path:
-                    url += path
+            url, json, headers = _build_request(self.name, json, path, headers, response_type)
+            data, headers, raw_request_bytes = _serialize(
+                self.serializer, json, headers, self.compression, self.compression_threshold
+            )
 
             # Send request and get response.
             response = self._session.request(
                 method='POST',
                 url=url,
                 timeout=timeout,
-                json=json,
-                headers=headers
+                data=data,
+                headers=headers,
+                stream=sink is not None
             )
 
-            # Validate response is ok.
-            if not response.ok:
-                if response.status_code == 400:
-                    raise BadRequestException(**response.json())
-                elif response.status_code == 422:
-                    raise Exception(str(response.json()))
-                else:
-                    raise InternalServerErrorException(**response.json())
-
-            # Unpack response.
-            response_json: t.Dict[str, t.Any]
-            if DEBUG:
-                # Handle response type.
-                response_json = response.json()['response']
-                if response_type == bytes:
-                    # NOTE: Treat with caution! Should only run locally for security!
-                    return eval(response_json)
-                elif response_type == str:
-                    return json_dumps(response_json)
-            else:
-                # Handle response type.
-                if response_type == bytes:
-                    return response.content
-                elif response_type == str:
-                    return response.text
-                else:
-                    response_json = response.json()
-
-            # Optional: create response object.
-            return response_type(**response_json) if response_type else response_json
+            result, raw_response_bytes = self._read_response(response, response_type, sink)
+            self._record_transfer(Transfer(
+                raw_request_bytes=raw_request_bytes,
+                wire_request_bytes=len(data),
+                raw_response_bytes=raw_response_bytes,
+                wire_response_bytes=_get_wire_response_bytes(response, raw_response_bytes)
+            ))
+            return result
 
         # Cast unknown errors.
         except Exception as ex:
             raise ex
+
+    def _read_response(
+        self,
+        response: requests.Response,
+        response_type: t.Type[Response] = None,
+        sink: t.BinaryIO = None
+    ):
+        """Get the result of a response and its number of bytes (after content decoding)."""
+        # Validate response is ok.
+        if not response.ok:
+            _raise_response_error(response.status_code, self.serializer.loads(response.content))
+
+        # Handle bytes responses, which the DEBUG gateway may pass through as they are.
+        if response_type == bytes:
+            with response:
+                if DEBUG and not _is_octet_stream(response.headers.get('Content-Type')):
+                    content = _unpack_debug_response(self.serializer.loads(response.content), response_type)
+                    return (content if sink is None else _write_chunks([content], sink)), len(response.content)
+                if sink is None:
+                    return response.content, len(response.content)
+                size = _write_chunks(response.iter_content(BYTES_CHUNK_SIZE), sink)
+                return size, size
+
+        # Unpack response.
+        content = response.content
+        if DEBUG:
+            return _unpack_debug_response(self.serializer.loads(content), response_type), len(content)
+
+        # Handle response type.
+        if response_type == str:
+            return response.text, len(content)
+
+        return _create_response(self.serializer.loads(content), response_type), len(content)
+
+    def request_stream(
+        self,
+        json: t.Dict[str, t.Any],
+        path: str = None,
+        timeout: float = None,
+        headers: t.Dict[str, str] = None
+    ):
+        """Send a request whose response is streamed (chunked or server-sent events).
+
+        Args:
+            json (t.Dict[str, t.Any]): The request's payload.
+            path (str, optional): The path of the service's endpoint. Defaults to None.
+            timeout (float, optional): Seconds to wait for the response to start. Defaults to None.
+            headers (t.Dict[str, str], optional): The request's headers. Defaults to None.
+
+        Returns:
+            ServiceStream: Iterator over the response's events.
+        """
+        url, json, headers = _build_request(self.name, json, path, headers, stream=True)
+        data, headers, _ = _serialize(
+            self.serializer,
+            json,
+            {'Accept': 'text/event-stream', **(headers or {})},
+            self.compression,
+            self.compression_threshold
+        )
+
+        response = self._session.request(
+            method='POST',
+            url=url,
+            timeout=timeout,
+            data=data,
+            headers=headers,
+            stream=True
+        )
+        if not response.ok:
+            try:
+                _raise_response_error(response.status_code, self.serializer.loads(response.content))
+            finally:
+                response.close()
+
+        return ServiceStream(response, self.serializer.loads)
@@ -0,0 +1,164 @@
+import typing as t
+import threading
+import asyncio
+
+
+Key = t.Hashable
+Send = t.Callable[[t.List[str], Key], t.Any]
+Split = t.Callable[[t.Any, t.List[int], int], t.Any]
+
+
+class _Batch:
+    """Unique texts collected from many calls, to be sent in one request."""
+
+    def __init__(self, event_class: t.Type[t.Union[threading.Event, asyncio.Event]]):
+        self.texts: t.List[str] = []
+        self.indices: t.Dict[str, int] = {}
+        self.full = event_class()
+        self.done = event_class()
+        self.response: t.Any = None
+        self.exception: Exception = None
+        # The task which sends an asyncio batch.
+        self.flush_task: asyncio.Future = None
+
+    def count_new(self, texts: t.List[str]):
+        return len({text for text in texts if text not in self.indices})
+
+    def add(self, texts: t.List[str]):
+        """Add texts to the batch and get their indices in the batch."""
+        indices = []
+        for text in texts:
+            index = self.indices.get(text)
+            if index is None:
+                index = self.indices[text] = len(self.texts)
+                self.texts.append(text)
+            indices.append(index)
+        return indices
+
+
+class MicroBatcher:
+    """
+    Merges the texts of calls made from many threads within a few milliseconds into one request.
+
+    The first call of a batch waits up to `max_delay` seconds (or until the batch holds
+    `max_batch_size` unique texts), sends the batch and hands each call its share of the response.
+    Calls are only batched with calls of the same key (e.g. the same task). Identical texts
+    within a batch are sent once.
+
+    Args:
+        send (Send): Sends a list of texts for a key and returns the response.
+        split (Split): Gets the share of a response for the given indices of the sent texts.
+        max_batch_size (int, optional): The max number of unique texts per request. Defaults to 64.
+        max_delay (float, optional): The max seconds a call waits for other calls to join its batch. Defaults to 0.005.
+    """
+
+    _event_class = threading.Event
+
+    def __init__(
+        self,
+        send: Send,
+        split: Split,
+        max_batch_size: int = 64,
+        max_delay: float = 0.005
+    ):
+        self.send = send
+        self.split = split
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._batches: t.Dict[Key, _Batch] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, texts: t.List[str], key: Key):
+        """Add texts to the open batch of a key. Returns the batch, the texts' indices and
+        whether the caller leads (sends) the batch."""
+        with self._lock:
+            batch = self._batches.get(key)
+            if batch is not None and len(batch.texts) + batch.count_new(texts) > self.max_batch_size:
+                # Flush the open batch and start a new one.
+                del self._batches[key]
+                batch.full.set()
+                batch = None
+
+            is_leader = batch is None
+            if is_leader:
+                batch = self._batches[key] = _Batch(self._event_class)
+            indices = batch.add(texts)
+
+            if len(batch.texts) >= self.max_batch_size:
+                del self._batches[key]
+                batch.full.set()
+
+        return batch, indices, is_leader
+
+    def _close(self, batch: _Batch, key: Key):
+        with self._lock:
+            if self._batches.get(key) is batch:
+                del self._batches[key]
+
+    def _get_response(self, batch: _Batch, indices: t.List[int]):
+        if batch.exception is not None:
+            raise batch.exception
+        return self.split(batch.response, indices, len(batch.texts))
+
+    def submit(self, texts: t.List[str], key: Key = None):
+        """Send texts in a batch and get their share of the response."""
+        if not texts or len(texts) >= self.max_batch_size:
+            return self.send(texts, key)
+
+        batch, indices, is_leader = self._join(texts, key)
+        if is_leader:
+            try:
+                batch.full.wait(self.max_delay)
+                self._close(batch, key)
+                batch.response = self.send(batch.texts, key)
+            except Exception as ex:  # pylint: disable=broad-except
+                batch.exception = ex
+            except BaseException:
+                # NOTE: The leader was interrupted (e.g. KeyboardInterrupt), which is not the
+                # followers' to raise, but they must not wait for a response which never comes.
+                batch.exception = RuntimeError('The batch was interrupted before it was sent.')
+                raise
+            finally:
+                self._close(batch, key)
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        return self._get_response(batch, indices)
+
+
+class AsyncMicroBatcher(MicroBatcher):
+    """Asyncio variant of MicroBatcher, batching calls made from many tasks. `send` must be a
+    coroutine function."""
+
+    _event_class = asyncio.Event
+
+    async def _flush(self, batch: _Batch, key: Key):
+        try:
+            try:
+                await asyncio.wait_for(batch.full.wait(), self.max_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._close(batch, key)
+            batch.response = await self.send(batch.texts, key)
+        except Exception as ex:  # pylint: disable=broad-except
+            batch.exception = ex
+        except BaseException:
+            batch.exception = RuntimeError('The batch was cancelled before it was sent.')
+            raise
+        finally:
+            self._close(batch, key)
+            batch.done.set()
+
+    async def submit(self, texts: t.List[str], key: Key = None):
+        if not texts or len(texts) >= self.max_batch_size:
+            return await self.send(texts, key)
+
+        batch, indices, is_leader = self._join(texts, key)
+        if is_leader:
+            # NOTE: The batch is sent by a task of its own, so cancelling the call which started
+            # it does not cancel the calls which joined it.
+            batch.flush_task = asyncio.ensure_future(self._flush(batch, key))
+        await batch.done.wait()
+
+        return self._get_response(batch, indices)
@@ -0,0 +1,256 @@
+import typing as t
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from timeit import default_timer
+import threading
+import asyncio
+import time
+
+import requests
+import aiohttp
+
+from ..exceptions import InternalServerErrorException
+
+
+Item = t.TypeVar('Item')
+GetSize = t.Callable[[t.Any], int]
+
+
+class BulkResult(t.NamedTuple):
+    """The result of one item of a bulk operation. Either response or exception is set."""
+    index: int
+    item: t.Any
+    response: t.Any = None
+    exception: BaseException = None
+    attempts: int = 1
+
+    @property
+    def ok(self):
+        return self.exception is None
+
+
+class BulkMetrics:
+    """
+    Progress and throughput counters of a bulk operation.
+
+    - submitted: Items taken from the input so far.
+    - succeeded / failed: Items whose final attempt succeeded / failed.
+    - retries: Attempts made beyond the first.
+    - bytes: Bytes of the items which succeeded.
+    """
+
+    def __init__(self):
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.bytes = 0
+        self.start: float = None
+        self.end: float = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        if self.start is None:
+            self.start = default_timer()
+
+    def _add(self, **counts: int):
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    @property
+    def elapsed(self):
+        if self.start is None:
+            return 0.0
+        return (self.end if self.end is not None else default_timer()) - self.start
+
+    @property
+    def docs_per_second(self):
+        elapsed = self.elapsed
+        return self.succeeded / elapsed if elapsed else 0.0
+
+    @property
+    def bytes_per_second(self):
+        elapsed = self.elapsed
+        return self.bytes / elapsed if elapsed else 0.0
+
+    def to_dict(self):
+        return {
+            'submitted': self.submitted,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'retries': self.retries,
+            'bytes': self.bytes,
+            'elapsed': self.elapsed,
+            'docs_per_second': self.docs_per_second,
+            'bytes_per_second': self.bytes_per_second
+        }
+
+
+# The errors which may not recur: transport errors, and server errors of 5xx or 429 statuses.
+# Others (e.g. bad requests, validation errors, not found and programming errors) fail the same way
+# every time.
+RETRYABLE_EXCEPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    aiohttp.ClientConnectionError,
+    asyncio.TimeoutError,
+    ConnectionError,
+    TimeoutError
+)
+
+
+def _is_retryable_status_code(status_code: int):
+    return status_code >= 500 or status_code == 429
+
+
+def _is_retryable(ex: BaseException):
+    if isinstance(ex, InternalServerErrorException):
+        return _is_retryable_status_code(ex.status_code)
+    return isinstance(ex, RETRYABLE_EXCEPTIONS)
+
+
+def _get_backoff_time(attempt: int, backoff_factor: float):
+    return backoff_factor * (2 ** (attempt - 2)) if attempt > 1 else 0
+
+
+def _call(func: t.Callable[[Item], t.Any], item: Item, delay: float):
+    if delay:
+        time.sleep(delay)
+    return func(item)
+
+
+def bulk_map(
+    func: t.Callable[[Item], t.Any],
+    items: t.Iterable[Item],
+    concurrency: int = 8,
+    max_retries: int = 2,
+    retry_backoff_factor: float = 0.5,
+    metrics: BulkMetrics = None,
+    get_size: GetSize = None
+) -> t.Iterator[BulkResult]:
+    """
+    Call a function on many items with bounded concurrency, yielding each item's result as soon
+    as it completes (not in input order). Items are only taken from the input while fewer than
+    `concurrency` are in flight, so generators are consumed at the pace of the calls. Items which
+    failed with a 5xx or 429 server error or a transport error (see _is_retryable) are retried with
+    exponential backoff.
+
+    Args:
+        func (t.Callable[[Item], t.Any]): The function to call on each item.
+        items (t.Iterable[Item]): The items.
+        concurrency (int, optional): The max number of calls in flight. Defaults to 8.
+        max_retries (int, optional): The max number of retries per item. Defaults to 2.
+        retry_backoff_factor (float, optional): Seconds to wait before the first retry, doubled for every next one. Defaults to 0.5.
+        metrics (BulkMetrics, optional): The counters to update. Defaults to None.
+        get_size (GetSize, optional): Gets the bytes of an item, for the metrics. Defaults to None.
+
+    Yields:
+        BulkResult: The result of each item.
+    """
+    metrics = metrics if metrics is not None else BulkMetrics()
+    metrics._start()
+    items = enumerate(items)
+    pending: t.Dict[Future, t.Tuple[int, Item, int]] = {}
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def submit(index: int, item: Item, attempt: int):
+        delay = _get_backoff_time(attempt, retry_backoff_factor)
+        pending[executor.submit(_call, func, item, delay)] = (index, item, attempt)
+
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    index, item = next(items)
+                except StopIteration:
+                    exhausted = True
+                else:
+                    metrics._add(submitted=1)
+                    submit(index, item, 1)
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item, attempt = pending.pop(future)
+                ex = future.exception()
+                if ex is not None and attempt <= max_retries and _is_retryable(ex):
+                    metrics._add(retries=1)
+                    submit(index, item, attempt + 1)
+                elif ex is not None:
+                    metrics._add(failed=1)
+                    yield BulkResult(index, item, exception=ex, attempts=attempt)
+                else:
+                    metrics._add(succeeded=1, bytes=get_size(item) if get_size else 0)
+                    yield BulkResult(index, item, response=future.result(), attempts=attempt)
+    finally:
+        metrics.end = default_timer()
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+async def async_bulk_map(
+    func: t.Callable[[Item], t.Awaitable[t.Any]],
+    items: t.Union[t.Iterable[Item], t.AsyncIterable[Item]],
+    concurrency: int = 8,
+    max_retries: int = 2,
+    retry_backoff_factor: float = 0.5,
+    metrics: BulkMetrics = None,
+    get_size: GetSize = None
+) -> t.AsyncIterator[BulkResult]:
+    """Asyncio variant of bulk_map. `func` must be a coroutine function and the items may be an
+    async iterable."""
+    metrics = metrics if metrics is not None else BulkMetrics()
+    metrics._start()
+    iterator = items.__aiter__() if hasattr(items, '__aiter__') else iter(items)
+    pending: t.Dict[asyncio.Task, t.Tuple[int, Item, int]] = {}
+    index = 0
+
+    async def call(item: Item, delay: float):
+        if delay:
+            await asyncio.sleep(delay)
+        return await func(item)
+
+    def submit(index: int, item: Item, attempt: int):
+        delay = _get_backoff_time(attempt, retry_backoff_factor)
+        pending[asyncio.ensure_future(call(item, delay))] = (index, item, attempt)
+
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    if isinstance(iterator, t.AsyncIterator):
+                        item = await iterator.__anext__()
+                    else:
+                        item = next(iterator)
+                except (StopIteration, StopAsyncIteration):
+                    exhausted = True
+                else:
+                    metrics._add(submitted=1)
+                    submit(index, item, 1)
+                    index += 1
+
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task_index, item, attempt = pending.pop(task)
+                ex = task.exception()
+                if ex is not None and attempt <= max_retries and _is_retryable(ex):
+                    metrics._add(retries=1)
+                    submit(task_index, item, attempt + 1)
+                elif ex is not None:
+                    metrics._add(failed=1)
+                    yield BulkResult(task_index, item, exception=ex, attempts=attempt)
+                else:
+                    metrics._add(succeeded=1, bytes=get_size(item) if get_size else 0)
+                    yield BulkResult(task_index, item, response=task.result(), attempts=attempt)
+    finally:
+        metrics.end = default_timer()
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,93 @@
+import typing as t
+from contextvars import ContextVar
+import threading
+import gzip
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+def _compress_zstd(data: bytes):
+    if zstandard is None:
+        raise ImportError('zstandard is not installed')
+    return zstandard.ZstdCompressor().compress(data)
+
+
+# The encodings with which request bodies can be compressed (Content-Encoding).
+COMPRESSORS: t.Dict[str, t.Callable[[bytes], bytes]] = {
+    'gzip': lambda data: gzip.compress(data, compresslevel=6),
+    'zstd': _compress_zstd
+}
+
+
+def compress(
+    data: bytes,
+    headers: t.Dict[str, str],
+    compression: str = None,
+    threshold: int = 1024
+):
+    """Compress the body of a request if it is at least `threshold` bytes long.
+
+    Args:
+        data (bytes): The request's body.
+        headers (t.Dict[str, str]): The request's headers, to set the Content-Encoding of.
+        compression (str, optional): The encoding (see COMPRESSORS). Defaults to None (no compression).
+        threshold (int, optional): The min number of bytes to compress. Defaults to 1024.
+
+    Returns:
+        t.Tuple[bytes, t.Dict[str, t.Any]]: The (compressed) body and headers.
+    """
+    if compression is None or len(data) < threshold:
+        return data, headers
+    return COMPRESSORS[compression](data), {**headers, 'Content-Encoding': compression}
+
+
+class Transfer(t.NamedTuple):
+    """
+    The bytes of a request and its response, before (raw) and after (wire) content encoding.
+    The response's wire bytes are None if unknown.
+    """
+    raw_request_bytes: int
+    wire_request_bytes: int
+    raw_response_bytes: int
+    wire_response_bytes: t.Optional[int]
+
+
+class TransferMetrics:
+    """Cumulative byte counters of a session's transfers, to measure compression's savings."""
+
+    def __init__(self):
+        self.requests = 0
+        self.raw_request_bytes = 0
+        self.wire_request_bytes = 0
+        self.raw_response_bytes = 0
+        self.wire_response_bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, transfer: Transfer):
+        with self._lock:
+            self.requests += 1
+            self.raw_request_bytes += transfer.raw_request_bytes
+            self.wire_request_bytes += transfer.wire_request_bytes
+            self.raw_response_bytes += transfer.raw_response_bytes
+            self.wire_response_bytes += (
+                transfer.raw_response_bytes
+                if transfer.wire_response_bytes is None
+                else transfer.wire_response_bytes
+            )
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'raw_request_bytes': self.raw_request_bytes,
+                'wire_request_bytes': self.wire_request_bytes,
+                'raw_response_bytes': self.raw_response_bytes,
+                'wire_response_bytes': self.wire_response_bytes
+            }
+
+
+# The transfer of the last request made in the current thread or task.
+LAST_TRANSFER: ContextVar[t.Optional[Transfer]] = ContextVar('LAST_TRANSFER', default=None)
@@ -0,0 +1,208 @@
+import typing as t
+from weakref import WeakSet
+import threading
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+
+class PoolConfig(t.NamedTuple):
+    """The arguments of a connection pool (see requests.adapters.HTTPAdapter)."""
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+
+
+class PoolMetrics:
+    """
+    Usage counters of a service's connection pools.
+
+    - active: Connections currently checked out of the pools.
+    - idle: Open connections currently waiting in the pools to be reused.
+    - waits: Times a connection was requested while none was free. With pool_block, the request
+      waited for a connection to be returned. Otherwise, a connection was opened beyond
+      pool_maxsize and discarded after use.
+    - requests: Times a connection was requested.
+    """
+
+    def __init__(self):
+        self.active = 0
+        self.waits = 0
+        self.requests = 0
+        self._pools: 't.MutableSet[HTTPConnectionPool]' = WeakSet()
+        self._lock = threading.Lock()
+
+    @property
+    def idle(self):
+        return sum(
+            sum(1 for conn in list(pool.pool.queue) if conn is not None)
+            for pool in list(self._pools)
+            if pool.pool is not None
+        )
+
+    def to_dict(self):
+        return {
+            'active': self.active,
+            'idle': self.idle,
+            'waits': self.waits,
+            'requests': self.requests
+        }
+
+
+class _MeteredPoolMixin:
+    metrics: PoolMetrics = None
+
+    def _get_conn(self, timeout: float = None):
+        waited = self.pool is not None and self.pool.empty()
+        conn = super()._get_conn(timeout)
+        with self.metrics._lock:
+            self.metrics.requests += 1
+            self.metrics.active += 1
+            if waited:
+                self.metrics.waits += 1
+        return conn
+
+    def _put_conn(self, conn):
+        with self.metrics._lock:
+            self.metrics.active -= 1
+        super()._put_conn(conn)
+
+
+class _MeteredHTTPConnectionPool(_MeteredPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _MeteredHTTPSConnectionPool(_MeteredPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _MeteredPoolManager(PoolManager):
+    def __init__(self, metrics: PoolMetrics, config: PoolConfig):
+        super().__init__(
+            num_pools=config.pool_connections,
+            maxsize=config.pool_maxsize,
+            block=config.pool_block
+        )
+        self.metrics = metrics
+        self.pool_classes_by_scheme = {
+            'http': _MeteredHTTPConnectionPool,
+            'https': _MeteredHTTPSConnectionPool
+        }
+
+    def _new_pool(self, scheme: str, host: str, port: int, request_context: dict = None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.metrics = self.metrics
+        self.metrics._pools.add(pool)
+        return pool
+
+
+class ConnectionPoolRegistry:
+    """
+    Process-wide registry of connection pools, one per service name. Every session of a service
+    sends its requests through the service's pools, so keep-alive connections are shared between
+    instances.
+    """
+
+    def __init__(self, default_config: PoolConfig = PoolConfig()):
+        self.default_config = default_config
+        self._configs: t.Dict[str, PoolConfig] = {}
+        self._pool_managers: t.Dict[str, _MeteredPoolManager] = {}
+        self._metrics: t.Dict[str, PoolMetrics] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        name: str = None,
+        pool_connections: int = None,
+        pool_maxsize: int = None,
+        pool_block: bool = None
+    ):
+        """
+        Configure the pools of a service. Its current pools are closed and replaced.
+
+        :param name: The name of the service. If None, configures the default of all services.
+        :param pool_connections: The number of hosts to keep pools for.
+        :param pool_maxsize: The max number of connections to keep open per host.
+        :param pool_block: Whether to wait for a free connection when pool_maxsize is reached.
+        """
+        with self._lock:
+            config = self.default_config if name is None else self.get_config(name)
+            config = config._replace(**{
+                key: value
+                for key, value in dict(
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize,
+                    pool_block=pool_block
+                ).items()
+                if value is not None
+            })
+            if name is None:
+                self.default_config = config
+                names = [name for name in self._pool_managers if name not in self._configs]
+            else:
+                self._configs[name] = config
+                names = [name]
+
+            for name in names:
+                pool_manager = self._pool_managers.pop(name, None)
+                if pool_manager is not None:
+                    pool_manager.clear()
+
+    def get_config(self, name: str):
+        return self._configs.get(name, self.default_config)
+
+    def get_pool_manager(self, name: str):
+        pool_manager = self._pool_managers.get(name)
+        if pool_manager is None:
+            with self._lock:
+                pool_manager = self._pool_managers.get(name)
+                if pool_manager is None:
+                    metrics = self._metrics.setdefault(name, PoolMetrics())
+                    pool_manager = _MeteredPoolManager(metrics, self.get_config(name))
+                    self._pool_managers[name] = pool_manager
+        return pool_manager
+
+    def get_metrics(self, name: str = None):
+        """
+        Get the usage counters of the pools.
+
+        :param name: The name of the service. If None, gets the counters of all services.
+        :return: The counters of a service or a dict of each service's counters.
+        """
+        if name is not None:
+            metrics = self._metrics.get(name)
+            return metrics.to_dict() if metrics else PoolMetrics().to_dict()
+        return {name: metrics.to_dict() for name, metrics in list(self._metrics.items())}
+
+    def clear(self):
+        """Close all pools."""
+        with self._lock:
+            for pool_manager in self._pool_managers.values():
+                pool_manager.clear()
+            self._pool_managers.clear()
+
+
+CONNECTION_POOLS = ConnectionPoolRegistry()
+
+
+class SharedPoolHTTPAdapter(HTTPAdapter):
+    """HTTP adapter which sends requests through a service's pools in a ConnectionPoolRegistry."""
+
+    def __init__(self, name: str, registry: ConnectionPoolRegistry = CONNECTION_POOLS, **kwargs):
+        self.pool_name = name
+        self.pool_registry = registry
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        # NOTE: The pools are owned by the registry.
+        pass
+
+    @property
+    def poolmanager(self):
+        return self.pool_registry.get_pool_manager(self.pool_name)
+
+    def close(self):
+        # NOTE: Don't close the shared pools.
+        for proxy in self.proxy_manager.values():
+            proxy.clear()
@@ -0,0 +1,63 @@
+import typing as t
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JsonSerializer:
+    """Serializes request payloads to JSON bytes and deserializes response bytes, with the
+    standard library's json module."""
+
+    name = 'json'
+    content_type = 'application/json'
+
+    def dumps(self, obj: t.Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data: t.Union[bytes, bytearray, memoryview, str]) -> t.Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """JsonSerializer backed by orjson, which encodes straight to bytes. Like the standard
+    library's json module, it accepts dicts with non-str keys."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('orjson is not installed')
+
+    def dumps(self, obj: t.Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+    def loads(self, data: t.Union[bytes, bytearray, memoryview, str]) -> t.Any:
+        return orjson.loads(data)
+
+
+SERIALIZERS: t.Dict[str, t.Type[JsonSerializer]] = {
+    JsonSerializer.name: JsonSerializer,
+    OrjsonSerializer.name: OrjsonSerializer
+}
+
+
+def get_serializer(name: str = None) -> JsonSerializer:
+    """Get a serializer by name or, by default, the fastest one available.
+
+    Args:
+        name (str, optional): The serializer's name (see SERIALIZERS). Defaults to None.
+
+    Returns:
+        JsonSerializer: The serializer.
+    """
+    if name is None:
+        name = OrjsonSerializer.name if orjson is not None else JsonSerializer.name
+    return SERIALIZERS[name]()
+
+
+DEFAULT_SERIALIZER = get_serializer()
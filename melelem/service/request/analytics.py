@@ -1,4 +1,5 @@
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
 from typing import Union
 
 class AnalyticsService(ServiceRequestSession):
@@ -39,4 +40,7 @@ class AnalyticsService(ServiceRequestSession):
             json["date_until"] = date_until
 
         return self.request(json=json, path="question/keywords")
-        
\ No newline at end of file
+
+
+class AsyncAnalyticsService(AsyncServiceRequestSession, AnalyticsService):
+    """Asyncio variant of AnalyticsService. Its requests must be awaited."""
@@ -1,4 +1,5 @@
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
 from typing import List
 
 class CorefModelService(ServiceRequestSession):
@@ -12,4 +13,7 @@ class CorefModelService(ServiceRequestSession):
             json["pronouns"] = pronouns
 
         return self.request(json=json, path="resolve")
-        
\ No newline at end of file
+
+
+class AsyncCorefModelService(AsyncServiceRequestSession, CorefModelService):
+    """Asyncio variant of CorefModelService. Its requests must be awaited."""
@@ -1,5 +1,11 @@
 from ._base import ServiceRequestSession
-from typing import List, Union, Dict
+from ._async_base import AsyncServiceRequestSession
+from ._bulk import BulkMetrics, bulk_map, async_bulk_map
+from typing import List, Union, Dict, Iterable, AsyncIterable
+
+
+def _get_document_size(document: dict):
+    return len(document["text"].encode("utf-8"))
 
 
 class DocumentsService(ServiceRequestSession):
@@ -45,6 +51,39 @@ class DocumentsService(ServiceRequestSession):
 
         return self.request(json=json, path="document/ingest")
 
+    def ingest_documents_bulk(
+        self,
+        documents: Iterable[dict],
+        concurrency: int = 8,
+        max_retries: int = 2,
+        retry_backoff_factor: float = 0.5,
+        metrics: BulkMetrics = None,
+        **kwargs
+    ):
+        """Ingests many documents concurrently, yielding each document's result as soon as it is ingested.
+
+        Args:
+            documents (Iterable[dict]): The arguments of ingest_document() per document. May be a generator, which is consumed at the pace of the ingestion.
+            concurrency (int, optional): The max number of documents being ingested at once. Defaults to 8.
+            max_retries (int, optional): The max number of retries per failed document. Only 5xx and 429 server errors and transport errors are retried. Defaults to 2.
+            retry_backoff_factor (float, optional): Seconds to wait before the first retry of a document, doubled for every next one. Defaults to 0.5.
+            metrics (BulkMetrics, optional): Progress and throughput counters (docs/s, bytes/s, errors) to update while ingesting. Defaults to None.
+            **kwargs: Arguments of ingest_document() shared by all documents (e.g. client_id).
+
+        Returns:
+            _type_: Iterator[BulkResult]
+            One result per document (in order of completion) with its index, the document and either the response or the exception.
+        """
+        return bulk_map(
+            lambda document: self.ingest_document(**{**kwargs, **document}),
+            documents,
+            concurrency=concurrency,
+            max_retries=max_retries,
+            retry_backoff_factor=retry_backoff_factor,
+            metrics=metrics,
+            get_size=_get_document_size
+        )
+
     def delete_documents(
         self,
         client_id: str,
@@ -553,3 +592,28 @@ class DocumentsService(ServiceRequestSession):
             json["session_ids"] = session_ids
 
         return self.request(json=json, path="chatbot/messages/retrieve")
+
+
+class AsyncDocumentsService(AsyncServiceRequestSession, DocumentsService):
+    """Asyncio variant of DocumentsService. Its requests must be awaited."""
+
+    def ingest_documents_bulk(
+        self,
+        documents: Union[Iterable[dict], AsyncIterable[dict]],
+        concurrency: int = 8,
+        max_retries: int = 2,
+        retry_backoff_factor: float = 0.5,
+        metrics: BulkMetrics = None,
+        **kwargs
+    ):
+        """Asyncio variant of DocumentsService.ingest_documents_bulk(). Its results must be
+        iterated with "async for" and the documents may be an async iterable."""
+        return async_bulk_map(
+            lambda document: self.ingest_document(**{**kwargs, **document}),
+            documents,
+            concurrency=concurrency,
+            max_retries=max_retries,
+            retry_backoff_factor=retry_backoff_factor,
+            metrics=metrics,
+            get_size=_get_document_size
+        )
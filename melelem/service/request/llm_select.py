@@ -1,10 +1,38 @@
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
+from ...utilities import EmbeddingCache
 import typing as t
 
 
+def _get_embeddings(response: t.Dict[str, t.Any]) -> t.List[t.List[float]]:
+    """Get the embeddings of an embeddings response, in the order of the input."""
+    data = sorted(response['data'], key=lambda item: item.get('index', 0))
+    return [item['embedding'] for item in data]
+
+
+def _merge_embeddings_response(response: t.Optional[t.Dict[str, t.Any]], embeddings: t.List[t.List[float]]):
+    """Replace the embeddings of an embeddings response (None if all embeddings were cached).
+    Other fields, like the usage, only concern the embeddings which were not cached."""
+    return {
+        **(response or {}),
+        'data': [
+            {'object': 'embedding', 'index': index, 'embedding': embedding}
+            for index, embedding in enumerate(embeddings)
+        ]
+    }
+
+
 class LLMSelectorService(ServiceRequestSession):
     name = 'melelem-service-llm-selector'
 
+    def __init__(self, *args, embedding_cache: EmbeddingCache = None, **kwargs):
+        """
+        Args:
+            embedding_cache (EmbeddingCache, optional): Cache of embedded texts (by engine). Only the texts which are not cached are sent to the service. Defaults to None.
+        """
+        super().__init__(*args, **kwargs)
+        self.embedding_cache = embedding_cache
+
     def complete(
         self,
         prompt: t.Union[str, list],
@@ -17,7 +45,8 @@ class LLMSelectorService(ServiceRequestSession):
         frequency_penalty: float = None,
         presence_penalty: float = None,
         logprobs: int = None,
-        user: str = None
+        user: str = None,
+        stream: bool = False
     ):
         """The generate endpoint calls the "Complete" engine of OpenAI.
 
@@ -32,9 +61,10 @@ class LLMSelectorService(ServiceRequestSession):
             frequency_penalty (float, optional): How much to penalize new tokens based on their frequency so far. Decreases the model's likelihood to repeat the same line verbatim. Defaults to None. Service default is 0.0.
             presence_penalty (float, optional): How much to penalize new tokens based on whether they appear in the text so far. Increases the model's likelihood to talk about new topics. Defaults to None. Service defailt is 0.0.
             validate_prompt_content (bool, optional): Whether to check if the content is sensitive or offensive. Defaults to None.
+            stream (bool, optional): Whether to stream the generation as it is generated. Defaults to False.
 
         Returns:
-            _type_: OpenAIObject augmented with additional metadata such as costings.
+            _type_: OpenAIObject augmented with additional metadata such as costings. If streamed, a ServiceStream of incremental deltas, whose `usage` is set once it is exhausted.
         """
 
         json = {'prompt': prompt}
@@ -60,6 +90,10 @@ class LLMSelectorService(ServiceRequestSession):
         if user is not None:
             json['user'] = user
 
+        if stream:
+            json['stream'] = True
+            return self.request_stream(json=json, path="complete")
+
         return self.request(json=json, path="complete")
     
 
@@ -76,9 +110,12 @@ class LLMSelectorService(ServiceRequestSession):
         frequency_penalty: float = None,
         presence_penalty: float = None,
         logit_bias: dict = None,
-        user: str = None
+        user: str = None,
+        stream: bool = False
     ):
-        
+        """Calls the chat engine of OpenAI. If `stream`, returns a ServiceStream of incremental
+        deltas (instead of the full response), whose `usage` is set once it is exhausted."""
+
         json = {"messages": messages}
 
         if max_tokens is not None:
@@ -104,6 +141,10 @@ class LLMSelectorService(ServiceRequestSession):
         if user is not None:
             json["user"] = user
 
+        if stream:
+            json["stream"] = True
+            return self.request_stream(json=json, path="chat")
+
         return self.request(json=json, path="chat")
 
     def embeddings(
@@ -113,7 +154,22 @@ class LLMSelectorService(ServiceRequestSession):
         user: str = None,
         engine: str = None
     ):
-        
+        if self.embedding_cache is None or not input:
+            return self._embeddings(input, api_key, user, engine)
+
+        lookup = self.embedding_cache.lookup(engine, [input] if isinstance(input, str) else input)
+        response = self._embeddings(lookup.misses, api_key, user, engine) if lookup.misses else None
+        embeddings = _get_embeddings(response) if response is not None else []
+        return _merge_embeddings_response(response, lookup.merge(embeddings))
+
+    def _embeddings(
+        self,
+        input: t.Union[str, list],
+        api_key: str = None,
+        user: str = None,
+        engine: str = None
+    ):
+
         json = {"input": input}
 
         if api_key is not None:
@@ -144,3 +200,26 @@ class LLMSelectorService(ServiceRequestSession):
 
     def count_tokens(self, text: str):
         return self.request(json={'text': text}, path='count-tokens')
+
+
+class AsyncLLMSelectorService(AsyncServiceRequestSession, LLMSelectorService):
+    """Asyncio variant of LLMSelectorService. Its requests must be awaited."""
+
+    def __init__(self, *args, embedding_cache: EmbeddingCache = None, **kwargs):
+        AsyncServiceRequestSession.__init__(self, *args, **kwargs)
+        self.embedding_cache = embedding_cache
+
+    async def embeddings(
+        self,
+        input: t.Union[str, list],
+        api_key: str = None,
+        user: str = None,
+        engine: str = None
+    ):
+        if self.embedding_cache is None or not input:
+            return await self._embeddings(input, api_key, user, engine)
+
+        lookup = self.embedding_cache.lookup(engine, [input] if isinstance(input, str) else input)
+        response = await self._embeddings(lookup.misses, api_key, user, engine) if lookup.misses else None
+        embeddings = _get_embeddings(response) if response is not None else []
+        return _merge_embeddings_response(response, lookup.merge(embeddings))
@@ -1,4 +1,5 @@
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
 from typing import List
 
 
@@ -46,3 +47,7 @@ class ParaphraseService(ServiceRequestSession):
             json["filename"] = filename
 
         return self.request(json={"filename": filename}, path="prompt/simplify/reload")
+
+
+class AsyncParaphraseService(AsyncServiceRequestSession, ParaphraseService):
+    """Asyncio variant of ParaphraseService. Its requests must be awaited."""
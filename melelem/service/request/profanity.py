@@ -1,4 +1,5 @@
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
 from typing import List
 
 class ProfanityService(ServiceRequestSession):
@@ -6,3 +7,7 @@ class ProfanityService(ServiceRequestSession):
 
     def detect(self, strings: List[str]):
         return self.request(json={"strings": strings})
+
+
+class AsyncProfanityService(AsyncServiceRequestSession, ProfanityService):
+    """Asyncio variant of ProfanityService. Its requests must be awaited."""
@@ -1,6 +1,7 @@
 import typing as t
 
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
 
 
 class ProfanityModelService(ServiceRequestSession):
@@ -8,3 +9,7 @@ class ProfanityModelService(ServiceRequestSession):
 
     def infer(self, strings: t.List[str]):
         return self.request({'strings': strings})
+
+
+class AsyncProfanityModelService(AsyncServiceRequestSession, ProfanityModelService):
+    """Asyncio variant of ProfanityModelService. Its requests must be awaited."""
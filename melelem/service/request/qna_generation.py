@@ -2,6 +2,7 @@ import typing as t
 
 from ...pre_processing import Chunk
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
 
 
 # TODO: Abstract this class into base class.
@@ -33,3 +34,7 @@ class QnAGenerationService(ServiceRequestSession):
             json['user'] = user
             
         return self.request(json)
+
+
+class AsyncQnAGenerationService(AsyncServiceRequestSession, QnAGenerationService):
+    """Asyncio variant of QnAGenerationService. Its requests must be awaited."""
@@ -1,4 +1,5 @@
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
 
 
 class QueryParserService(ServiceRequestSession):
@@ -31,3 +32,7 @@ class QueryParserService(ServiceRequestSession):
             json["classification"] = classification
 
         return self.request(json=json)
+
+
+class AsyncQueryParserService(AsyncServiceRequestSession, QueryParserService):
+    """Asyncio variant of QueryParserService. Its requests must be awaited."""
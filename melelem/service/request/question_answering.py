@@ -1,5 +1,6 @@
 from re import S
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
 from typing import List, Dict, Any
 
 class QuestionAnsweringService(ServiceRequestSession):
@@ -55,3 +56,7 @@ class QuestionAnsweringService(ServiceRequestSession):
             json["generic_response"] = generic_response
 
         return self.request(json=json, path="answer")
+
+
+class AsyncQuestionAnsweringService(AsyncServiceRequestSession, QuestionAnsweringService):
+    """Asyncio variant of QuestionAnsweringService. Its requests must be awaited."""
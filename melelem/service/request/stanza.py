@@ -1,12 +1,19 @@
 from ._base import ServiceRequestSession
-from typing import List
+from ._async_base import AsyncServiceRequestSession
+from typing import List, BinaryIO
 
 
 class StanzaService(ServiceRequestSession):
     name = "melelem-service-model-stanza"
 
-    def annotate(self, texts: List[str]):
+    def annotate(self, texts: List[str], sink: BinaryIO = None):
+        """Annotate texts. The annotations are returned as bytes or, if a file-like sink is
+        given, streamed to it (returning the number of bytes written)."""
 
         json = {"texts": texts}
 
-        return self.request(json=json, path="annotate", response_type=bytes)
+        return self.request(json=json, path="annotate", response_type=bytes, sink=sink)
+
+
+class AsyncStanzaService(AsyncServiceRequestSession, StanzaService):
+    """Asyncio variant of StanzaService. Its requests must be awaited."""
@@ -1,4 +1,5 @@
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
 from typing import List
 
 class SummarizationService(ServiceRequestSession):
@@ -25,3 +26,7 @@ class SummarizationService(ServiceRequestSession):
             json["engine"] = engine
         
         return self.request(json=json)
+
+
+class AsyncSummarizationService(AsyncServiceRequestSession, SummarizationService):
+    """Asyncio variant of SummarizationService. Its requests must be awaited."""
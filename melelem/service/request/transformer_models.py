@@ -1,21 +1,108 @@
+import typing as t
+
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
+from ._batch import MicroBatcher, AsyncMicroBatcher
+from ...utilities import EmbeddingCache
+
+
+def _split_encode_response(response: t.Any, indices: t.List[int], text_count: int):
+    """Get the share of an encode response for the given indices of the encoded texts. The
+    response may be a list with one item per text or a dict of such lists (other values are
+    shared)."""
+    if isinstance(response, list):
+        return [response[index] for index in indices]
+    if isinstance(response, dict):
+        return {
+            key: (
+                [value[index] for index in indices]
+                if isinstance(value, list) and len(value) == text_count
+                else value
+            )
+            for key, value in response.items()
+        }
+    return response
+
+
+def _get_encode_embeddings(response: t.Any) -> t.List[t.List[float]]:
+    """Get the embeddings of an encode response: a list of embeddings or a dict of them."""
+    return response if isinstance(response, list) else response['embeddings']
+
+
+def _merge_encode_response(response: t.Any, embeddings: t.List[t.List[float]]):
+    """Replace the embeddings of an encode response (None if all embeddings were cached)."""
+    if isinstance(response, list):
+        return embeddings
+    return {**(response or {}), 'embeddings': embeddings}
 
 
 class TransformerModelService(ServiceRequestSession):
     name = "melelem-service-model-transformers"
 
+    _encode_batcher_class = MicroBatcher
+
+    def __init__(
+        self,
+        *args,
+        encode_batching: bool = False,
+        encode_max_batch_size: int = 64,
+        encode_max_delay: float = 0.005,
+        embedding_cache: EmbeddingCache = None,
+        **kwargs
+    ):
+        """
+        Args:
+            embedding_cache (EmbeddingCache, optional): Cache of encoded texts (by task). Only the texts which are not cached are sent to the service. Defaults to None.
+            encode_batching (bool, optional): Whether to merge encode() calls made concurrently (e.g. from many threads) into one request. Defaults to False.
+            encode_max_batch_size (int, optional): The max number of unique texts per merged request. Defaults to 64.
+            encode_max_delay (float, optional): The max seconds a call waits for other calls to merge with. Defaults to 0.005.
+        """
+        super().__init__(*args, **kwargs)
+        self._init_encode_batcher(encode_batching, encode_max_batch_size, encode_max_delay)
+        self.embedding_cache = embedding_cache
+
+    def _init_encode_batcher(
+        self,
+        encode_batching: bool,
+        encode_max_batch_size: int,
+        encode_max_delay: float
+    ):
+        self._encode_batcher: MicroBatcher = None
+        if encode_batching:
+            self._encode_batcher = self._encode_batcher_class(
+                send=self._encode,
+                split=_split_encode_response,
+                max_batch_size=encode_max_batch_size,
+                max_delay=encode_max_delay
+            )
+
     def classify_queries(self, queries: list[str]):
-        
+
         json = {"queries": queries}
 
-        return self.request(json=json, path="classify-query")      
+        return self.request(json=json, path="classify-query")
 
     def encode(self, texts: list[str], task: str = None):
+        if self.embedding_cache is None or not texts:
+            return self._batch_encode(texts, task)
+
+        lookup = self.embedding_cache.lookup(task, texts)
+        response = self._batch_encode(lookup.misses, task) if lookup.misses else None
+        embeddings = _get_encode_embeddings(response) if response is not None else []
+        return _merge_encode_response(response, lookup.merge(embeddings))
+
+    def _batch_encode(self, texts: list[str], task: str = None):
+        if self._encode_batcher is not None:
+            return self._encode_batcher.submit(texts, task)
+
+        return self._encode(texts, task)
+
+    def _encode(self, texts: list[str], task: str = None):
 
         json = {"texts": texts}
         if task is not None:
             json["task"] = task
-            
+
         return self.request(json=json, path="sentence-bert/encode")
 
     def extract_keywords(self, **kwargs):
@@ -29,3 +116,31 @@ class TransformerModelService(ServiceRequestSession):
         json = {"texts": texts}
 
         return self.request(json=json, path="sentiment")
+
+
+class AsyncTransformerModelService(AsyncServiceRequestSession, TransformerModelService):
+    """Asyncio variant of TransformerModelService. Its requests must be awaited."""
+
+    _encode_batcher_class = AsyncMicroBatcher
+
+    def __init__(
+        self,
+        *args,
+        encode_batching: bool = False,
+        encode_max_batch_size: int = 64,
+        encode_max_delay: float = 0.005,
+        embedding_cache: EmbeddingCache = None,
+        **kwargs
+    ):
+        AsyncServiceRequestSession.__init__(self, *args, **kwargs)
+        self._init_encode_batcher(encode_batching, encode_max_batch_size, encode_max_delay)
+        self.embedding_cache = embedding_cache
+
+    async def encode(self, texts: list[str], task: str = None):
+        if self.embedding_cache is None or not texts:
+            return await self._batch_encode(texts, task)
+
+        lookup = self.embedding_cache.lookup(task, texts)
+        response = await self._batch_encode(lookup.misses, task) if lookup.misses else None
+        embeddings = _get_encode_embeddings(response) if response is not None else []
+        return _merge_encode_response(response, lookup.merge(embeddings))
@@ -1,4 +1,5 @@
 from ._base import ServiceRequestSession
+from ._async_base import AsyncServiceRequestSession
 from typing import List
 
 class TranslationService(ServiceRequestSession):
@@ -24,3 +25,7 @@ class TranslationService(ServiceRequestSession):
 
     def detect(self, texts: List[str]):
         return self.request(json={"texts": texts}, path="detect")
+
+
+class AsyncTranslationService(AsyncServiceRequestSession, TranslationService):
+    """Asyncio variant of TranslationService. Its requests must be awaited."""
@@ -1,34 +1,218 @@
+import typing as t
+from timeit import default_timer
+import threading
+import logging
 import os
 
 from kubernetes import client
 from kubernetes.config import load_incluster_config
+from kubernetes.watch import Watch
 
 from .utilities import LazyLoader
 
 
 DEBUG = bool(int(os.environ.get('DEBUG', '0')))
 
+# Seconds a resolved service URL is reused before asking kubernetes again.
+SERVICE_URL_CACHE_TTL = float(os.environ.get('SERVICE_URL_CACHE_TTL', '60'))
+# Seconds a non-existent service is remembered as non-existent.
+SERVICE_URL_CACHE_NEGATIVE_TTL = float(os.environ.get('SERVICE_URL_CACHE_NEGATIVE_TTL', '5'))
+# Whether to keep the cache up to date by watching kubernetes' service objects.
+SERVICE_URL_CACHE_WATCH = bool(int(os.environ.get('SERVICE_URL_CACHE_WATCH', '0')))
+
 K8S = LazyLoader(client.CoreV1Api)
 K8S_CONFIG = LazyLoader(load_incluster_config)
 
+logger = logging.getLogger(__name__)
+
+
+def _get_url(service: client.V1Service) -> t.Optional[str]:
+    """Get the URL of a service, or None if it has none (e.g. ExternalName and headless services,
+    which have no ports or cluster IP)."""
+    service_spec: client.V1ServiceSpec = service.spec
+    if not service_spec.ports or not service_spec.cluster_ip or service_spec.cluster_ip == 'None':
+        return None
+    service_port: client.V1ServicePort = service_spec.ports[0]
+
+    return f'http://{service_spec.cluster_ip}:{service_port.port}/'
+
+
+def _resolve_service_url(name: str):
+    K8S_CONFIG()
+
+    services: client.V1ServiceList = K8S().list_service_for_all_namespaces(
+        field_selector='metadata.name=' + name
+    )
+    # NOTE: Services of the same name in different namespaces are listed by namespace, and the
+    # first one with a URL is used.
+    for service in services.items:
+        url = _get_url(service)
+        if url is not None:
+            return url
+    raise NameError('Service does not exist.')
+
+
+class ServiceUrlCache:
+    """
+    Thread-safe cache of service URLs resolved from kubernetes' internal API.
+
+    Resolved URLs are kept for `ttl` seconds. Services which do not exist are kept for
+    `negative_ttl` seconds, during which a NameError is raised without asking kubernetes.
+    Optionally, a background thread watches kubernetes' service objects and updates the cached
+    entries as soon as services are added, modified or deleted.
+    """
+
+    # The entry of a service which does not exist.
+    _MISSING = None
+
+    def __init__(self, ttl: float = 60, negative_ttl: float = 5):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: t.Dict[str, t.Tuple[t.Optional[str], float]] = {}
+        self._lock = threading.Lock()
+        self._watch: Watch = None
+        self._watch_thread: threading.Thread = None
+
+    def get(self, name: str, resolve: t.Callable[[str], str] = _resolve_service_url):
+        """
+        Get the URL of a service, resolving and caching it on a miss.
+
+        :param name: The name of the service. E.g. 'melelem-api'.
+        :param resolve: Resolves a service's URL on a cache miss.
+        :raises NameError: If the service does not exist.
+        :return: The service's URL.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[1] > default_timer():
+                self.hits += 1
+            else:
+                entry = None
+                self.misses += 1
+
+        if entry is not None:
+            url = entry[0]
+            if url is self._MISSING:
+                raise NameError('Service does not exist.')
+            return url
+
+        try:
+            url = resolve(name)
+        except NameError:
+            self.set(name, self._MISSING)
+            raise
+        self.set(name, url)
+        return url
+
+    def set(self, name: str, url: t.Optional[str]):
+        """
+        Cache the URL of a service. A URL of None caches that the service does not exist.
+
+        :param name: The name of the service.
+        :param url: The service's URL.
+        """
+        ttl = self.negative_ttl if url is self._MISSING else self.ttl
+        with self._lock:
+            self._entries[name] = (url, default_timer() + ttl)
+
+    def invalidate(self, name: str):
+        """Remove a service from the cache."""
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def clear(self):
+        """Remove all services from the cache and reset its counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Get the cache's counters for monitoring."""
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._entries)
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'size': size,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'watching': self.is_watching
+        }
+
+    @property
+    def is_watching(self):
+        return self._watch_thread is not None and self._watch_thread.is_alive()
+
+    def start_watch(self):
+        """Start watching kubernetes' service objects in a daemon thread, if not already."""
+        with self._lock:
+            if self._watch_thread is not None and self._watch_thread.is_alive():
+                return
+            self._watch = Watch()
+            self._watch_thread = threading.Thread(
+                target=self._watch_services,
+                args=(self._watch,),
+                name='service-url-cache-watch',
+                daemon=True
+            )
+            self._watch_thread.start()
+
+    def stop_watch(self):
+        """Stop watching kubernetes' service objects."""
+        with self._lock:
+            watch, self._watch = self._watch, None
+            self._watch_thread = None
+        if watch is not None:
+            watch.stop()
+
+    def _watch_services(self, watch: Watch):
+        K8S_CONFIG()
+
+        # NOTE: Each stream starts by listing all services, so restarting it before the TTL
+        # elapses keeps every entry fresh.
+        timeout_seconds = max(1, int(self.ttl / 2))
+        while self._watch is watch:
+            # The URLs of the services with a URL by name and namespace. As the resolver, the
+            # first namespace's URL is cached for services of the same name.
+            urls: t.Dict[str, t.Dict[str, str]] = {}
+            try:
+                for event in watch.stream(
+                    K8S().list_service_for_all_namespaces,
+                    timeout_seconds=timeout_seconds
+                ):
+                    service: client.V1Service = event['object']
+                    name, namespace = service.metadata.name, service.metadata.namespace
+                    namespace_urls = urls.setdefault(name, {})
+                    url = None if event['type'] == 'DELETED' else _get_url(service)
+                    if url is None:
+                        namespace_urls.pop(namespace, None)
+                    else:
+                        namespace_urls[namespace] = url
+                    self.set(name, namespace_urls[min(namespace_urls)] if namespace_urls else self._MISSING)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to watch services. Retrying in %s seconds.', timeout_seconds)
+                threading.Event().wait(timeout_seconds)
+
+
+SERVICE_URL_CACHE = ServiceUrlCache(
+    ttl=SERVICE_URL_CACHE_TTL,
+    negative_ttl=SERVICE_URL_CACHE_NEGATIVE_TTL
+)
+
 
 def get_service_url(name: str):
     """
-    Get the URL of a service by name from kubernetes' internal API.
+    Get the URL of a service by name from kubernetes' internal API. URLs are cached (see
+    SERVICE_URL_CACHE).
 
     :param name: The name of the service. E.g. 'melelem-api'.
     :raises NameError: If the service does not exist.
     :return: The service's URL.
     """
-    K8S_CONFIG()
+    if SERVICE_URL_CACHE_WATCH:
+        SERVICE_URL_CACHE.start_watch()
 
-    services: client.V1ServiceList = K8S().list_service_for_all_namespaces(
-        field_selector='metadata.name=' + name
-    )
-    if not services.items:
-        raise NameError('Service does not exist.')
-    service: client.V1Service = services.items[0]
-    service_spec: client.V1ServiceSpec = service.spec
-    service_port: client.V1ServicePort = service_spec.ports[0]
-
-    return f'http://{service_spec.cluster_ip}:{service_port.port}/'
+    return SERVICE_URL_CACHE.get(name)
@@ -1,3 +1,5 @@
 from .timer import Timer
 from .lazy_loader import LazyLoader
-from .multithreading import multithread
\ No newline at end of file
+from .multithreading import multithread
+from .embedding_cache import EmbeddingCache
+from .pattern_registry import PatternRegistry, PATTERNS
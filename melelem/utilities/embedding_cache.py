@@ -0,0 +1,210 @@
+import typing as t
+from collections import OrderedDict
+from pathlib import Path
+from array import array
+import threading
+import hashlib
+import mmap
+import os
+
+
+Embedding = t.List[float]
+Key = t.Tuple[str, str]
+
+
+class EmbeddingCacheLookup:
+    """The result of looking up texts in an EmbeddingCache."""
+
+    def __init__(self, cache: 'EmbeddingCache', namespace: str, texts: t.List[str]):
+        self.cache = cache
+        self.namespace = namespace
+        self.texts = texts
+        self.embeddings: t.List[t.Optional[Embedding]] = cache.get_many(namespace, texts)
+        # The unique texts which were not cached.
+        self.misses: t.List[str] = list(dict.fromkeys(
+            text for text, embedding in zip(texts, self.embeddings) if embedding is None
+        ))
+
+    def merge(self, miss_embeddings: t.List[Embedding]):
+        """Cache the embeddings of the misses and get the embeddings of all texts in order.
+
+        Args:
+            miss_embeddings (t.List[Embedding]): The embeddings of the misses, in order.
+
+        Returns:
+            t.List[Embedding]: The embeddings of all texts.
+        """
+        self.cache.set_many(self.namespace, self.misses, miss_embeddings)
+        miss_embeddings = dict(zip(self.misses, miss_embeddings))
+        return [
+            miss_embeddings[text] if embedding is None else embedding
+            for text, embedding in zip(self.texts, self.embeddings)
+        ]
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of embeddings, keyed by (namespace, text hash). The namespace
+    separates embeddings of different engines or tasks.
+
+    Embeddings are kept in an in-memory LRU layer and, if a directory is given, persisted as
+    float32 arrays (one file per embedding) which are memory-mapped when read. Both layers are
+    size-bounded and evict their least recently used embeddings.
+
+    Args:
+        directory (t.Union[str, Path], optional): Where to persist embeddings. Defaults to None (memory only).
+        max_memory_items (int, optional): The max number of embeddings kept in memory. Defaults to 10000.
+        max_disk_bytes (int, optional): The max number of bytes persisted on disk. Defaults to 1GiB.
+    """
+
+    _FILE_SUFFIX = '.f32'
+
+    def __init__(
+        self,
+        directory: t.Union[str, Path] = None,
+        max_memory_items: int = 10000,
+        max_disk_bytes: int = 1 << 30
+    ):
+        self.directory = Path(directory) if directory is not None else None
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: 'OrderedDict[Key, array]' = OrderedDict()
+        self._disk: 'OrderedDict[Key, int]' = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.RLock()
+        if self.directory is not None:
+            self._load_disk_index()
+
+    @staticmethod
+    def get_key(namespace: str, text: str) -> Key:
+        return (
+            hashlib.sha256((namespace or '').encode('utf-8')).hexdigest()[:16],
+            hashlib.sha256(text.encode('utf-8')).hexdigest()
+        )
+
+    def _get_path(self, key: Key):
+        namespace, text_hash = key
+        return self.directory.joinpath(namespace, text_hash[:2], text_hash + self._FILE_SUFFIX)
+
+    def _load_disk_index(self):
+        paths = sorted(
+            self.directory.glob('*/*/*' + self._FILE_SUFFIX),
+            key=lambda path: path.stat().st_mtime
+        )
+        for path in paths:
+            size = path.stat().st_size
+            self._disk[(path.parent.parent.name, path.stem)] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _read(self, key: Key):
+        with open(self._get_path(key), 'rb') as file:
+            if not os.fstat(file.fileno()).st_size:
+                return array('f')
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return array('f', memoryview(data).cast('f'))
+
+    def _write(self, key: Key, embedding: array):
+        path = self._get_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(temp_path, 'wb') as file:
+            embedding.tofile(file)
+        os.replace(temp_path, path)
+
+        size = len(embedding) * embedding.itemsize
+        self._disk_bytes += size - self._disk.pop(key, 0)
+        self._disk[key] = size
+        self._evict_disk()
+
+    def _evict_disk(self):
+        while self._disk and self._disk_bytes > self.max_disk_bytes:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._get_path(key))
+            except FileNotFoundError:
+                pass
+
+    def _set_memory(self, key: Key, embedding: array):
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, namespace: str, text: str) -> t.Optional[Embedding]:
+        """Get the embedding of a text, or None if not cached."""
+        key = self.get_key(namespace, text)
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return embedding.tolist()
+
+            if key in self._disk:
+                try:
+                    embedding = self._read(key)
+                except FileNotFoundError:
+                    self._disk_bytes -= self._disk.pop(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self._set_memory(key, embedding)
+                    self.disk_hits += 1
+                    return embedding.tolist()
+
+            self.misses += 1
+            return None
+
+    def get_many(self, namespace: str, texts: t.List[str]):
+        """Get the embeddings of texts, with None for those not cached."""
+        return [self.get(namespace, text) for text in texts]
+
+    def set(self, namespace: str, text: str, embedding: Embedding):
+        """Cache the embedding of a text."""
+        key = self.get_key(namespace, text)
+        embedding = array('f', embedding)
+        with self._lock:
+            self._set_memory(key, embedding)
+            if self.directory is not None:
+                self._write(key, embedding)
+
+    def set_many(self, namespace: str, texts: t.List[str], embeddings: t.List[Embedding]):
+        """Cache the embeddings of texts."""
+        for text, embedding in zip(texts, embeddings):
+            self.set(namespace, text, embedding)
+
+    def lookup(self, namespace: str, texts: t.List[str]):
+        """Look up texts, so only the misses need to be embedded (see EmbeddingCacheLookup)."""
+        return EmbeddingCacheLookup(self, namespace, texts)
+
+    def clear(self):
+        """Remove all embeddings (also from disk) and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk):
+                try:
+                    os.remove(self._get_path(key))
+                except FileNotFoundError:
+                    pass
+            self._disk.clear()
+            self._disk_bytes = 0
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def stats(self):
+        """Get the cache's counters for monitoring."""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'memory_items': len(self._memory),
+                'disk_items': len(self._disk),
+                'disk_bytes': self._disk_bytes
+            }
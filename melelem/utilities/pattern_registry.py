@@ -0,0 +1,71 @@
+import typing as t
+import threading
+import re
+
+
+Key = t.Tuple[str, int]
+
+
+class PatternRegistry:
+    """
+    Thread-safe registry of compiled regular expressions, keyed by (pattern, flags). Each pattern
+    is compiled on its first use and kept for the life of the process, unlike in the re module's
+    cache, which is bounded and evicted by the large stopword and abbreviation alternations.
+
+    The registry is not bounded, so only the modules' constant patterns may be registered. Patterns
+    built from callers' data (e.g. custom contractions or profanities) must be compiled with
+    re.compile and kept by their user.
+
+    Lookups of compiled patterns take no lock (so concurrent hits may be undercounted). Compiling
+    takes the lock, so each pattern is only compiled once even if threads race to use it.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._patterns: t.Dict[Key, t.Pattern] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def compile(self, pattern: str, flags: int = 0) -> t.Pattern:
+        """Get the compiled pattern, compiling it on its first use.
+
+        :param pattern: The regular expression
+        :param flags: The re flags, defaults to 0
+        :return: The compiled pattern
+        """
+        key = (pattern, int(flags))
+        compiled_pattern = self._patterns.get(key)
+        if compiled_pattern is not None:
+            self.hits += 1
+            return compiled_pattern
+
+        with self._lock:
+            compiled_pattern = self._patterns.get(key)
+            if compiled_pattern is None:
+                self.misses += 1
+                compiled_pattern = self._patterns[key] = re.compile(pattern, flags)
+            else:
+                self.hits += 1
+        return compiled_pattern
+
+    def stats(self):
+        """Get the registry's counters for monitoring. Misses are lookups which compiled a pattern."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'patterns': len(self)
+        }
+
+    def clear(self):
+        with self._lock:
+            self._patterns.clear()
+            self.hits = self.misses = 0
+
+
+# The registry of the constant patterns of the pre_processing modules.
+PATTERNS = PatternRegistry()
@@ -5,8 +5,8 @@ import argparse
 # Set the version to be the 24hr, UTC+0 datetime stamp:
 #   1. by hand (see: https://www.utctime.net/).
 #   2. run this script with version arg ('python setup.py -v').
-YEAR, MONTH, DAY = 24, 9, 17  # date
-HOUR, MINUTE, SECOND = 6, 23, 15  # time
+YEAR, MONTH, DAY = 26, 10, 18  # date
+HOUR, MINUTE, SECOND = 17, 38, 55  # time
 
 arg_parser = argparse.ArgumentParser()
 arg_parser.add_argument(
@@ -0,0 +1,46 @@
+from unittest import TestCase
+from unittest.mock import patch, Mock
+import types
+import sys
+
+from melelem.pre_processing.batch import map_texts, preload_resources, _get_lazy_loaders
+from melelem.pre_processing.sentence import Sentence
+from melelem.pre_processing.stopword import Stopword, STOPWORDS
+from melelem.utilities import LazyLoader
+
+
+TEXTS = ['Hello there. General Kenobi!', 'Dr. Who is here. Is he?', ''] * 50
+
+
+class MapTextsTests(TestCase):
+    def test_map_texts__serial(self):
+        with patch('multiprocessing.Pool') as Pool:
+            results = list(map_texts(Sentence.from_text, iter(TEXTS), serial_threshold=len(TEXTS) + 1))
+        Pool.assert_not_called()
+        self.assertListEqual(results, list(map(Sentence.from_text, TEXTS)))
+
+    def test_map_texts__pool(self):
+        results = map_texts(Sentence.from_text, iter(TEXTS), processes=2, chunksize=7, serial_threshold=10)
+        self.assertListEqual(list(results), list(map(Sentence.from_text, TEXTS)))
+
+    def test_map_texts__kwargs(self):
+        results = map_texts(Stopword.from_text, TEXTS, processes=2, serial_threshold=10, language='english')
+        self.assertListEqual(list(results), [Stopword.from_text(text, language='english') for text in TEXTS])
+
+    def test_map_texts__close(self):
+        results = map_texts(Sentence.from_text, iter(TEXTS), processes=2, chunksize=1, serial_threshold=10)
+        self.assertEqual(next(results), Sentence.from_text(TEXTS[0]))
+        results.close()
+
+    def test_preload_resources(self):
+        # NOTE: A private module and LazyLoader, as the shared ones' values must not be mocked.
+        module = types.ModuleType('melelem.pre_processing._resources')
+        load = Mock(return_value={'resource'})
+        module.RESOURCES = LazyLoader(load)
+        with patch.dict(sys.modules, {module.__name__: module}):
+            lazy_loaders = _get_lazy_loaders()
+            self.assertIn(STOPWORDS, lazy_loaders)
+            self.assertIn(module.RESOURCES, lazy_loaders)
+            preload_resources()
+        load.assert_called_once()
+        self.assertSetEqual(module.RESOURCES(), {'resource'})
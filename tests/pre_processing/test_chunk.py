@@ -1,7 +1,51 @@
 from unittest import TestCase
+from unittest.mock import patch, Mock
+import random
+import re
 
 from melelem.pre_processing import Sentence
-from melelem.pre_processing.chunk import Chunk
+from melelem.pre_processing.chunk import Chunk, _SizeLimit
+
+
+def pack_chunks_legacy(sentences, max_words=0, max_sentences=0, max_characters=0, max_func=None, sentence_overlap=0):
+    """The former packing of Chunk.from_text, as reference."""
+    def larger(chunk):
+        return bool(
+            (max_characters and sum(s.length for s in chunk) > max_characters)
+            or (max_words and sum(len(s.words) for s in chunk) > max_words)
+            or (max_func and max_func(Chunk(sentences=chunk)))
+        )
+
+    chunks, index = [], 0
+    while index < len(sentences):
+        if larger([sentences[index]]):
+            chunks.append(Chunk(sentences=[sentences[index]]))
+            index += 1
+            continue
+        chunk = [sentences[index]]
+        for next_sentence in sentences[index + 1:]:
+            if larger(chunk + [next_sentence]) or (max_sentences and len(chunk) + 1 > max_sentences):
+                break
+            chunk.append(next_sentence)
+        index += len(chunk)
+        if len(chunk) > 1 and index < len(sentences):
+            index -= sentence_overlap if sentence_overlap < len(chunk) else len(chunk) - 1
+        chunks.append(Chunk(sentences=chunk))
+    return chunks
+
+
+class Tokenizer:
+    """Tokenizes words (with their leading space) and punctuations."""
+
+    def __init__(self):
+        self.encoded_texts = []
+
+    def encode_ordinary(self, text):
+        return re.findall(r' ?\w+| ?[^\w\s]|\s', text)
+
+    def encode_ordinary_batch(self, texts):
+        self.encoded_texts.extend(texts)
+        return list(map(self.encode_ordinary, texts))
 
 
 class ChunkTests(TestCase):
@@ -107,6 +151,71 @@ class ChunkTests(TestCase):
             ])
         ])
 
+    def test_from_text__random(self):
+        rng = random.Random(0)
+        pieces = ['One.', 'Two', 'three!', 'Dr. Who', 'a', 'A longer sentence here.', 'Why?', '3.14 is pi.']
+        for _ in range(200):
+            text = ' '.join(rng.choice(pieces) for _ in range(rng.randint(1, 40)))
+            kwargs = dict(
+                max_words=rng.choice([0, 1, 3, 8]),
+                max_sentences=rng.choice([0, 1, 2, 5]),
+                max_characters=rng.choice([0, 4, 20, 60]),
+                sentence_overlap=rng.choice([0, 1, 3])
+            )
+            if rng.random() < 0.3:
+                kwargs['max_func'] = lambda chunk: chunk.text.count('e') > 4
+            if not any(kwargs.values()):
+                continue
+            self.assertListEqual(
+                Chunk.from_text(text, **kwargs),
+                pack_chunks_legacy(Sentence.from_text(text), **kwargs)
+            )
+
+    def test_from_text__max_tokens(self):
+        text = 'One two. Three! Four five six. Seven. Eight nine.'
+        tokenizer = Tokenizer()
+        with patch('melelem.pre_processing.chunk.TOKENIZER', Mock(return_value=tokenizer)) as get_tokenizer:
+            chunks = Chunk.from_text(text, max_tokens=5, engine='gpt-4')
+
+        get_tokenizer.assert_called_once_with('gpt-4')
+        self.assertListEqual([chunk.text for chunk in chunks], [
+            'One two. Three!', 'Four five six.', 'Seven. Eight nine.'
+        ])
+        # Each sentence is tokenized once alone and once after the joiner.
+        self.assertEqual(len(tokenizer.encoded_texts), 2 * len(Sentence.from_text(text)))
+        for chunk, next_chunk in zip(chunks, chunks[1:]):
+            self.assertLessEqual(len(tokenizer.encode_ordinary(chunk.text)), 5)
+            text_with_next_sentence = chunk.text + ' ' + next_chunk.sentences[0].text
+            self.assertGreater(len(tokenizer.encode_ordinary(text_with_next_sentence)), 5)
+
+    def test_from_text__max_tokens__oversized_first_sentence(self):
+        class FirstCharTokenizer(Tokenizer):
+            """Tokenizes the chars of a text without a leading space, so a first sentence has many more tokens."""
+
+            def encode_ordinary(self, text):
+                return super().encode_ordinary(text) if text.startswith(' ') else list(text)
+
+        text = 'Aaaaaaaa. B. C.'
+        with patch('melelem.pre_processing.chunk.TOKENIZER', Mock(return_value=FirstCharTokenizer())):
+            chunks = Chunk.from_text(text, max_tokens=3)
+        self.assertListEqual([chunk.text for chunk in chunks], ['Aaaaaaaa.', 'B.', 'C.'])
+
+    def test_size_limit__oversized_first_size(self):
+        limit = _SizeLimit([1, 0, 3], max_size=1, first_sizes=[1, 2, 3])
+        self.assertListEqual([limit.get_end(start) for start in range(3)], [2, 1, 2])
+
+    def test_iter_text(self):
+        rng = random.Random(0)
+        pieces = ['One.', 'Two', 'three!', 'Dr. Who', 'a', 'A longer sentence here.', 'Why?', '3.14 is pi.']
+        text = ' '.join(rng.choice(pieces) for _ in range(12000))
+        for kwargs in [
+            dict(max_words=30, sentence_overlap=1),
+            dict(max_characters=100, max_sentences=3, sentence_overlap=2)
+        ]:
+            text_pieces = (text[index:index + 1000] for index in range(0, len(text), 1000))
+            chunks = Chunk.iter_text(text_pieces, batch_size=16, **kwargs)
+            self.assertListEqual(list(chunks), Chunk.from_text(text, **kwargs))
+
     def test_from_text__no_chunks(self):
         text = 'He went to the park'
         chunks = Chunk.from_text(text, max_characters=1)
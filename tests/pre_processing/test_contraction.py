@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from melelem.pre_processing.contraction import (
+    ContractionExpander,
+    expand_contractions,
+    get_contraction_expander
+)
+from melelem.utilities import PATTERNS
+
+
+class ExpandContractionsTests(TestCase):
+    def test_expand_contractions(self):
+        self.assertEqual(expand_contractions("I'm sure you'll see."), 'I am sure you will see.')
+
+    def test_expand_contractions__ignore_case(self):
+        self.assertEqual(expand_contractions("YOU'LL see"), 'you will see')
+        self.assertEqual(expand_contractions("YOU'LL see", ignore_case=False), "YOU'LL see")
+
+    def test_expand_contractions__custom(self):
+        contractions = {"gonna": 'going to', "Wanna": 'Want to'}
+        self.assertEqual(expand_contractions('Gonna go, wanna go', contractions), 'going to go, Want to go')
+        self.assertIs(get_contraction_expander(dict(contractions)), get_contraction_expander(contractions))
+
+    def test_expand_contractions__custom_not_registered(self):
+        pattern_count = len(PATTERNS)
+        for index in range(50):
+            expand_contractions('x', {'contraction{}'.format(index): 'expansion'})
+        self.assertEqual(len(PATTERNS), pattern_count)
+
+    def test_get_contraction_expander(self):
+        expander = get_contraction_expander()
+        self.assertIsInstance(expander, ContractionExpander)
+        self.assertIs(get_contraction_expander(), expander)
+        self.assertIsNot(get_contraction_expander(ignore_case=False), expander)
+
+    def test_expand_batch(self):
+        texts = ["I'm here.", "They're not", '']
+        self.assertListEqual(
+            get_contraction_expander().expand_batch(texts),
+            [expand_contractions(text) for text in texts]
+        )
@@ -1,6 +1,9 @@
 from unittest import TestCase
+import random
+import re
 
-from melelem.pre_processing.profanity import Profanity
+from melelem.pre_processing.profanity import Profanity, ProfanityMatcher, PROFANITY_PATTERNS
+from melelem.utilities import PATTERNS
 
 
 class ProfanityTests(TestCase):
@@ -24,3 +27,22 @@ class ProfanityTests(TestCase):
         # NOTE: 'ass' should not be matched
         text_spans = Profanity.from_text('asshole')
         self.assertListEqual(text_spans, [Profanity(text='asshole', span=(0, 7))])
+
+    def test_profanity_matcher__custom(self):
+        pattern_count = len(PATTERNS)
+        matcher = ProfanityMatcher(['darn', 'heck'])
+        self.assertListEqual([match.group() for match in matcher.finditer('Heck, d4rn it.')], ['Heck', 'd4rn'])
+        self.assertEqual(len(PATTERNS), pattern_count)
+
+    def test_from_text__random(self):
+        words = ['He', 'is', 'a', 'bitch', 'b!tCh', 'ass', 'asshole', 'a$$', 'dry', 'hump', '2g1c', 's&m', '🖕', ',', '.']
+        rng = random.Random(0)
+        for _ in range(200):
+            text = rng.choice([' ', '  ', '']).join(rng.choice(words) for _ in range(rng.randint(0, 20)))
+            legacy_text_spans = Profanity.from_matches([
+                match
+                for profanity_pattern in PROFANITY_PATTERNS()
+                for match in re.finditer(profanity_pattern, text)
+            ])
+            text_spans = Profanity.from_text(text)
+            self.assertListEqual(text_spans, sorted(legacy_text_spans, key=lambda text_span: text_span.span))
@@ -1,6 +1,34 @@
 from unittest import TestCase
+import random
+import re
+import io
 
-from melelem.pre_processing.sentence import Sentence
+from melelem.pre_processing.sentence import Sentence, NON_BREAK_PATTERNS
+
+
+STREAM_PIECES = [
+    'One.', 'Two', 'three!', 'Dr. Who', 'U.S. army', 'a', 'See https://example.com/a.b.c now.',
+    'Mail j.doe@example.com.', 'Why?', '3.14 is pi.', '\n\n1. Item', '\n2. Item.', 'etc. And'
+]
+
+
+def from_text_legacy(text: str, line_break_split=False):
+    """The former, multi-scan implementation of Sentence.from_text, as reference."""
+    non_break_spans = [
+        match.span() for pattern in NON_BREAK_PATTERNS() for match in re.finditer(pattern, text)
+    ]
+    punct_spans = [match.span() for match in re.finditer(r'[.!?]', text)]
+    punct_spans = Sentence.merge_spans(Sentence.get_non_overlapping_spans(non_break_spans, punct_spans))
+    split_spans = []
+    if line_break_split:
+        line_spans = [match.span() for match in re.finditer(r'[\r\n\t\f]+', text)]
+        split_spans = Sentence.get_non_overlapping_spans(non_break_spans, line_spans)
+    for _, span_end in punct_spans:
+        match = re.match(r'\s+', text[span_end:])
+        split_spans.append((span_end, span_end + (match.end() if match else 0)))
+    if not split_spans:
+        return [Sentence(text=text, span=(0, len(text)))]
+    return Sentence.split(text, split_spans)
 
 
 class SentenceTests(TestCase):
@@ -98,3 +126,49 @@ class SentenceTests(TestCase):
             Sentence(text='Want to learn about NLP?', span=(0, 24)),
             Sentence(text='Contact john.doe@melelem.ai for info.', span=(25, 61))
         ])
+
+    def test_from_text__random(self):
+        tokens = STREAM_PIECES + ['.', '?!', '...', '\t', '\r\n', 'A.B.', '1.2.3', 'et al.', '\nA.', 'U.S.A.']
+        rng = random.Random(0)
+        for _ in range(1000):
+            text = ''.join(rng.choice(tokens) + rng.choice(['', ' ']) for _ in range(rng.randint(0, 30)))
+            for line_break_split in [False, True]:
+                self.assertListEqual(
+                    Sentence.from_text(text, line_break_split=line_break_split),
+                    from_text_legacy(text, line_break_split=line_break_split)
+                )
+
+    def test_array_from_text(self):
+        text = 'Hello there. General Kenobi!\n\nYou are a bold one.'
+        for line_break_split in [False, True]:
+            sentences = Sentence.array_from_text(text, span_offset=10, line_break_split=line_break_split)
+            self.assertIs(sentences.span_cls, Sentence)
+            self.assertListEqual(
+                list(sentences),
+                Sentence.from_text(text, span_offset=10, line_break_split=line_break_split)
+            )
+
+    def test_iter_text(self):
+        rng = random.Random(0)
+        for _ in range(100):
+            text = ' '.join(rng.choice(STREAM_PIECES) for _ in range(rng.randint(1, 300)))
+            line_break_split = rng.random() < 0.5
+            cuts = sorted(rng.sample(range(len(text)), rng.randint(0, 30)))
+            pieces = [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+            sentences = Sentence.iter_text(
+                pieces,
+                line_break_split=line_break_split,
+                lookahead=64,
+                min_segment_length=rng.choice([1, 100])
+            )
+            self.assertListEqual(list(sentences), Sentence.from_text(text, line_break_split=line_break_split))
+
+    def test_iter_text__file(self):
+        text = 'Hello there. General Kenobi! ' * 100
+        sentences = Sentence.iter_text(io.StringIO(text), lookahead=16, min_segment_length=64)
+        first_sentence = next(sentences)
+        self.assertEqual(first_sentence, Sentence(text='Hello there.', span=(0, 12)))
+        self.assertListEqual([first_sentence] + list(sentences), Sentence.from_text(text))
+
+    def test_iter_text__no_text(self):
+        self.assertListEqual(list(Sentence.iter_text([])), [])
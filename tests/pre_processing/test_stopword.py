@@ -1,7 +1,22 @@
 from unittest import TestCase
+import random
+import re
 
 from melelem.pre_processing import TextSpan
-from melelem.pre_processing.stopword import Stopword
+from melelem.pre_processing.stopword import (
+    Stopword,
+    STOPWORDS,
+    MIN_SAMPLE_WINDOW_SIZE,
+    get_language,
+    get_languages
+)
+
+
+def get_language_legacy(text: str):
+    """The former implementation of get_language, as reference."""
+    words = set(text.lower().split())
+    counts = {language: len(words & stopwords) for language, stopwords in STOPWORDS().items()}
+    return max(counts.items(), key=lambda item: item[1])[0]
 
 
 class StopwordTests(TestCase):
@@ -24,3 +39,78 @@ class StopwordTests(TestCase):
             TextSpan(text=' ', span=(23, 24)),
             TextSpan(text=' ancient, extinct wolf.', span=(26, 49))
         ])
+
+    def test_from_text__case_sensitive(self):
+        stopwords = Stopword.from_text('The dog is THE one.', ignore_case=False)
+        self.assertListEqual(stopwords, [Stopword(text='is', span=(8, 10))])
+
+    def test_from_text__phrases(self):
+        stopwords = Stopword.from_text("Don't don'ts, don", language='english')
+        self.assertListEqual(stopwords, [
+            Stopword(text="Don't", span=(0, 5)),
+            Stopword(text='don', span=(6, 9)),
+            Stopword(text='don', span=(14, 17))
+        ])
+
+    def test_from_text__random(self):
+        rng = random.Random(0)
+        fillers = ['xyz', 'Foo', ' ', ',', '-', "'", '\t', '12']
+        for language, stopwords in STOPWORDS().items():
+            stopwords = sorted(stopword for stopword in stopwords if stopword)
+            # The alternation matches the longest of overlapping stopwords, as the matcher.
+            pattern = r'\b({})\b'.format('|'.join(map(re.escape, sorted(stopwords, key=len, reverse=True))))
+            for ignore_case in [True, False]:
+                compiled_pattern = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+                for _ in range(20):
+                    text = ''.join(
+                        rng.choice([str.lower, str.upper, str.title])(rng.choice(stopwords if rng.random() < 0.6 else fillers))
+                        + rng.choice(['', ' ', ' ', '-', "'"])
+                        for _ in range(rng.randint(0, 25))
+                    )
+                    self.assertListEqual(
+                        [stopword.span for stopword in Stopword.from_text(text, language, ignore_case)],
+                        [match.span() for match in compiled_pattern.finditer(text)]
+                    )
+
+
+class GetLanguageTests(TestCase):
+    def test_get_language(self):
+        self.assertEqual(get_language('The dog is derived from an ancient, extinct wolf.'), 'english')
+        self.assertEqual(get_language('Le chien est un animal de compagnie.'), 'french')
+
+    def test_get_language__random(self):
+        rng = random.Random(0)
+        languages = sorted(STOPWORDS())
+        for _ in range(500):
+            words = [
+                rng.choice(sorted(STOPWORDS()[rng.choice(languages)])) if rng.random() < 0.7 else 'xyz'
+                for _ in range(rng.randint(0, 30))
+            ]
+            text = ' '.join(word.upper() if rng.random() < 0.2 else word for word in words)
+            self.assertEqual(get_language(text), get_language_legacy(text))
+
+    def test_get_language__early_stop(self):
+        text = 'The dog is derived from an ancient wolf. Le chien est un animal de compagnie, et il est le meilleur.'
+        self.assertEqual(get_language(text), 'french')
+        self.assertEqual(get_language(text, early_stop_margin=3), 'english')
+
+    def test_get_language__sample(self):
+        text = 'Le chien est un animal. ' * 10 + 'The dog is a pet and it is the best of all. ' * 1000
+        self.assertEqual(get_language(text, sample_size=1 << 10), 'english')
+
+    def test_get_language__small_sample(self):
+        self.assertEqual(get_language('the cat', sample_size=3), get_language('the cat'))
+        text = 'Le chien est un animal de compagnie, et il est le meilleur ami de la famille.'
+        for sample_size in [0, 1, 7, 8, 16, MIN_SAMPLE_WINDOW_SIZE - 1]:
+            with self.subTest(sample_size=sample_size):
+                self.assertEqual(get_language(text, sample_size=sample_size), 'french')
+
+    def test_get_language__sample_windows(self):
+        text = 'Le chien est un animal de compagnie. ' * 20
+        for sample_size in [MIN_SAMPLE_WINDOW_SIZE, 2 * MIN_SAMPLE_WINDOW_SIZE, len(text) - 1]:
+            with self.subTest(sample_size=sample_size):
+                self.assertEqual(get_language(text, sample_size=sample_size), 'french')
+
+    def test_get_languages(self):
+        texts = ['The dog is a pet.', 'Le chien est un animal.', 'El perro es un animal.']
+        self.assertListEqual(get_languages(texts), ['english', 'french', 'spanish'])
@@ -1,12 +1,62 @@
 from unittest import TestCase
+import random
+import pickle
+import typing as t
+import re
 
 from melelem.pre_processing.text import (
     TextSpan,
+    TextSpanArray,
     remove_possessions,
     normalize_chars
 )
 
 
+def merge_spans_legacy(spans: t.List[t.Tuple[int, int]]):
+    """The former implementation of TextSpan.merge_spans, as reference."""
+    spans = spans.copy()
+    merged_spans = []
+    while spans:
+        span = spans.pop(0)
+        span_index = 0
+        while span_index < len(spans):
+            next_span = spans[span_index]
+            if (
+                next_span[0] <= span[0] <= next_span[1]
+                or next_span[0] <= span[1] <= next_span[1]
+            ):
+                span = (min(span[0], next_span[0]), max(span[1], next_span[1]))
+                spans.pop(span_index)
+                span_index = 0
+            else:
+                span_index += 1
+        merged_spans.append(span)
+    merged_spans.sort()
+    return merged_spans
+
+
+def words_legacy(text: str):
+    """The former implementation of TextSpan.words, as reference."""
+    words = re.split(r'\W+', text)
+    if words:
+        words = words[1 if words[0] == '' else 0:]
+    if words:
+        words = words[:-1 if words[-1] == '' else len(words)]
+    return words
+
+
+def normalize_chars_legacy(text: str, encoding: str = 'utf-8', errors: str = 'ignore'):
+    """The former, multi-pass implementation of normalize_chars, as reference."""
+    text = re.sub(r'\x0d|\x1b|\x07|\uf0b7|\uf020|\u202f|\x02|(\(cid:\d+\))', '', text)
+    text = re.sub(r'\x0c|\x0b|\xa0|\x09', ' ', text)
+    text = re.sub(r"\u201c|\u201d", "\"", text)
+    text = re.sub(r'‘|’', '\'', text)
+    text = re.sub(r'\'\'', '"', text)
+    text = re.sub(r'``', '"', text)
+    text = re.sub(r'–', '-', text)
+    return text.encode(encoding, errors).decode(encoding, errors)
+
+
 class TextSpanTests(TestCase):
     def test_words(self):
         text = ' Hi. Hello, how     are you? I like them - apples!!'
@@ -25,6 +75,20 @@ class TextSpanTests(TestCase):
         words = TextSpan(text=text, span=(0, len(text))).words
         self.assertListEqual(words, [])
 
+    def test_words__memoized(self):
+        text_span = TextSpan(text='Hello there', span=(0, 11))
+        self.assertIs(text_span.words, text_span.words)
+        self.assertEqual(text_span, TextSpan(text='Hello there', span=(0, 11)))
+
+    def test_words__random(self):
+        chars = ['a', 'Z', '9', '_', 'é', 'ß', ' ', '.', '-', '\n', "'", '’', '\u200b']
+        rng = random.Random(0)
+        for _ in range(1000):
+            text = ''.join(rng.choice(chars) for _ in range(rng.randint(0, 20)))
+            words = words_legacy(text)
+            self.assertListEqual(TextSpan(text=text, span=(0, len(text))).words, words)
+            self.assertEqual(TextSpan(text=text, span=(0, len(text))).word_count, len(words))
+
     def test_merge_spans(self):
         spans = [
             (15, 20),
@@ -41,6 +105,39 @@ class TextSpanTests(TestCase):
             (26, 30)
         ])
 
+    def test_merge_spans__touching(self):
+        self.assertListEqual(TextSpan.merge_spans([(5, 8), (0, 5), (8, 8)]), [(0, 8)])
+        self.assertListEqual(TextSpan.merge_spans([(0, 4), (5, 8)]), [(0, 4), (5, 8)])
+
+    def test_merge_spans__nested(self):
+        self.assertListEqual(TextSpan.merge_spans([(0, 10), (2, 3)]), [(0, 10)])
+
+    def test_merge_spans__is_sorted(self):
+        spans = [(0, 2), (1, 4), (6, 7)]
+        self.assertListEqual(TextSpan.merge_spans(iter(spans), is_sorted=True), [(0, 4), (6, 7)])
+        self.assertListEqual(TextSpan.merge_spans([]), [])
+
+    def test_merge_spans__random(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            spans = []
+            for _ in range(rng.randint(0, 30)):
+                start = rng.randint(0, 100)
+                spans.append((start, start + rng.randint(0, 8)))
+            merged_spans = TextSpan.merge_spans(spans)
+
+            # NOTE: The former implementation did not merge a span into a preceding one which
+            # strictly contained it, so those leftovers are not expected.
+            legacy_merged_spans = merge_spans_legacy(spans)
+            self.assertListEqual(merged_spans, [
+                span for span in legacy_merged_spans
+                if not any(
+                    other_span != span and other_span[0] <= span[0] and span[1] <= other_span[1]
+                    for other_span in legacy_merged_spans
+                )
+            ])
+            self.assertListEqual(merged_spans, TextSpan.merge_spans(sorted(spans), is_sorted=True))
+
     def test_split(self):
         text = 'The dog is derived from an ancient, extinct wolf.'
         text_spans = TextSpan.split(text, spans=[(24, 26), (1, 3), (0, 2)])
@@ -56,6 +153,77 @@ class TextSpanTests(TestCase):
             (10, 15)
         ])
 
+    def test_get_non_overlapping_spans__random(self):
+        def get_random_spans(count: int):
+            spans = []
+            for _ in range(count):
+                start = rng.randint(0, 100)
+                spans.append((start, start + rng.randint(0, 10)))
+            return spans
+
+        rng = random.Random(0)
+        for _ in range(200):
+            spans, other_spans = get_random_spans(rng.randint(0, 20)), get_random_spans(rng.randint(0, 20))
+            non_overlapping_spans = TextSpan.get_non_overlapping_spans(spans, other_spans)
+            self.assertListEqual(non_overlapping_spans, [
+                other_span
+                for other_span in other_spans
+                if all(other_span[0] >= span[1] or other_span[1] <= span[0] for span in spans)
+            ])
+
+
+
+class TextSpanArrayTests(TestCase):
+    text = 'The dog is derived from an ancient, extinct wolf.'
+
+    def test_getitem(self):
+        text_spans = TextSpanArray(self.text, [4, 27], [7, 34], span_offset=10)
+        self.assertEqual(len(text_spans), 2)
+        self.assertEqual(text_spans[0], TextSpan(text='dog', span=(14, 17)))
+        self.assertEqual(text_spans[-1], TextSpan(text='ancient', span=(37, 44)))
+        self.assertListEqual(list(text_spans[1:]), [TextSpan(text='ancient', span=(37, 44))])
+        self.assertListEqual(text_spans.spans, [(14, 17), (37, 44)])
+        self.assertListEqual(list(text_spans.texts), ['dog', 'ancient'])
+        self.assertListEqual(list(text_spans.lengths), [3, 7])
+        with self.assertRaises(IndexError):
+            text_spans[2]
+
+    def test_from_matches(self):
+        matches = list(re.finditer(r'\w+', self.text))
+        text_spans = TextSpanArray.from_matches(self.text, iter(matches), span_offset=5)
+        self.assertListEqual(list(text_spans), TextSpan.from_matches(matches, span_offset=5))
+        self.assertEqual(len(TextSpanArray.from_matches(self.text, iter([]))), 0)
+
+    def test_get_word_counts(self):
+        text_spans = TextSpanArray(self.text, [0, 5, 11, 11, 35], [10, 18, 11, 11, len(self.text)])
+        self.assertListEqual(text_spans.get_word_counts(), [3, 3, 0, 0, 2])
+        self.assertListEqual(TextSpanArray(self.text, [], []).get_word_counts(), [])
+
+    def test_get_word_counts__random(self):
+        chars = ['a', 'b', '1', '_', 'é', ' ', '.', ',', '\n']
+        rng = random.Random(0)
+        for _ in range(500):
+            text = ''.join(rng.choice(chars) for _ in range(rng.randint(0, 40)))
+            spans = []
+            for _ in range(rng.randint(0, 10)):
+                start = rng.randint(0, len(text))
+                spans.append((start, rng.randint(start, len(text))))
+            text_spans = TextSpanArray(text, [span[0] for span in spans], [span[1] for span in spans], span_offset=3)
+            self.assertListEqual(text_spans.get_word_counts(), [text_span.word_count for text_span in text_spans])
+
+    def test_eq(self):
+        text_spans = TextSpanArray(self.text, [0], [3])
+        self.assertEqual(text_spans, TextSpanArray('The', [0], [3]))
+        self.assertNotEqual(text_spans, TextSpanArray(self.text, [0], [3], span_offset=1))
+        self.assertNotEqual(text_spans, TextSpanArray(self.text, [4], [7]))
+
+    def test_pickle(self):
+        text_spans = TextSpanArray(self.text, [4, 27], [7, 34], span_offset=10)
+        self.assertEqual(pickle.loads(pickle.dumps(text_spans)), text_spans)
+
+    def test_init__mismatched_offsets(self):
+        with self.assertRaises(ValueError):
+            TextSpanArray(self.text, [0, 1], [2])
 
 class Tests(TestCase):
     def test_remove_possessions(self):
@@ -79,3 +247,14 @@ class Tests(TestCase):
         normalized_text = normalize_chars(text)
         expected_normalized_text = ', '.join(characters.values())
         self.assertEqual(normalized_text, expected_normalized_text)
+
+    def test_normalize_chars__random(self):
+        pieces = [
+            'a', 'é', ' ', '(cid:12)', '(cid:', '1)', '(c', 'id:3)', '\x0d', '\x1b', '\x07', '\uf0b7', '\uf020',
+            '\u202f', '\x02', '\x0c', '\x0b', '\xa0', '\t', '“', '”', '‘', '’', "'", '`', '–', '\ud800'
+        ]
+        rng = random.Random(0)
+        for _ in range(1000):
+            text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+            for encoding in ['utf-8', 'ascii']:
+                self.assertEqual(normalize_chars(text, encoding), normalize_chars_legacy(text, encoding))
@@ -0,0 +1,55 @@
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import threading
+import json
+
+
+Handler = t.Callable[[BaseHTTPRequestHandler, bytes], None]
+
+
+class StubServer:
+    """Local HTTP server which services' requests are routed to (non-DEBUG mode)."""
+
+    def __init__(self, routes: t.Dict[str, Handler]):
+        routes = routes
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                routes[self.path.lstrip('/')](self, body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RequestHandler)
+        self.url = 'http://127.0.0.1:{}/'.format(self.server.server_address[1])
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._patchers = [
+            patch('melelem.service.request._base.DEBUG', False),
+            patch('melelem.service.request._async_base.DEBUG', False),
+            patch('melelem.service.request._base.get_service_url', return_value=self.url)
+        ]
+
+    def __enter__(self):
+        self._thread.start()
+        for patcher in self._patchers:
+            patcher.start()
+        return self
+
+    def __exit__(self, *args):
+        for patcher in self._patchers:
+            patcher.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def send_json(handler: BaseHTTPRequestHandler, response: t.Any, status: int = 200):
+    body = json.dumps(response).encode()
+    handler.send_response(status)
+    handler.send_header('Content-Type', 'application/json')
+    handler.send_header('Content-Length', str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
@@ -0,0 +1,84 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+import threading
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from melelem.service.exceptions import BadRequestException
+from melelem.service.request import (
+    AsyncServiceRequestSession,
+    AsyncTransformerModelService
+)
+
+
+class AsyncServiceRequestSessionTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.too_many_requests = 0
+
+        async def encode(request: web.Request):
+            if self.too_many_requests:
+                self.too_many_requests -= 1
+                return web.json_response({}, status=429)
+            json = await request.json()
+            return web.json_response({'embeddings': [[len(text)] for text in json['texts']]})
+
+        async def bad_request(request: web.Request):
+            return web.json_response(
+                {'service': 'melelem-service', 'message': 'Bad request.'},
+                status=400
+            )
+
+        app = web.Application()
+        app.router.add_post('/sentence-bert/encode', encode)
+        app.router.add_post('/bad-request', bad_request)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        for patcher in [
+            patch('melelem.service.request._base.DEBUG', False),
+            patch('melelem.service.request._async_base.DEBUG', False),
+            patch(
+                'melelem.service.request._base.get_service_url',
+                return_value=str(self.server.make_url('/'))
+            )
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await AsyncServiceRequestSession.close_client_session()
+        await self.server.close()
+
+    async def test_request(self):
+        response = await AsyncTransformerModelService().encode(['a', 'bc'])
+        self.assertDictEqual(response, {'embeddings': [[1], [2]]})
+
+    async def test_request__resolves_url_off_loop(self):
+        threads = []
+        url = str(self.server.make_url('/'))
+
+        def get_service_url(name):
+            threads.append(threading.current_thread())
+            return url
+
+        with patch('melelem.service.request._base.get_service_url', side_effect=get_service_url):
+            await AsyncTransformerModelService().encode(['a'])
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    async def test_request__retry(self):
+        self.too_many_requests = 2
+        service = AsyncTransformerModelService(retry_backoff_factor=0)
+        response = await service.encode(['a'])
+        self.assertDictEqual(response, {'embeddings': [[1]]})
+
+    async def test_request__bad_request(self):
+        with self.assertRaises(BadRequestException):
+            await AsyncTransformerModelService().request({}, path='bad-request')
+
+    async def test_request__shared_client_session(self):
+        await AsyncTransformerModelService().encode(['a'])
+        client_session = AsyncServiceRequestSession._get_client_session()
+        await AsyncTransformerModelService().encode(['a'])
+        self.assertIs(AsyncServiceRequestSession._get_client_session(), client_session)
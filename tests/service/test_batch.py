@@ -0,0 +1,126 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+from unittest.mock import patch, Mock
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+
+from melelem.service.request import (
+    TransformerModelService,
+    AsyncTransformerModelService
+)
+from melelem.service.request._batch import MicroBatcher, AsyncMicroBatcher
+from melelem.service.request.transformer_models import _split_encode_response
+
+
+def encode(texts, task):
+    return {'embeddings': [[len(text)] for text in texts], 'task': task}
+
+
+class MicroBatcherTests(TestCase):
+    def test_submit(self):
+        send = Mock(side_effect=encode)
+        batcher = MicroBatcher(send, _split_encode_response, max_batch_size=64, max_delay=0.1)
+        calls = [['a', 'bb'], ['bb'], ['ccc', 'a']]
+        with ThreadPoolExecutor(len(calls)) as executor:
+            responses = list(executor.map(batcher.submit, calls))
+
+        self.assertListEqual(responses, [
+            {'embeddings': [[1], [2]], 'task': None},
+            {'embeddings': [[2]], 'task': None},
+            {'embeddings': [[3], [1]], 'task': None}
+        ])
+        send.assert_called_once()
+        self.assertCountEqual(send.call_args.args[0], ['a', 'bb', 'ccc'])
+
+    def test_submit__max_batch_size(self):
+        send = Mock(side_effect=encode)
+        batcher = MicroBatcher(send, _split_encode_response, max_batch_size=2, max_delay=0.1)
+        calls = [['a'], ['bb'], ['ccc']]
+        with ThreadPoolExecutor(len(calls)) as executor:
+            responses = list(executor.map(batcher.submit, calls))
+
+        self.assertListEqual([response['embeddings'] for response in responses], [[[1]], [[2]], [[3]]])
+        self.assertEqual(send.call_count, 2)
+
+    def test_submit__keys(self):
+        send = Mock(side_effect=encode)
+        batcher = MicroBatcher(send, _split_encode_response, max_delay=0.1)
+        with ThreadPoolExecutor(2) as executor:
+            responses = list(executor.map(batcher.submit, [['a'], ['a']], ['query', 'passage']))
+
+        self.assertListEqual([response['task'] for response in responses], ['query', 'passage'])
+        self.assertEqual(send.call_count, 2)
+
+    def test_submit__exception(self):
+        batcher = MicroBatcher(Mock(side_effect=ValueError), _split_encode_response, max_delay=0)
+        with self.assertRaises(ValueError):
+            batcher.submit(['a'])
+
+
+class AsyncMicroBatcherTests(IsolatedAsyncioTestCase):
+    async def test_submit(self):
+        async def send(texts, task):
+            send.calls += 1
+            return encode(texts, task)
+        send.calls = 0
+
+        batcher = AsyncMicroBatcher(send, _split_encode_response, max_delay=0.1)
+        responses = await asyncio.gather(batcher.submit(['a', 'bb']), batcher.submit(['bb']))
+
+        self.assertListEqual([response['embeddings'] for response in responses], [[[1], [2]], [[2]]])
+        self.assertEqual(send.calls, 1)
+
+    async def test_submit__leader_cancelled(self):
+        async def send(texts, task):
+            send.calls += 1
+            await asyncio.sleep(0.05)
+            return encode(texts, task)
+        send.calls = 0
+
+        batcher = AsyncMicroBatcher(send, _split_encode_response, max_delay=0.01)
+        leader = asyncio.ensure_future(batcher.submit(['a']))
+        follower = asyncio.ensure_future(batcher.submit(['bb']))
+        await asyncio.sleep(0.03)
+        leader.cancel()
+
+        self.assertDictEqual(await follower, {'embeddings': [[2]], 'task': None})
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+        self.assertEqual(send.calls, 1)
+
+    async def test_submit__exception(self):
+        async def send(texts, task):
+            raise ValueError()
+
+        batcher = AsyncMicroBatcher(send, _split_encode_response, max_delay=0)
+        with self.assertRaises(ValueError):
+            await batcher.submit(['a'])
+
+
+class TransformerModelServiceTests(TestCase):
+    def test_encode__batching(self):
+        service = TransformerModelService(encode_batching=True, encode_max_delay=0.1)
+        with patch.object(service, 'request', side_effect=lambda json, path: encode(json['texts'], None)) as request:
+            with ThreadPoolExecutor(2) as executor:
+                responses = list(executor.map(service.encode, [['a'], ['bb']]))
+
+        self.assertListEqual([response['embeddings'] for response in responses], [[[1]], [[2]]])
+        request.assert_called_once()
+
+    def test_encode__no_batching(self):
+        service = TransformerModelService()
+        with patch.object(service, 'request') as request:
+            service.encode(['a'], task='query')
+        request.assert_called_once_with(json={'texts': ['a'], 'task': 'query'}, path='sentence-bert/encode')
+
+
+class AsyncTransformerModelServiceTests(IsolatedAsyncioTestCase):
+    async def test_encode__batching(self):
+        async def request(json, path):
+            return encode(json['texts'], None)
+
+        service = AsyncTransformerModelService(encode_batching=True, encode_max_delay=0.1)
+        with patch.object(service, 'request', side_effect=request) as mock_request:
+            responses = await asyncio.gather(service.encode(['a']), service.encode(['bb']))
+
+        self.assertListEqual([response['embeddings'] for response in responses], [[[1]], [[2]]])
+        mock_request.assert_called_once()
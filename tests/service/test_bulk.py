@@ -0,0 +1,153 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+from unittest.mock import patch
+import threading
+import time
+
+import requests
+
+from melelem.service.exceptions import BadRequestException, InternalServerErrorException
+from melelem.service.request import DocumentsService, AsyncDocumentsService, BulkMetrics
+from melelem.service.request._base import _raise_response_error
+
+
+DOCUMENTS = [
+    {'text': 'text {}'.format(index), 'document_id': str(index), 'name': 'name'}
+    for index in range(20)
+]
+
+
+class FlakyIngest:
+    """Fails the first attempt of odd documents and every attempt of document 7 (bad request)."""
+
+    def __init__(self):
+        self.attempts = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, text, client_id, document_id, name):
+        with self.lock:
+            attempt = self.attempts[document_id] = self.attempts.get(document_id, 0) + 1
+        if document_id == '7':
+            raise BadRequestException('melelem-service-documents', 'Bad request.')
+        if int(document_id) % 2 and attempt == 1:
+            raise InternalServerErrorException('melelem-service-documents', 'Try again.')
+        return {'success': True, 'document_id': document_id, 'client_id': client_id}
+
+
+class DocumentsServiceBulkTests(TestCase):
+    def test_ingest_documents_bulk(self):
+        service, ingest, metrics = DocumentsService(), FlakyIngest(), BulkMetrics()
+        with patch.object(service, 'ingest_document', side_effect=ingest):
+            results = list(service.ingest_documents_bulk(
+                iter(DOCUMENTS),
+                concurrency=4,
+                retry_backoff_factor=0,
+                metrics=metrics,
+                client_id='client'
+            ))
+
+        self.assertCountEqual([result.index for result in results], range(len(DOCUMENTS)))
+        failed = [result for result in results if not result.ok]
+        self.assertListEqual([result.index for result in failed], [7])
+        self.assertIsInstance(failed[0].exception, BadRequestException)
+        self.assertEqual(failed[0].attempts, 1)
+        for result in results:
+            if result.ok:
+                self.assertEqual(result.response['client_id'], 'client')
+                self.assertEqual(result.attempts, 2 if result.index % 2 else 1)
+
+        self.assertEqual(metrics.submitted, 20)
+        self.assertEqual(metrics.succeeded, 19)
+        self.assertEqual(metrics.failed, 1)
+        self.assertEqual(metrics.retries, 9)
+        self.assertEqual(metrics.bytes, sum(len(document['text']) for document in DOCUMENTS) - len('text 7'))
+        self.assertGreater(metrics.to_dict()['docs_per_second'], 0)
+
+    def test_ingest_documents_bulk__max_retries(self):
+        service = DocumentsService()
+        with patch.object(service, 'ingest_document', side_effect=InternalServerErrorException('s', 'm')) as ingest:
+            results = list(service.ingest_documents_bulk(DOCUMENTS[:1], max_retries=2, retry_backoff_factor=0))
+        self.assertEqual(results[0].attempts, 3)
+        self.assertEqual(ingest.call_count, 3)
+
+    def test_ingest_documents_bulk__not_retryable(self):
+        service = DocumentsService()
+        for ex in [Exception("{'detail': 'Validation error.'}"), KeyError('text'), TypeError()]:
+            with self.subTest(ex=ex), patch.object(service, 'ingest_document', side_effect=ex) as ingest:
+                results = list(service.ingest_documents_bulk(DOCUMENTS[:1], max_retries=2, retry_backoff_factor=0))
+                self.assertIs(results[0].exception, ex)
+                self.assertEqual(results[0].attempts, 1)
+                self.assertEqual(ingest.call_count, 1)
+
+    def test_ingest_documents_bulk__status_codes(self):
+        service = DocumentsService()
+        for status_code, attempts in [(401, 1), (403, 1), (404, 1), (429, 3), (500, 3), (503, 3)]:
+            def ingest(*args, **kwargs):
+                _raise_response_error(status_code, {'service': 's', 'message': 'm'})
+
+            with self.subTest(status_code=status_code), patch.object(service, 'ingest_document', side_effect=ingest):
+                results = list(service.ingest_documents_bulk(DOCUMENTS[:1], max_retries=2, retry_backoff_factor=0))
+                self.assertEqual(results[0].exception.status_code, status_code)
+                self.assertEqual(results[0].attempts, attempts)
+
+    def test_ingest_documents_bulk__transport_error(self):
+        service = DocumentsService()
+        with patch.object(service, 'ingest_document', side_effect=[requests.ConnectionError(), requests.Timeout(), {}]) as ingest:
+            results = list(service.ingest_documents_bulk(DOCUMENTS[:1], max_retries=2, retry_backoff_factor=0))
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[0].attempts, 3)
+        self.assertEqual(ingest.call_count, 3)
+
+    def test_ingest_documents_bulk__backpressure(self):
+        in_flight, max_in_flight, lock = [0], [0], threading.Lock()
+        pulled = []
+
+        def ingest(**kwargs):
+            with lock:
+                in_flight[0] += 1
+                max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+
+        def documents():
+            for document in DOCUMENTS:
+                pulled.append(document)
+                yield document
+
+        service = DocumentsService()
+        with patch.object(service, 'ingest_document', side_effect=ingest):
+            results = service.ingest_documents_bulk(documents(), concurrency=3)
+            next(results)
+            self.assertLessEqual(len(pulled), 3 + 1)
+            list(results)
+
+        self.assertLessEqual(max_in_flight[0], 3)
+        self.assertEqual(len(pulled), len(DOCUMENTS))
+
+
+class AsyncDocumentsServiceBulkTests(IsolatedAsyncioTestCase):
+    async def test_ingest_documents_bulk(self):
+        ingest = FlakyIngest()
+
+        async def async_ingest(**kwargs):
+            return ingest(**kwargs)
+
+        async def documents():
+            for document in DOCUMENTS:
+                yield document
+
+        service, metrics = AsyncDocumentsService(), BulkMetrics()
+        with patch.object(service, 'ingest_document', side_effect=async_ingest):
+            results = [
+                result async for result in service.ingest_documents_bulk(
+                    documents(),
+                    concurrency=4,
+                    retry_backoff_factor=0,
+                    metrics=metrics,
+                    client_id='client'
+                )
+            ]
+
+        self.assertCountEqual([result.index for result in results], range(len(DOCUMENTS)))
+        self.assertListEqual([result.index for result in results if not result.ok], [7])
+        self.assertEqual(metrics.retries, 9)
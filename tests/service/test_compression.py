@@ -0,0 +1,133 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+import gzip
+import json
+
+from melelem.service.request import DocumentsService, AsyncDocumentsService
+from melelem.service.request._compression import compress, Transfer
+
+from .stub_server import StubServer
+
+
+TEXT = 'The quick brown fox jumps over the lazy dog. ' * 1000
+
+
+def send_gzip_json(handler, body):
+    if handler.headers.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    request = json.loads(body)
+    response = json.dumps({
+        'text': request['text'],
+        'content_encoding': handler.headers.get('Content-Encoding'),
+        'accept_encoding': handler.headers.get('Accept-Encoding')
+    }).encode()
+    compressed_response = gzip.compress(response)
+
+    handler.send_response(200)
+    handler.send_header('Content-Type', 'application/json')
+    handler.send_header('Content-Encoding', 'gzip')
+    handler.send_header('Content-Length', str(len(compressed_response)))
+    handler.end_headers()
+    handler.wfile.write(compressed_response)
+    handler.server.response_bytes = (len(response), len(compressed_response))
+
+
+def send_chunked_json(handler, body):
+    response = json.dumps({'text': json.loads(body)['text']}).encode()
+    encoding = handler.path.rsplit('/', 1)[-1]
+    if encoding == 'gzip':
+        response = gzip.compress(response)
+
+    handler.send_response(200)
+    handler.send_header('Content-Type', 'application/json')
+    if encoding == 'gzip':
+        handler.send_header('Content-Encoding', 'gzip')
+    handler.send_header('Transfer-Encoding', 'chunked')
+    handler.end_headers()
+    for start in range(0, len(response), 1024):
+        chunk = response[start:start + 1024]
+        handler.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+    handler.wfile.write(b'0\r\n\r\n')
+
+
+ROUTES = {
+    'document/ingest': send_gzip_json,
+    'chunked/gzip': send_chunked_json,
+    'chunked/identity': send_chunked_json
+}
+
+
+class CompressTests(TestCase):
+    def test_compress(self):
+        data, headers = compress(TEXT.encode(), {}, 'gzip', threshold=1024)
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(data), TEXT.encode())
+
+    def test_compress__threshold(self):
+        data, headers = compress(b'short', {}, 'gzip', threshold=1024)
+        self.assertEqual(data, b'short')
+        self.assertNotIn('Content-Encoding', headers)
+
+
+class ServiceRequestSessionCompressionTests(TestCase):
+    def test_request(self):
+        service = DocumentsService(compression='gzip')
+        with StubServer(ROUTES) as server:
+            response = service.ingest_document(TEXT, 'client', 'document', 'name')
+
+        self.assertEqual(response['text'], TEXT)
+        self.assertEqual(response['content_encoding'], 'gzip')
+        self.assertIn('gzip', response['accept_encoding'])
+
+        transfer = service.last_transfer
+        self.assertLess(transfer.wire_request_bytes, transfer.raw_request_bytes)
+        self.assertEqual(
+            (transfer.raw_response_bytes, transfer.wire_response_bytes),
+            server.server.response_bytes
+        )
+        self.assertEqual(service.transfer_metrics.to_dict()['wire_request_bytes'], transfer.wire_request_bytes)
+
+    def test_request__chunked(self):
+        service = DocumentsService()
+        with StubServer(ROUTES):
+            for encoding in ['gzip', 'identity']:
+                with self.subTest(encoding=encoding):
+                    response = service.request(json={'text': TEXT}, path='chunked/' + encoding)
+                    self.assertEqual(response['text'], TEXT)
+                    transfer = service.last_transfer
+                    self.assertEqual(transfer.raw_response_bytes, len(json.dumps({'text': TEXT})))
+                    # NOTE: The wire bytes of a compressed, chunked response are unknown, not 0.
+                    self.assertEqual(
+                        transfer.wire_response_bytes,
+                        None if encoding == 'gzip' else transfer.raw_response_bytes
+                    )
+        self.assertEqual(
+            service.transfer_metrics.to_dict()['wire_response_bytes'],
+            service.transfer_metrics.to_dict()['raw_response_bytes']
+        )
+
+    def test_request__no_compression(self):
+        service = DocumentsService()
+        with StubServer(ROUTES):
+            response = service.ingest_document(TEXT, 'client', 'document', 'name')
+
+        self.assertIsNone(response['content_encoding'])
+        self.assertEqual(service.last_transfer.wire_request_bytes, service.last_transfer.raw_request_bytes)
+
+
+class AsyncServiceRequestSessionCompressionTests(IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        await AsyncDocumentsService.close_client_session()
+
+    async def test_request(self):
+        service = AsyncDocumentsService(compression='gzip')
+        with StubServer(ROUTES) as server:
+            response = await service.ingest_document(TEXT, 'client', 'document', 'name')
+
+        self.assertEqual(response['content_encoding'], 'gzip')
+        transfer = service.last_transfer
+        self.assertIsInstance(transfer, Transfer)
+        self.assertLess(transfer.wire_request_bytes, transfer.raw_request_bytes)
+        self.assertEqual(
+            (transfer.raw_response_bytes, transfer.wire_response_bytes),
+            server.server.response_bytes
+        )
@@ -0,0 +1,44 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from melelem.service.request import LLMSelectorService, TransformerModelService
+from melelem.utilities import EmbeddingCache
+
+
+class TransformerModelServiceTests(TestCase):
+    def test_encode__embedding_cache(self):
+        service = TransformerModelService(embedding_cache=EmbeddingCache())
+        service.embedding_cache.set('query', 'a', [1.0])
+        with patch.object(service, 'request', return_value={'embeddings': [[2.0]]}) as request:
+            response = service.encode(['a', 'bb', 'a'], task='query')
+
+        request.assert_called_once_with(
+            json={'texts': ['bb'], 'task': 'query'},
+            path='sentence-bert/encode'
+        )
+        self.assertDictEqual(response, {'embeddings': [[1.0], [2.0], [1.0]]})
+
+        with patch.object(service, 'request') as request:
+            response = service.encode(['bb'], task='query')
+        request.assert_not_called()
+        self.assertDictEqual(response, {'embeddings': [[2.0]]})
+
+
+class LLMSelectorServiceTests(TestCase):
+    def test_embeddings__embedding_cache(self):
+        service = LLMSelectorService(embedding_cache=EmbeddingCache())
+        service.embedding_cache.set('ada', 'a', [1.0])
+        with patch.object(service, 'request', return_value={
+            'data': [{'object': 'embedding', 'index': 0, 'embedding': [2.0]}],
+            'usage': {'total_tokens': 1}
+        }) as request:
+            response = service.embeddings(['bb', 'a'], engine='ada')
+
+        request.assert_called_once_with(json={'input': ['bb'], 'engine': 'ada'}, path='embeddings')
+        self.assertDictEqual(response, {
+            'data': [
+                {'object': 'embedding', 'index': 0, 'embedding': [2.0]},
+                {'object': 'embedding', 'index': 1, 'embedding': [1.0]}
+            ],
+            'usage': {'total_tokens': 1}
+        })
@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from melelem.service.request import (
+    CONNECTION_POOLS,
+    ConnectionPoolRegistry,
+    PoolConfig,
+    TransformerModelService
+)
+from melelem.service.request._pool import SharedPoolHTTPAdapter
+
+from .stub_server import StubServer, send_json
+
+
+class ConnectionPoolRegistryTests(TestCase):
+    def test_configure(self):
+        registry = ConnectionPoolRegistry()
+        registry.configure('melelem-service', pool_maxsize=20)
+        registry.configure(pool_block=True)
+        self.assertEqual(registry.get_config('melelem-service'), PoolConfig(pool_maxsize=20))
+        self.assertEqual(registry.get_config('other-service'), PoolConfig(pool_block=True))
+
+    def test_configure__replaces_pool_manager(self):
+        registry = ConnectionPoolRegistry()
+        pool_manager = registry.get_pool_manager('melelem-service')
+        self.assertIs(registry.get_pool_manager('melelem-service'), pool_manager)
+
+        registry.configure('melelem-service', pool_maxsize=20)
+        pool_manager = registry.get_pool_manager('melelem-service')
+        self.assertEqual(pool_manager.connection_pool_kw['maxsize'], 20)
+
+    def test_get_metrics__unknown(self):
+        registry = ConnectionPoolRegistry()
+        self.assertDictEqual(registry.get_metrics('melelem-service'), {
+            'active': 0,
+            'idle': 0,
+            'waits': 0,
+            'requests': 0
+        })
+
+
+class SharedPoolTests(TestCase):
+    def setUp(self):
+        CONNECTION_POOLS.clear()
+
+    def test_request(self):
+        name = TransformerModelService.name
+        with StubServer({
+            'sentence-bert/encode': lambda handler, body: send_json(handler, {'embeddings': []})
+        }):
+            adapters = [
+                TransformerModelService()._session.get_adapter('http://')
+                for _ in range(2)
+            ]
+            for adapter in adapters:
+                self.assertIsInstance(adapter, SharedPoolHTTPAdapter)
+                self.assertIs(adapter.poolmanager, CONNECTION_POOLS.get_pool_manager(name))
+
+            requests = CONNECTION_POOLS.get_metrics(name)['requests']
+            TransformerModelService().encode([])
+            TransformerModelService().encode([])
+            metrics = CONNECTION_POOLS.get_metrics(name)
+
+        self.assertEqual(metrics['requests'], requests + 2)
+        self.assertEqual(metrics['active'], 0)
+        self.assertEqual(metrics['idle'], 1)
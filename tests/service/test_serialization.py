@@ -0,0 +1,60 @@
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+import json
+
+from melelem.service.request import (
+    DocumentsService,
+    JsonSerializer,
+    OrjsonSerializer,
+    get_serializer
+)
+from melelem.service.request._serialization import SERIALIZERS, orjson
+
+from .stub_server import StubServer, send_json
+
+
+PAYLOAD = {
+    'text': 'Héllo wörld! ' * 10,
+    'meta': {'tags': ['a', 'b'], 'score': 0.5, 'count': 3, 'valid': True, 'parent': None},
+    1: 'non-str key'
+}
+
+
+class SerializerTests(TestCase):
+    def test_round_trip(self):
+        for name in SERIALIZERS:
+            with self.subTest(name=name):
+                if name == OrjsonSerializer.name and orjson is None:
+                    self.skipTest('orjson is not installed')
+                serializer = get_serializer(name)
+                data = serializer.dumps(PAYLOAD)
+                self.assertIsInstance(data, bytes)
+                self.assertDictEqual(serializer.loads(data), json.loads(json.dumps(PAYLOAD)))
+                self.assertDictEqual(serializer.loads(memoryview(data)), serializer.loads(data))
+
+    @skipUnless(orjson, 'orjson is not installed')
+    def test_get_serializer(self):
+        self.assertIsInstance(get_serializer(), OrjsonSerializer)
+
+    def test_get_serializer__no_orjson(self):
+        with patch('melelem.service.request._serialization.orjson', None):
+            self.assertIsInstance(get_serializer(), JsonSerializer)
+            with self.assertRaises(ImportError):
+                get_serializer('orjson')
+
+
+class ServiceRequestSessionSerializerTests(TestCase):
+    def test_request(self):
+        def ingest(handler, body):
+            send_json(handler, {
+                'text': json.loads(body)['text'],
+                'content_type': handler.headers['Content-Type']
+            })
+
+        for name in SERIALIZERS:
+            with self.subTest(name=name), StubServer({'document/ingest': ingest}):
+                if name == OrjsonSerializer.name and orjson is None:
+                    self.skipTest('orjson is not installed')
+                service = DocumentsService(serializer=get_serializer(name))
+                response = service.ingest_document('Héllo', 'client', 'document', 'name')
+                self.assertDictEqual(response, {'text': 'Héllo', 'content_type': 'application/json'})
@@ -0,0 +1,77 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+from unittest.mock import patch
+import base64
+import io
+
+from melelem.service.request import StanzaService, AsyncStanzaService
+from melelem.service.request._base import _build_request, _unpack_debug_response
+
+from .stub_server import StubServer, send_json
+
+
+ANNOTATIONS = bytes(range(256)) * 1024
+
+
+def send_annotations(handler, body):
+    handler.send_response(200)
+    handler.send_header('Content-Type', 'application/octet-stream')
+    handler.send_header('Content-Length', str(len(ANNOTATIONS)))
+    handler.end_headers()
+    handler.wfile.write(ANNOTATIONS)
+
+
+def send_base64_annotations(handler, body):
+    send_json(handler, {'response': base64.b64encode(ANNOTATIONS).decode('ascii')})
+
+
+class BinaryTransportTests(TestCase):
+    def test_build_request__debug(self):
+        with patch('melelem.service.request._base.DEBUG', True), \
+                patch.dict('os.environ', {'Melelem_API_KEY': 'key'}):
+            _, json, _ = _build_request('name', {}, 'annotate', response_type=bytes)
+        self.assertEqual(json['response_type'], 'bytes')
+        self.assertEqual(json['response_encoding'], 'base64')
+
+    def test_unpack_debug_response__bytes(self):
+        response_json = {'response': base64.b64encode(b'\x00\x01').decode('ascii')}
+        self.assertEqual(_unpack_debug_response(response_json, bytes), b'\x00\x01')
+
+
+class StanzaServiceTests(TestCase):
+    def test_annotate(self):
+        with StubServer({'annotate': send_annotations}):
+            self.assertEqual(StanzaService().annotate(['text']), ANNOTATIONS)
+
+    def test_annotate__sink(self):
+        sink = io.BytesIO()
+        with StubServer({'annotate': send_annotations}):
+            size = StanzaService().annotate(['text'], sink=sink)
+        self.assertEqual(size, len(ANNOTATIONS))
+        self.assertEqual(sink.getvalue(), ANNOTATIONS)
+
+    def test_annotate__debug_base64(self):
+        sink = io.BytesIO()
+        with StubServer({'annotate': send_base64_annotations}) as server, \
+                patch('melelem.service.request._base.DEBUG', True), \
+                patch('melelem.service.request._base._build_request', return_value=(server.url + 'annotate', {}, None)):
+            self.assertEqual(StanzaService().annotate(['text']), ANNOTATIONS)
+            self.assertEqual(StanzaService().annotate(['text'], sink=sink), len(ANNOTATIONS))
+        self.assertEqual(sink.getvalue(), ANNOTATIONS)
+
+    def test_annotate__debug_passthrough(self):
+        with StubServer({'annotate': send_annotations}) as server, \
+                patch('melelem.service.request._base.DEBUG', True), \
+                patch('melelem.service.request._base._build_request', return_value=(server.url + 'annotate', {}, None)):
+            self.assertEqual(StanzaService().annotate(['text']), ANNOTATIONS)
+
+
+class AsyncStanzaServiceTests(IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        await AsyncStanzaService.close_client_session()
+
+    async def test_annotate__sink(self):
+        sink = io.BytesIO()
+        with StubServer({'annotate': send_annotations}):
+            size = await AsyncStanzaService().annotate(['text'], sink=sink)
+        self.assertEqual(size, len(ANNOTATIONS))
+        self.assertEqual(sink.getvalue(), ANNOTATIONS)
@@ -0,0 +1,97 @@
+from unittest import TestCase, IsolatedAsyncioTestCase
+import json
+
+from melelem.service.exceptions import BadRequestException
+from melelem.service.request import LLMSelectorService, AsyncLLMSelectorService
+from melelem.service.request._base import _EventStreamDecoder
+from melelem.utilities.openai import calculate_usage_overview
+
+from .stub_server import StubServer, send_json
+
+
+USAGE = {'prompt_tokens': 5, 'completion_tokens': 2, 'total_tokens': 7}
+
+
+def send_events(handler, body):
+    if not json.loads(body).get('stream'):
+        return send_bad_request(handler, body)
+
+    handler.send_response(200)
+    handler.send_header('Content-Type', 'text/event-stream')
+    handler.send_header('Connection', 'close')
+    handler.end_headers()
+    handler.close_connection = True
+    for event in [
+        {'choices': [{'delta': {'content': 'Hello'}}]},
+        {'choices': [{'delta': {'content': ' world'}}]},
+        {'choices': [], 'usage': USAGE}
+    ]:
+        handler.wfile.write('data: {}\n\n'.format(json.dumps(event)).encode())
+        handler.wfile.flush()
+    handler.wfile.write(b': keep-alive\n\ndata: [DONE]\n\n')
+
+
+def send_bad_request(handler, body):
+    send_json(handler, {'service': 'melelem-service', 'message': 'Bad request.'}, status=400)
+
+
+ROUTES = {'chat': send_events, 'complete': send_events, 'bad-request': send_bad_request}
+
+
+def get_content(events):
+    return ''.join(
+        choice['delta']['content'] for event in events for choice in event['choices']
+    )
+
+
+class EventStreamDecoderTests(TestCase):
+    def test_decode(self):
+        decoder = _EventStreamDecoder()
+        lines = ['event: delta', 'data: {"a":', 'data: 1}', '', ': comment', '', '{"b": 2}', 'data: [DONE]', '']
+        self.assertListEqual(
+            [data for data in map(decoder.decode, lines) if data is not None],
+            ['{"a":\n1}', '{"b": 2}', '[DONE]']
+        )
+
+
+class LLMSelectorServiceStreamTests(TestCase):
+    def test_chat__stream(self):
+        with StubServer(ROUTES):
+            stream = LLMSelectorService().chat([{'role': 'user', 'content': 'Hi'}], stream=True)
+            self.assertIsNone(stream.usage)
+            events = list(stream)
+
+        self.assertEqual(get_content(events), 'Hello world')
+        self.assertDictEqual(stream.usage, USAGE)
+        self.assertEqual(calculate_usage_overview([stream.usage])['total_tokens'], 7)
+
+    def test_complete__stream(self):
+        with StubServer(ROUTES):
+            stream = LLMSelectorService().complete('Hi', stream=True)
+            self.assertEqual(get_content(stream), 'Hello world')
+        self.assertDictEqual(stream.usage, USAGE)
+
+    def test_request_stream__bad_request(self):
+        with StubServer(ROUTES):
+            with self.assertRaises(BadRequestException):
+                LLMSelectorService().request_stream(json={}, path='bad-request')
+
+
+class AsyncLLMSelectorServiceStreamTests(IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        await AsyncLLMSelectorService.close_client_session()
+
+    async def test_chat__stream(self):
+        with StubServer(ROUTES):
+            stream = await AsyncLLMSelectorService().chat([{'role': 'user', 'content': 'Hi'}], stream=True)
+            events = [event async for event in stream]
+
+        self.assertEqual(get_content(events), 'Hello world')
+        self.assertDictEqual(stream.usage, USAGE)
+        with self.assertRaises(TypeError):
+            iter(stream)
+
+    async def test_request_stream__bad_request(self):
+        with StubServer(ROUTES):
+            with self.assertRaises(BadRequestException):
+                await AsyncLLMSelectorService().request_stream(json={}, path='bad-request')
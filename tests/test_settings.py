@@ -5,11 +5,17 @@ from kubernetes import client
 
 from melelem.settings import (
     get_service_url,
-    K8S_CONFIG
+    K8S,
+    K8S_CONFIG,
+    SERVICE_URL_CACHE,
+    ServiceUrlCache
 )
 
 
 class Tests(TestCase):
+    def setUp(self):
+        SERVICE_URL_CACHE.clear()
+
     @patch.object(K8S_CONFIG, 'lazy_load')
     @patch.object(
         client.CoreV1Api,
@@ -59,3 +65,153 @@ class Tests(TestCase):
         k8s__list_service_for_all_namespaces.assert_called_once_with(
             field_selector='metadata.name=' + name
         )
+
+    @patch.object(K8S_CONFIG, 'lazy_load')
+    @patch.object(
+        client.CoreV1Api,
+        'list_service_for_all_namespaces',
+        return_value=client.V1ServiceList(items=[
+            client.V1Service(spec=client.V1ServiceSpec(
+                cluster_ip='0.0.0.0',
+                ports=[client.V1ServicePort(port=80)]
+            ))
+        ])
+    )
+    def test_get_service_url__cached(
+        self,
+        k8s__list_service_for_all_namespaces: Mock,
+        k8s_config: Mock
+    ):
+        name = 'melelem-service'
+        url = get_service_url(name)
+        self.assertEqual(get_service_url(name), url)
+
+        k8s__list_service_for_all_namespaces.assert_called_once()
+        self.assertDictEqual(SERVICE_URL_CACHE.stats(), {
+            'hits': 1,
+            'misses': 1,
+            'size': 1,
+            'hit_rate': 0.5,
+            'watching': False
+        })
+
+    @patch.object(K8S_CONFIG, 'lazy_load')
+    @patch.object(
+        client.CoreV1Api,
+        'list_service_for_all_namespaces',
+        return_value=client.V1ServiceList(items=[])
+    )
+    def test_get_service_url__name_does_not_exist__cached(
+        self,
+        k8s__list_service_for_all_namespaces: Mock,
+        k8s_config: Mock
+    ):
+        name = 'melelem-service'
+        for _ in range(2):
+            with self.assertRaises(NameError):
+                get_service_url(name)
+
+        k8s__list_service_for_all_namespaces.assert_called_once()
+
+
+    @patch.object(K8S_CONFIG, 'lazy_load')
+    @patch.object(
+        client.CoreV1Api,
+        'list_service_for_all_namespaces',
+        return_value=client.V1ServiceList(items=[
+            client.V1Service(spec=client.V1ServiceSpec(cluster_ip='None', ports=[client.V1ServicePort(port=80)])),
+            client.V1Service(spec=client.V1ServiceSpec(type='ExternalName', external_name='example.com')),
+            client.V1Service(spec=client.V1ServiceSpec(cluster_ip='0.0.0.0', ports=[client.V1ServicePort(port=80)]))
+        ])
+    )
+    def test_get_service_url__no_ports(
+        self,
+        k8s__list_service_for_all_namespaces: Mock,
+        k8s_config: Mock
+    ):
+        self.assertEqual(get_service_url('melelem-service'), 'http://0.0.0.0:80/')
+
+        k8s__list_service_for_all_namespaces.return_value.items.pop()
+        SERVICE_URL_CACHE.clear()
+        with self.assertRaises(NameError):
+            get_service_url('melelem-service')
+
+
+def get_service(name: str, namespace: str, cluster_ip: str = None, port: int = None):
+    return client.V1Service(
+        metadata=client.V1ObjectMeta(name=name, namespace=namespace),
+        spec=client.V1ServiceSpec(
+            cluster_ip=cluster_ip,
+            ports=[client.V1ServicePort(port=port)] if port is not None else None
+        )
+    )
+
+
+class ServiceUrlCacheTests(TestCase):
+    @patch.object(K8S_CONFIG, 'lazy_load')
+    @patch.object(K8S, 'lazy_load')
+    def test_watch_services(self, k8s: Mock, k8s_config: Mock):
+        cache = ServiceUrlCache()
+        events = [
+            {'type': 'ADDED', 'object': get_service('melelem-service', 'b', '0.0.0.2', 80)},
+            {'type': 'ADDED', 'object': get_service('melelem-service', 'a', '0.0.0.1', 80)},
+            {'type': 'ADDED', 'object': get_service('headless-service', 'a', 'None', 80)},
+            {'type': 'ADDED', 'object': get_service('external-service', 'a')},
+            {'type': 'MODIFIED', 'object': get_service('deleted-service', 'a', '0.0.0.3', 80)},
+            {'type': 'DELETED', 'object': get_service('deleted-service', 'a', '0.0.0.3', 80)}
+        ]
+
+        def stream(*args, **kwargs):
+            yield from events
+            cache._watch = None
+
+        watch = Mock()
+        watch.stream.side_effect = stream
+        cache._watch = watch
+        cache._watch_services(watch)
+
+        resolve = Mock()
+        self.assertEqual(cache.get('melelem-service', resolve), 'http://0.0.0.1:80/')
+        for name in ['headless-service', 'external-service', 'deleted-service']:
+            with self.assertRaises(NameError):
+                cache.get(name, resolve)
+        resolve.assert_not_called()
+
+        # The service of the first namespace is deleted.
+        events = [
+            {'type': 'ADDED', 'object': get_service('melelem-service', 'b', '0.0.0.2', 80)},
+            {'type': 'ADDED', 'object': get_service('melelem-service', 'a', '0.0.0.1', 80)},
+            {'type': 'DELETED', 'object': get_service('melelem-service', 'a', '0.0.0.1', 80)}
+        ]
+        cache._watch = watch
+        cache._watch_services(watch)
+        self.assertEqual(cache.get('melelem-service', resolve), 'http://0.0.0.2:80/')
+
+
+    def test_get__expired(self):
+        cache = ServiceUrlCache(ttl=0, negative_ttl=0)
+        resolve = Mock(return_value='http://0.0.0.0:80/')
+        cache.get('melelem-service', resolve)
+        cache.get('melelem-service', resolve)
+        self.assertEqual(resolve.call_count, 2)
+        self.assertEqual(cache.misses, 2)
+
+    def test_set(self):
+        cache = ServiceUrlCache()
+        resolve = Mock()
+        cache.set('melelem-service', 'http://0.0.0.0:80/')
+        self.assertEqual(cache.get('melelem-service', resolve), 'http://0.0.0.0:80/')
+        resolve.assert_not_called()
+
+        cache.set('melelem-service', None)
+        with self.assertRaises(NameError):
+            cache.get('melelem-service', resolve)
+        resolve.assert_not_called()
+
+    def test_invalidate(self):
+        cache = ServiceUrlCache()
+        resolve = Mock(return_value='http://0.0.0.0:80/')
+        cache.set('melelem-service', 'http://0.0.0.1:80/')
+        cache.invalidate('melelem-service')
+        self.assertEqual(cache.get('melelem-service', resolve), 'http://0.0.0.0:80/')
+        resolve.assert_called_once_with('melelem-service')
@@ -0,0 +1,57 @@
+from unittest import TestCase
+from tempfile import TemporaryDirectory
+
+from melelem.utilities.embedding_cache import EmbeddingCache
+
+
+class EmbeddingCacheTests(TestCase):
+    def test_get__memory(self):
+        cache = EmbeddingCache(max_memory_items=1)
+        cache.set('query', 'a', [0.5, 1.0])
+        self.assertListEqual(cache.get('query', 'a'), [0.5, 1.0])
+        self.assertIsNone(cache.get('passage', 'a'))
+
+        # LRU eviction.
+        cache.set('query', 'b', [0.25])
+        self.assertIsNone(cache.get('query', 'a'))
+        self.assertListEqual(cache.get('query', 'b'), [0.25])
+
+    def test_get__disk(self):
+        with TemporaryDirectory() as directory:
+            EmbeddingCache(directory).set('query', 'a', [0.5, 1.0])
+
+            cache = EmbeddingCache(directory)
+            self.assertListEqual(cache.get('query', 'a'), [0.5, 1.0])
+            self.assertEqual(cache.disk_hits, 1)
+
+    def test_set__disk_eviction(self):
+        with TemporaryDirectory() as directory:
+            cache = EmbeddingCache(directory, max_memory_items=0, max_disk_bytes=8)
+            cache.set('query', 'a', [0.5, 1.0])
+            cache.set('query', 'b', [0.5, 1.0])
+            self.assertIsNone(cache.get('query', 'a'))
+            self.assertListEqual(cache.get('query', 'b'), [0.5, 1.0])
+            self.assertEqual(cache.stats()['disk_bytes'], 8)
+
+    def test_lookup(self):
+        cache = EmbeddingCache()
+        cache.set(None, 'b', [2.0])
+        lookup = cache.lookup(None, ['a', 'b', 'a', 'c'])
+        self.assertListEqual(lookup.misses, ['a', 'c'])
+        self.assertListEqual(lookup.merge([[1.0], [3.0]]), [[1.0], [2.0], [1.0], [3.0]])
+        self.assertListEqual(cache.get(None, 'c'), [3.0])
+
+    def test_stats(self):
+        cache = EmbeddingCache()
+        cache.set('query', 'a', [1.0])
+        cache.get('query', 'a')
+        cache.get('query', 'b')
+        self.assertDictEqual(cache.stats(), {
+            'memory_hits': 1,
+            'disk_hits': 0,
+            'misses': 1,
+            'hit_rate': 0.5,
+            'memory_items': 1,
+            'disk_items': 0,
+            'disk_bytes': 0
+        })
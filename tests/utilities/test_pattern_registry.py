@@ -0,0 +1,40 @@
+from unittest import TestCase
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+import re
+
+from melelem.utilities.pattern_registry import PatternRegistry, PATTERNS
+from melelem.pre_processing.url import Url
+
+
+class PatternRegistryTests(TestCase):
+    def setUp(self):
+        self.registry = PatternRegistry()
+
+    def test_compile(self):
+        pattern = self.registry.compile(r'\w+', re.IGNORECASE)
+        self.assertEqual(pattern, re.compile(r'\w+', re.IGNORECASE))
+        self.assertIs(self.registry.compile(r'\w+', re.IGNORECASE), pattern)
+        self.assertIsNot(self.registry.compile(r'\w+'), pattern)
+        self.assertDictEqual(self.registry.stats(), {
+            'hits': 1, 'misses': 2, 'hit_rate': 1 / 3, 'patterns': 2
+        })
+
+    def test_compile__threads(self):
+        with patch('melelem.utilities.pattern_registry.re.compile', wraps=re.compile) as compile:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                patterns = list(executor.map(lambda _: self.registry.compile(r'\d+'), range(100)))
+        compile.assert_called_once_with(r'\d+', 0)
+        self.assertTrue(all(pattern is patterns[0] for pattern in patterns))
+        self.assertEqual(self.registry.misses, 1)
+
+    def test_clear(self):
+        self.registry.compile(r'\w+')
+        self.registry.clear()
+        self.assertDictEqual(self.registry.stats(), {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'patterns': 0})
+
+    def test_pre_processing(self):
+        Url.from_text('See https://example.com.')
+        misses = PATTERNS.misses
+        Url.from_text('See https://example.com.')
+        self.assertEqual(PATTERNS.misses, misses)